@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from lib.analytics import run_analytics
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate LLM and tool timings, iteration counts, tool error rates and memory usage across all run logs.")
+    parser.add_argument("--agent", help="Only analyze the run logs of this agent (e.g. research_agent)")
+    parser.add_argument("--tool", help="Show the latency histogram of this tool instead of the LLM calls")
+    parser.add_argument("--workers", type=int, help="Number of worker processes used to parse run logs (default: one per CPU)")
+    parser.add_argument("--json", action="store_true", help="Print the aggregated raw metrics as JSON instead of tables")
+    args = parser.parse_args()
+
+    totals, report = run_analytics(args.agent, args.tool.upper() if args.tool else None, args.workers)
+    if args.json:
+        print(json.dumps(totals, indent=2))
+    else:
+        print(report)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nExiting...")
+        sys.exit(0)
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""End-to-end benchmarks of the framework's own overhead, with a scripted mock LLM.
+
+    python benchmarks/run_benchmarks.py [--only iteration_overhead,log_throughput] [--save-baseline]
+
+Benchmarks:
+
+    iteration_overhead  time per Agent.run iteration spent outside the LLM call (and the mock's work on the prompt)
+    memory_growth       how the iteration time grows as an agent's memory grows over --iterations iterations
+    log_throughput      records and bytes per second through StreamingLogger into a run log, including the final fsync
+    spawn_latency       time of a SPAWN_SUBAGENT call, until the subagent's thread is started
+    message_round_trip  time from RESPOND_TO_SUBAGENT until LISTEN_TO_SUBAGENT returns the subagent's next message
+    scaling             wall time and throughput of 1 to 200 concurrent subagents running 20 iterations each
+
+By default the LLM is answered in-process by the mock LLM server's scripts (mocks/llm_server.py), so
+only the framework is measured; --backend http sends the calls through litellm to a mock server
+started in-process instead. Run logs are written to a temporary directory.
+
+Each benchmark runs --repeat times (default 3) and the median of each metric is reported, as single
+wall-clock runs are too noisy to compare. Results are written to benchmarks/results/<timestamp>.json
+and compared with benchmarks/baseline.json if it exists: a metric whose median and best run are both
+more than --threshold (default 25%) worse than its baseline is a regression and makes the script exit
+with status 1. --save-baseline makes the results the new baseline.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.base import Agent
+from main import get_agent_config, setup_run_logging, teardown_run_logging
+from mocks.llm_server import LatencyDistribution, MockLLMHandler, script_response, start_server
+
+BENCHMARKS_DIR = os.path.join(PROJECT_ROOT, "benchmarks")
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+SILENT_LOG_LEVEL = logging.CRITICAL + 1
+MOCK_AGENT = "mock_agent"
+# Metrics where a higher value is better, all others are durations or sizes where lower is better
+HIGHER_IS_BETTER_SUFFIXES = ("_per_s", "_efficiency")
+
+def percentile(values: List[float], p: float) -> float:
+    """Return the p-th percentile of values (nearest-rank method)."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def install_inprocess_backend(latency: float = 0.0) -> None:
+    """Answer every Agent's LLM calls in-process with the mock LLM scripts, after sleeping latency seconds."""
+    def llm_call(self, prompt: str, **kwargs) -> str:
+        start = time.perf_counter()
+        self.llm_call_count += 1
+        if latency:
+            time.sleep(latency)
+        content = script_response(prompt)
+        self.token_usage["prompt_tokens"] += len(prompt) // 4
+        self.token_usage["completion_tokens"] += len(content) // 4
+        self.token_usage["total_tokens"] += (len(prompt) + len(content)) // 4
+        # The span covers the mock's own work on the prompt too, so it is not counted as framework time
+        self.__dict__.setdefault("llm_call_spans", []).append((start, time.perf_counter()))
+        return content
+    Agent.llm_call = llm_call
+
+def install_http_backend(api_base: str) -> None:
+    """Send every Agent's LLM calls to api_base, including those of agents whose config has another one."""
+    original = Agent.llm_call
+    def llm_call(self, prompt: str, **kwargs) -> str:
+        start = time.perf_counter()
+        content = original(self, prompt, api_base=api_base, **kwargs)
+        self.__dict__.setdefault("llm_call_spans", []).append((start, time.perf_counter()))
+        return content
+    Agent.llm_call = llm_call
+
+@contextmanager
+def run_logging(log_dir: str, name: str):
+    """Log to a run log of its own in log_dir while the block runs, and yield its path."""
+    run_log = os.path.join(log_dir, f"run_log_{name}.txt")
+    handlers = setup_run_logging(run_log, SILENT_LOG_LEVEL)
+    try:
+        yield run_log
+    finally:
+        teardown_run_logging(handlers)
+
+def create_mock_agent(manifesto: str) -> Agent:
+    from lib.agent import create_agent
+    return create_agent(config=get_agent_config(MOCK_AGENT), manifesto=manifesto, memory="")
+
+@contextmanager
+def capture_spawned_agents():
+    """Collect the agents created by SPAWN_SUBAGENT while the block runs, so their completion can be awaited."""
+    import lib.tools.spawn_subagent as spawn_module
+    agents: List[Agent] = []
+    original = spawn_module.create_agent
+    def create_and_capture(**kwargs):
+        agent = original(**kwargs)
+        agents.append(agent)
+        return agent
+    spawn_module.create_agent = create_and_capture
+    try:
+        yield spawn_module, agents
+    finally:
+        spawn_module.create_agent = original
+
+def wait_until(condition: Callable[[], bool], timeout: float, poll_interval: float = 0.005) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(poll_interval)
+    return True
+
+def iteration_times_ms(agent: Agent) -> List[float]:
+    """Return the framework time of each iteration but the last: from an LLM call returning to the next one starting, in milliseconds."""
+    spans = agent.__dict__.get("llm_call_spans", [])
+    return [(next_start - end) * 1000 for (_, end), (next_start, _) in zip(spans, spans[1:])]
+
+def bench_iteration_overhead(args, log_dir: str) -> Dict[str, Any]:
+    agent = create_mock_agent(f"[MOCK_SCRIPT: loop iterations={args.overhead_iterations}]")
+    with run_logging(log_dir, "iteration_overhead"):
+        agent.run()
+    times = iteration_times_ms(agent)
+    return {
+        "params": {"iterations": args.overhead_iterations},
+        "metrics": {
+            "iteration_mean_ms": statistics.mean(times),
+            "iteration_p50_ms": percentile(times, 50),
+            "iteration_p95_ms": percentile(times, 95),
+        },
+    }
+
+def bench_memory_growth(args, log_dir: str) -> Dict[str, Any]:
+    agent = create_mock_agent(f"[MOCK_SCRIPT: loop iterations={args.iterations}]")
+    with run_logging(log_dir, "memory_growth"):
+        start = time.perf_counter()
+        agent.run()
+        elapsed = time.perf_counter() - start
+    times = iteration_times_ms(agent)
+    window = max(1, min(100, len(times) // 10))
+    first, last = statistics.median(times[:window]), statistics.median(times[-window:])
+    return {
+        "params": {"iterations": args.iterations, "window": window},
+        "metrics": {
+            "total_s": elapsed,
+            "first_iterations_median_ms": first,
+            "last_iterations_median_ms": last,
+            "growth_ratio": last / first if first else 0.0,
+            "final_memory_chars": len(agent.memory),
+        },
+    }
+
+def bench_log_throughput(args, log_dir: str) -> Dict[str, Any]:
+    line = "x" * args.log_record_bytes
+    logger = logging.getLogger("agent.LogBenchmark_000000-00000000-")
+    with run_logging(log_dir, "log_throughput") as run_log:
+        start = time.perf_counter()
+        for _ in range(args.log_records):
+            logger.info(line)
+        emitted = time.perf_counter() - start
+    # Leaving the block closed the writer: everything is written and fsynced
+    total = time.perf_counter() - start
+    size = os.path.getsize(run_log)
+    return {
+        "params": {"records": args.log_records, "record_bytes": args.log_record_bytes},
+        "metrics": {
+            "emit_us_per_record": emitted / args.log_records * 1e6,
+            "records_per_s": args.log_records / total,
+            "mb_per_s": size / total / 1e6,
+        },
+    }
+
+def bench_spawn_latency(args, log_dir: str) -> Dict[str, Any]:
+    latencies = []
+    with run_logging(log_dir, "spawn_latency"), capture_spawned_agents() as (spawn_module, agents):
+        for _ in range(args.spawns):
+            start = time.perf_counter()
+            spawn_module.spawn_subagent("SpawnBenchmark_000000-00000000-", f"{MOCK_AGENT}§end")
+            latencies.append((time.perf_counter() - start) * 1000)
+        wait_until(lambda: all(agent.ended for agent in agents), timeout=60)
+    return {
+        "params": {"spawns": args.spawns},
+        "metrics": {
+            "spawn_mean_ms": statistics.mean(latencies),
+            "spawn_p50_ms": percentile(latencies, 50),
+            "spawn_p95_ms": percentile(latencies, 95),
+        },
+    }
+
+def bench_message_round_trip(args, log_dir: str) -> Dict[str, Any]:
+    from lib.tools.listen_to_subagent import listen_to_subagent
+    from lib.tools.respond_to_subagent import respond_to_subagent
+    parent_id = "MessageBenchmark_000000-00000000-"
+    round_trips = []
+    with run_logging(log_dir, "message_round_trip"), capture_spawned_agents() as (spawn_module, agents):
+        child_id = spawn_module.spawn_subagent(parent_id, f"{MOCK_AGENT}§worker")
+        # The first listen returns whatever the worker wrote so far, wait for its first message
+        while not listen_to_subagent(parent_id, child_id).strip():
+            pass
+        for i in range(1, args.round_trips + 1):
+            start = time.perf_counter()
+            respond_to_subagent(parent_id, f"{child_id}§Reply {i}")
+            listen_to_subagent(parent_id, child_id)
+            round_trips.append(time.perf_counter() - start)
+        respond_to_subagent(parent_id, f"{child_id}§END_RUN")
+        wait_until(lambda: all(agent.ended for agent in agents), timeout=30)
+    return {
+        "params": {"round_trips": args.round_trips},
+        "metrics": {
+            "round_trip_mean_s": statistics.mean(round_trips),
+            "round_trip_max_s": max(round_trips),
+        },
+    }
+
+def bench_scaling(args, log_dir: str) -> Dict[str, Any]:
+    iterations_per_agent = 20  # agents/mock_agent/manifestos/loop.txt
+    metrics = {}
+    for count in args.scaling:
+        with run_logging(log_dir, f"scaling_{count}"), capture_spawned_agents() as (spawn_module, agents):
+            start = time.perf_counter()
+            for _ in range(count):
+                spawn_module.spawn_subagent("ScalingBenchmark_000000-00000000-", f"{MOCK_AGENT}§loop")
+            finished = wait_until(lambda: all(agent.ended for agent in agents), timeout=args.scaling_timeout)
+            elapsed = time.perf_counter() - start
+        if not finished:
+            print(f"  scaling: {count} agents did not finish within {args.scaling_timeout}s")
+        iterations = sum(agent.llm_call_count for agent in agents)
+        # With unlimited concurrency, every agent would take its iterations times the LLM latency
+        ideal = iterations_per_agent * args.scaling_latency
+        metrics[f"agents_{count}_wall_s"] = elapsed
+        metrics[f"agents_{count}_iterations_per_s"] = iterations / elapsed
+        if ideal:
+            metrics[f"agents_{count}_efficiency"] = ideal / elapsed
+    return {
+        "params": {"agents": args.scaling, "iterations_per_agent": iterations_per_agent, "llm_latency_s": args.scaling_latency},
+        "metrics": metrics,
+    }
+
+BENCHMARKS = {
+    "iteration_overhead": bench_iteration_overhead,
+    "memory_growth": bench_memory_growth,
+    "log_throughput": bench_log_throughput,
+    "spawn_latency": bench_spawn_latency,
+    "message_round_trip": bench_message_round_trip,
+    "scaling": bench_scaling,
+}
+
+def run_benchmark(name: str, args, log_dir: str) -> Dict[str, Any]:
+    """Run a benchmark args.repeat times and report the median of each metric, with the values of every run."""
+    runs = [BENCHMARKS[name](args, log_dir) for _ in range(args.repeat)]
+    metric_names = list(dict.fromkeys(metric for run in runs for metric in run["metrics"]))
+    return {
+        "params": runs[0]["params"],
+        "metrics": {metric: statistics.median(run["metrics"][metric] for run in runs if metric in run["metrics"])
+                    for metric in metric_names},
+        "runs": [run["metrics"] for run in runs],
+    }
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Compare every metric's median with its baseline value.
+
+    A metric regressed if its median and its best run are both worse than the baseline by more than
+    threshold (a fraction), so a single noisy run cannot fail the comparison.
+    """
+    comparisons = []
+    for name, result in results["benchmarks"].items():
+        baseline_result = baseline.get("benchmarks", {}).get(name)
+        if not baseline_result or baseline_result.get("params") != result["params"]:
+            # Different parameters measure something else, the values cannot be compared
+            continue
+        for metric, value in result["metrics"].items():
+            old = baseline_result["metrics"].get(metric)
+            if not old:
+                continue
+            change = (value - old) / old
+            higher_is_better = metric.endswith(HIGHER_IS_BETTER_SUFFIXES)
+            worse = -change if higher_is_better else change
+            run_values = [run[metric] for run in result.get("runs", []) if metric in run] or [value]
+            best = max(run_values) if higher_is_better else min(run_values)
+            best_worse = (old - best if higher_is_better else best - old) / old
+            if worse > threshold and best_worse > threshold:
+                status = "regression"
+            else:
+                status = "improvement" if worse < -threshold else "ok"
+            comparisons.append({"benchmark": name, "metric": metric, "value": value, "baseline": old, "change": change, "status": status})
+    return comparisons
+
+def format_comparisons(comparisons: List[Dict[str, Any]]) -> str:
+    lines = [f"{'Metric':<55} {'Value':>12} {'Baseline':>12} {'Change':>8}  Status"]
+    for c in comparisons:
+        lines.append(f"{c['benchmark'] + '.' + c['metric']:<55} {c['value']:>12.4g} {c['baseline']:>12.4g} {c['change']:>+7.1%}  {c['status']}")
+    return "\n".join(lines)
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the agent loop, run logging, subagent spawning, messaging and scaling with a mock LLM.")
+    parser.add_argument("--only", help=f"Comma-separated benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--backend", choices=["inprocess", "http"], default="inprocess",
+                        help="Answer LLM calls in-process (default), or through litellm and a mock server on --port")
+    parser.add_argument("--port", type=int, default=8002, help="Port of the mock LLM server for --backend http")
+    parser.add_argument("--latency", type=float, default=0.0, help="LLM latency in seconds, except for the scaling benchmark (default: 0)")
+    parser.add_argument("--overhead-iterations", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=1000, help="Iterations of the memory growth benchmark (default: 1000)")
+    parser.add_argument("--log-records", type=int, default=100000)
+    parser.add_argument("--log-record-bytes", type=int, default=200)
+    parser.add_argument("--spawns", type=int, default=20)
+    parser.add_argument("--round-trips", type=int, default=3, help="Message round trips; subagents poll their chat file every 5s, so each takes seconds")
+    parser.add_argument("--scaling", type=lambda value: [int(count) for count in value.split(',')], default=[1, 10, 50, 100, 200],
+                        help="Comma-separated numbers of concurrent subagents (default: 1,10,50,100,200)")
+    parser.add_argument("--scaling-latency", type=float, default=0.05, help="LLM latency in seconds of the scaling benchmark (default: 0.05)")
+    parser.add_argument("--scaling-timeout", type=float, default=300)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results to --baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each benchmark, whose median is reported and compared (default: 3)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative change of a median counted as a regression (default: 0.25)")
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(unknown)}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    server = None
+    if args.backend == "http":
+        server = start_server(args.port)
+        install_http_backend(f"http://127.0.0.1:{args.port}/v1")
+        os.environ.setdefault("OPENAI_API_KEY", "test")
+    chats_dir = os.path.join(PROJECT_ROOT, "chats")
+    existing_chats = set(os.listdir(chats_dir)) if os.path.isdir(chats_dir) else set()
+
+    results = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": get_git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "backend": args.backend,
+        "repeat": args.repeat,
+        "benchmarks": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="agent_benchmarks_") as log_dir:
+            for name in names:
+                latency = args.scaling_latency if name == "scaling" else args.latency
+                if args.backend == "inprocess":
+                    install_inprocess_backend(latency)
+                else:
+                    MockLLMHandler.latency = LatencyDistribution(f"fixed:{latency}")
+                print(f"Running {name}...", flush=True)
+                start = time.perf_counter()
+                results["benchmarks"][name] = run_benchmark(name, args, log_dir)
+                metrics = ", ".join(f"{metric}={value:.4g}" for metric, value in results["benchmarks"][name]["metrics"].items())
+                print(f"  {metrics} ({time.perf_counter() - start:.1f}s)")
+    finally:
+        if server:
+            server.shutdown()
+        # Remove the chat files of the benchmark's subagents
+        if os.path.isdir(chats_dir):
+            for file in set(os.listdir(chats_dir)) - existing_chats:
+                os.remove(os.path.join(chats_dir, file))
+
+    output = args.output or os.path.join(BENCHMARKS_DIR, "results", f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            comparisons = compare_with_baseline(results, json.load(f), args.threshold)
+        results["comparison"] = {"baseline": os.path.relpath(args.baseline, PROJECT_ROOT), "threshold": args.threshold, "metrics": comparisons}
+        regressions = [c for c in comparisons if c["status"] == "regression"]
+        print()
+        print(format_comparisons(comparisons))
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nExiting...")
+        sys.exit(0)
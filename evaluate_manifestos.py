@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Compare the manifesto variants of an agent by running each against its scenarios several times.
+
+Every manifesto in agents/<agent_name>/manifestos/ (or those given with --manifestos) is run K times
+(--trials) against every scenario in scenarios/<agent_name>/, through the headless scenario runner
+(run_scenarios.py), with all trials running in parallel worker processes. Each trial records whether
+the agent completed the run, its iterations, tokens, wall time, tool errors and, with --grader-model,
+a 0-10 score given by an LLM grading the conversation against the scenario.
+
+Trial results are cached in cache/evaluations/ by a hash of the manifesto, the agent config, the
+scenario and the run settings, so manifestos and scenarios that did not change are not run again;
+raising --trials only runs the missing trials.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from main import get_agent_config
+from run_scenarios import DEFAULT_MAX_ITERATIONS, DEFAULT_USER_MODEL, load_scenarios, run_scenario, run_scenarios
+
+EVALUATION_CACHE_VERSION = 3
+# Two-sided 95% critical values of Student's t distribution for 1 to 30 degrees of freedom,
+# the normal approximation (1.96) is used above that
+T_CRITICAL_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+METRICS = [
+    ("iterations", "Iterations", "completed trials only"),
+    ("tokens", "Tokens", "all trials"),
+    ("wall_time", "Wall time (s)", "all trials"),
+    ("tool_errors", "Tool errors", "all trials"),
+    ("score", "Grader score", "graded trials only"),
+]
+
+GRADER_PROMPT = """You are grading how well an AI agent served the user of the scenario below.
+Judge only by the conversation: did the agent reach what the user in the scenario wanted, correctly,
+without needless questions or detours? Answer with one line "SCORE: N" where N is an integer from 0
+(useless) to 10 (perfect), followed by one line explaining the score.
+
+=== SCENARIO ===
+{scenario}
+
+=== CONVERSATION ===
+{transcript}
+
+=== OUTCOME ===
+{outcome}
+"""
+SCORE_PATTERN = re.compile(r'SCORE:\s*(\d+(?:\.\d+)?)', re.IGNORECASE)
+
+def grade_trial(job: Dict[str, Any], result: Dict[str, Any]) -> Tuple[Optional[float], str]:
+    """Ask the grader model to score a trial's conversation from 0 to 10. Returns (score or None, grader reply)."""
+    import litellm
+    transcript = "\n".join(f"{turn['role'].upper()}: {turn['text']}" for turn in result.get("transcript", []))
+    outcome = ("The agent ended the run." if result["status"] == "completed"
+               else f"The agent did not end the run ({result['status']}).")
+    reply = litellm.completion(
+        model=job['grader_model'],
+        messages=[{"role": "user", "content": GRADER_PROMPT.format(
+            scenario=job['scenario_text'], transcript=transcript or "(no messages)", outcome=outcome)}]
+    ).choices[0].message.content
+    match = SCORE_PATTERN.search(reply)
+    return (min(10.0, float(match.group(1))) if match else None), reply.strip()
+
+def run_trial(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one trial of a manifesto on a scenario, and grade it if a grader model is set."""
+    result = run_scenario(job)
+    result["trial_key"] = job['trial_key']
+    if job.get('grader_model') and result["status"] != "error":
+        try:
+            result["score"], result["grader_reply"] = grade_trial(job, result)
+        except Exception as e:
+            result["score"], result["grader_reply"] = None, f"Grader error: {str(e)}"
+    return result
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def get_trial_key(config: Dict[str, Any], manifesto_name: str, manifesto: str, scenario: Dict[str, str],
+                  settings: Dict[str, Any]) -> str:
+    """Return the cache key of the trials of a manifesto on a scenario under the given run settings.
+
+    The names are part of the key, so two manifesto or scenario files with the same text keep their own trials.
+    """
+    key = {
+        "version": EVALUATION_CACHE_VERSION,
+        "config": config,
+        "manifesto_name": manifesto_name,
+        "manifesto": hash_text(manifesto),
+        "scenario_name": scenario["scenario"],
+        "scenario": hash_text(scenario["text"]),
+        **settings,
+    }
+    return hash_text(json.dumps(key, sort_keys=True))
+
+def get_evaluation_cache_path(trial_key: str) -> str:
+    project_root = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(project_root, 'cache', 'evaluations', f"{trial_key}.json")
+
+def load_cached_trials(trial_key: str) -> List[Dict[str, Any]]:
+    try:
+        with open(get_evaluation_cache_path(trial_key), 'r', encoding='utf-8') as f:
+            return json.load(f)["trials"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return []
+
+def save_cached_trials(trial_key: str, trials: List[Dict[str, Any]]) -> None:
+    path = get_evaluation_cache_path(trial_key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"trials": trials}, f)
+    os.replace(temp_path, path)
+
+def t_critical(df: int) -> float:
+    return T_CRITICAL_95[df - 1] if df <= len(T_CRITICAL_95) else 1.96
+
+def mean_interval(values: List[float]) -> Optional[Tuple[float, float]]:
+    """Return (mean, half-width of its 95% confidence interval), or None without values."""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0], math.inf
+    return statistics.mean(values), t_critical(len(values) - 1) * statistics.stdev(values) / math.sqrt(len(values))
+
+def wilson_interval(successes: int, trials: int) -> Tuple[float, float]:
+    """Return the 95% Wilson score interval (low, high) of a success rate."""
+    if not trials:
+        return 0.0, 1.0
+    z = 1.96
+    rate = successes / trials
+    center = (rate + z * z / (2 * trials)) / (1 + z * z / trials)
+    half_width = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / (1 + z * z / trials)
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+def difference_interval(values: List[float], baseline: List[float]) -> Optional[Tuple[float, float]]:
+    """Return (difference of the means, half-width of its 95% Welch confidence interval), or None with fewer than 2 values per side."""
+    if len(values) < 2 or len(baseline) < 2:
+        return None
+    var_a, var_b = statistics.variance(values) / len(values), statistics.variance(baseline) / len(baseline)
+    difference = statistics.mean(values) - statistics.mean(baseline)
+    if var_a + var_b == 0:
+        return difference, 0.0
+    # Welch-Satterthwaite degrees of freedom
+    df = (var_a + var_b) ** 2 / (var_a ** 2 / (len(values) - 1) + var_b ** 2 / (len(baseline) - 1))
+    return difference, t_critical(max(1, int(df))) * math.sqrt(var_a + var_b)
+
+def metric_values(trials: List[Dict[str, Any]], metric: str) -> List[float]:
+    if metric == "iterations":
+        trials = [trial for trial in trials if trial["status"] == "completed"]
+    return [trial[metric] for trial in trials if trial.get(metric) is not None]
+
+def format_interval(interval: Optional[Tuple[float, float]], signed: bool = False) -> str:
+    if interval is None:
+        return "-"
+    value, half_width = interval
+    value_text = f"{value:+.1f}" if signed else f"{value:.1f}"
+    return f"{value_text} ± {half_width:.1f}" if math.isfinite(half_width) else f"{value_text} ± ?"
+
+def format_report(agent_name: str, trials_by_manifesto: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Render the per-manifesto metrics with 95% confidence intervals, and their differences to the first manifesto."""
+    output = [f"=== MANIFESTO EVALUATION: {agent_name} ===\n"]
+    output.append("Values are mean ± half-width of the 95% confidence interval.\n")
+
+    output.append("\n--- COMPLETION ---\n")
+    output.append(f"{'Manifesto':<40} {'Trials':>7} {'Completed':>10} {'Rate':>6} {'95% CI':>15} {'Errors':>7}\n")
+    for manifesto, trials in trials_by_manifesto.items():
+        completed = sum(1 for trial in trials if trial["status"] == "completed")
+        errors = sum(1 for trial in trials if trial["status"] == "error")
+        low, high = wilson_interval(completed, len(trials))
+        rate = completed / len(trials) if trials else 0.0
+        output.append(f"{manifesto:<40} {len(trials):>7} {completed:>10} {rate:>6.0%} {f'{low:.0%}-{high:.0%}':>15} {errors:>7}\n")
+
+    output.append("\n--- METRICS ---\n")
+    output.append(f"{'Manifesto':<40}" + "".join(f"{label:>20}" for _, label, _ in METRICS) + "\n")
+    for manifesto, trials in trials_by_manifesto.items():
+        cells = [format_interval(mean_interval(metric_values(trials, metric))) for metric, _, _ in METRICS]
+        output.append(f"{manifesto:<40}" + "".join(f"{cell:>20}" for cell in cells) + "\n")
+    output.append("(" + "; ".join(f"{label}: {note}" for _, label, note in METRICS) + ")\n")
+
+    if len(trials_by_manifesto) > 1:
+        baseline_name, baseline = next(iter(trials_by_manifesto.items()))
+        output.append(f"\n--- DIFFERENCE TO {baseline_name} (Welch 95% CI; an interval not containing 0 is a significant difference) ---\n")
+        output.append(f"{'Manifesto':<40}" + "".join(f"{label:>20}" for _, label, _ in METRICS) + "\n")
+        for manifesto, trials in list(trials_by_manifesto.items())[1:]:
+            cells = [format_interval(difference_interval(metric_values(trials, metric), metric_values(baseline, metric)), signed=True)
+                     for metric, _, _ in METRICS]
+            output.append(f"{manifesto:<40}" + "".join(f"{cell:>20}" for cell in cells) + "\n")
+
+    return "".join(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run K trials of each manifesto of an agent against its scenarios and compare them.")
+    parser.add_argument("agent", help="Agent to evaluate (e.g. research_agent)")
+    parser.add_argument("--manifestos", nargs="+", help="Manifesto files in agents/<agent>/manifestos/ to compare, the first is the baseline (default: all)")
+    parser.add_argument("--trials", type=int, default=5, help="Trials per manifesto and scenario (default: 5)")
+    parser.add_argument("--scenarios", help="Only use the scenario files matching this glob")
+    parser.add_argument("--workers", type=int, default=4, help="Number of trials run at the same time (default: 4)")
+    parser.add_argument("--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS,
+                        help=f"Stop a trial after this many agent iterations without END_RUN (default: {DEFAULT_MAX_ITERATIONS})")
+    parser.add_argument("--user", choices=["auto", "scripted", "llm"], default="auto", help="How ASK_USER is answered, see run_scenarios.py")
+    parser.add_argument("--user-model", default=DEFAULT_USER_MODEL, help=f"Model simulating the user (default: {DEFAULT_USER_MODEL})")
+    parser.add_argument("--grader-model", help="Model grading each trial's conversation from 0 to 10 (default: no grading)")
+    parser.add_argument("--no-cache", action="store_true", help="Run all trials again instead of reusing cached ones")
+    parser.add_argument("--json", help="Also write all trial results and the report to this JSON file")
+    args = parser.parse_args()
+
+    config = get_agent_config(args.agent)
+    if not config:
+        sys.exit(1)
+    manifesto_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "agents", args.agent, "manifestos")
+    manifesto_names = args.manifestos or sorted(f for f in os.listdir(manifesto_dir) if not f.startswith('.'))
+    manifestos = {}
+    for name in manifesto_names:
+        try:
+            with open(os.path.join(manifesto_dir, name)) as f:
+                manifestos[name] = f.read()
+        except FileNotFoundError:
+            print(f"Could not find manifesto {name} in {manifesto_dir}")
+            sys.exit(1)
+
+    scenarios = load_scenarios(args.agent, args.scenarios)
+    if not scenarios:
+        print(f"No scenarios found in scenarios/{args.agent}/")
+        sys.exit(1)
+
+    settings = {"max_iterations": args.max_iterations, "user_mode": args.user,
+                "user_model": args.user_model, "grader_model": args.grader_model}
+    cached: Dict[str, List[Dict[str, Any]]] = {}
+    jobs = []
+    for manifesto_name, manifesto in manifestos.items():
+        for scenario in scenarios:
+            trial_key = get_trial_key(config, manifesto_name, manifesto, scenario, settings)
+            # All cached trials are kept, also when fewer are asked for, only the report uses the first --trials
+            cached[trial_key] = [] if args.no_cache else load_cached_trials(trial_key)
+            for _ in range(args.trials - len(cached[trial_key])):
+                jobs.append({
+                    "agent_name": args.agent,
+                    "config": config,
+                    "manifesto_name": manifesto_name,
+                    "manifesto": manifesto,
+                    "scenario": scenario["scenario"],
+                    "scenario_text": scenario["text"],
+                    "trial_key": trial_key,
+                    **settings,
+                })
+
+    total = len(manifestos) * len(scenarios) * args.trials
+    print(f"{total} trials ({len(manifestos)} manifestos x {len(scenarios)} scenarios x {args.trials}), "
+          f"{total - len(jobs)} cached, running {len(jobs)} with {args.workers} worker(s)")
+
+    def on_result(job: Dict[str, Any], result: Dict[str, Any]) -> None:
+        print(f"  {result['status']:<15} {job['manifesto_name']} | {job['scenario']} | {result.get('iterations', 0)} iterations"
+              + (f" | score {result['score']}" if result.get('score') is not None else ""))
+        # Cache every trial as it finishes, so an interrupted evaluation keeps the finished ones
+        if result["status"] != "error":
+            cached[job['trial_key']].append(result)
+            save_cached_trials(job['trial_key'], cached[job['trial_key']])
+
+    results = run_scenarios(jobs, args.workers, on_result=on_result, worker=run_trial) if jobs else []
+
+    trials_by_manifesto: Dict[str, List[Dict[str, Any]]] = {}
+    for manifesto_name, manifesto in manifestos.items():
+        trials = trials_by_manifesto.setdefault(manifesto_name, [])
+        for scenario in scenarios:
+            trials.extend(cached[get_trial_key(config, manifesto_name, manifesto, scenario, settings)][:args.trials])
+    # Failed trials are not cached, but still count against their manifesto in this report
+    for result in results:
+        if result["status"] == "error":
+            trials_by_manifesto[result["manifesto"]].append(result)
+
+    report = format_report(args.agent, trials_by_manifesto)
+    print()
+    print(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"agent": args.agent, "settings": settings, "trials": trials_by_manifesto, "report": report}, f, indent=2)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nExiting...")
+        sys.exit(0)
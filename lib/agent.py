@@ -1,6 +1,17 @@
 from .base import Agent
 import os
 import importlib.util
+import weakref
+from typing import Optional
+
+# Agents created in this process, by agent ID, so tools can read per-agent settings (e.g. "search_backend")
+# of their caller from agent.config. Weak references, so an agent is forgotten once it is no longer used.
+_agents_by_id: 'weakref.WeakValueDictionary[str, Agent]' = weakref.WeakValueDictionary()
+
+def get_agent_config_by_id(agent_id: str) -> Optional[dict]:
+    """Return the config an agent was created from, or None for agents not created by create_agent."""
+    agent = _agents_by_id.get(agent_id)
+    return getattr(agent, 'config', None)
 
 def create_agent(
     config: dict,
@@ -54,4 +65,16 @@ def create_agent(
    if 'max_tokens' in config:
        agent_params["max_tokens"] = config['max_tokens']
 
-   return Agent(**agent_params)
+   if 'log_mode' in config:
+       agent_params["log_mode"] = config['log_mode']
+
+   if 'max_iterations' in config:
+       agent_params["max_iterations"] = config['max_iterations']
+
+   if 'api_base' in config:
+       agent_params["api_base"] = config['api_base']
+
+   agent = Agent(**agent_params)
+   agent.config = config
+   _agents_by_id[agent.id] = agent
+   return agent
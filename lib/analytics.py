@@ -0,0 +1,256 @@
+import json
+import math
+import multiprocessing
+import os
+import re
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from lib.run_log import AGENT_ID_PATTERN, get_runs_dir, get_structured_log_paths, read_structured_events, scan_log
+
+# Metrics of one run log, extracted by analyze_run_log() and cached under cache/analytics/ for the
+# size and mtime of the log, so only new or grown logs are parsed again:
+#   {agent_id: {"iterations": N, "llm_times": [...], "tool_times": {tool: [...]},
+#               "tool_errors": {tool: N}, "memory_usage": [% after iteration 1, 2, ...]}}
+ANALYTICS_VERSION = 1
+
+# One alternative per metric line of the text log. Timings and errors come from the INFO lines,
+# memory usage and tool calls from the per-line prefixed memory dumps, iterations from the banners.
+TEXT_METRICS_PATTERN = re.compile(
+    rb'^agent\.(' + AGENT_ID_PATTERN + rb') - \[LLM Response\] Length: \d+ \| Time: ([\d.]+)s'
+    rb'|^agent\.(' + AGENT_ID_PATTERN + rb') - \[Tool: ([A-Z_]+)\] Input Length: \d+ \| Result Length: \d+ \| Time: ([\d.]+)s'
+    rb'|^agent\.(' + AGENT_ID_PATTERN + rb') - Tool Error: '
+    rb'|^(?:agent\.\S+ - )?\[(' + AGENT_ID_PATTERN + rb')\]\[Memory(?: #\d+)?\](?:[^\n]*?<TOOL: ([A-Z_]+)>| Your Memory Usage %: ([\d.]+))'
+    rb'|\[(' + AGENT_ID_PATTERN + rb') - LLM Response - Agent Iterations (\d+)\]',
+    re.MULTILINE
+)
+
+# Upper bounds (seconds) of the latency histogram buckets
+HISTOGRAM_BUCKETS = [0.1, 0.5, 1, 2, 5, 10, 30, 60]
+# Iterations at which the memory usage curves are sampled
+MEMORY_CURVE_ITERATIONS = [1, 2, 5, 10, 20, 50, 100]
+
+def _new_agent_metrics() -> Dict[str, Any]:
+    return {'iterations': 0, 'llm_times': [], 'tool_times': {}, 'tool_errors': {}, 'memory_usage': []}
+
+def analyze_run_log(run_log_path: str) -> Dict[str, Dict[str, Any]]:
+    """Extract the per-agent metrics of one text run log.
+
+    LLM and tool timings, tool errors and iteration counts are taken from the structured .jsonl log
+    when the run has one, since its records cannot be confused with log text quoted in tool results.
+    Otherwise they are parsed from the text log, where a tool error is attributed to the first tool
+    called in the LLM response of that iteration.
+    """
+    agents: Dict[str, Dict[str, Any]] = {}
+    pending_tool: Dict[str, Optional[str]] = {}
+
+    for _, groups in scan_log(run_log_path, TEXT_METRICS_PATTERN):
+        (llm_agent, llm_time, tool_agent, tool, tool_time, error_agent,
+         memory_agent, memory_tool, memory_usage, banner_agent, iteration) = groups
+        if llm_agent:
+            agents.setdefault(llm_agent.decode(), _new_agent_metrics())['llm_times'].append(float(llm_time))
+        elif tool_agent:
+            metrics = agents.setdefault(tool_agent.decode(), _new_agent_metrics())
+            metrics['tool_times'].setdefault(tool.decode(), []).append(float(tool_time))
+        elif error_agent:
+            agent_id = error_agent.decode()
+            tool_name = pending_tool.get(agent_id) or 'UNKNOWN'
+            errors = agents.setdefault(agent_id, _new_agent_metrics())['tool_errors']
+            errors[tool_name] = errors.get(tool_name, 0) + 1
+        elif memory_agent:
+            agent_id = memory_agent.decode()
+            if memory_usage:
+                agents.setdefault(agent_id, _new_agent_metrics())['memory_usage'].append(float(memory_usage))
+            elif pending_tool.get(agent_id) is None:
+                pending_tool[agent_id] = memory_tool.decode()
+        elif banner_agent:
+            agent_id = banner_agent.decode('utf-8', errors='replace')
+            metrics = agents.setdefault(agent_id, _new_agent_metrics())
+            if int(iteration) > metrics['iterations']:
+                # Opening banner of a new iteration
+                metrics['iterations'] = int(iteration)
+                pending_tool[agent_id] = None
+
+    jsonl_path, _ = get_structured_log_paths(run_log_path)
+    if os.path.exists(jsonl_path):
+        for metrics in agents.values():
+            metrics.update({'iterations': 0, 'llm_times': [], 'tool_times': {}, 'tool_errors': {}})
+        for event in read_structured_events(jsonl_path):
+            metrics = agents.setdefault(event['agent_id'], _new_agent_metrics())
+            metrics['iterations'] = max(metrics['iterations'], event['iteration'])
+            if event['type'] == 'llm_response':
+                metrics['llm_times'].append(event['time'])
+            elif event['type'] == 'tool_result':
+                if 'error' in event:
+                    metrics['tool_errors'][event['tool']] = metrics['tool_errors'].get(event['tool'], 0) + 1
+                else:
+                    metrics['tool_times'].setdefault(event['tool'], []).append(event['time'])
+
+    return agents
+
+def get_analytics_cache_path(run_log_path: str) -> str:
+    """Return where the metrics of a run log are cached: cache/analytics/<agent>/<log>.json."""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    relative = os.path.relpath(os.path.abspath(run_log_path), get_runs_dir())
+    return os.path.join(project_root, 'cache', 'analytics', relative + '.json')
+
+def _load_cached_metrics(run_log_path: str) -> Optional[Dict[str, Any]]:
+    """Return the cached metrics of a run log if they are still valid for its size and mtime."""
+    stat = os.stat(run_log_path)
+    try:
+        with open(get_analytics_cache_path(run_log_path), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if cached.get('version') != ANALYTICS_VERSION or (cached['size'], cached['mtime']) != (stat.st_size, stat.st_mtime):
+        return None
+    return cached['agents']
+
+def _analyze_and_cache(run_log_path: str) -> Dict[str, Any]:
+    """Worker: analyze a run log and cache its metrics. Runs in a separate process."""
+    stat = os.stat(run_log_path)
+    agents = analyze_run_log(run_log_path)
+    cache_path = get_analytics_cache_path(run_log_path)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': ANALYTICS_VERSION, 'size': stat.st_size, 'mtime': stat.st_mtime, 'agents': agents}, f)
+    os.replace(temp_path, cache_path)
+    return agents
+
+def list_run_logs(agent_name: Optional[str] = None) -> List[str]:
+    """Return the paths of all text run logs in runs/, or only those of one agent."""
+    base = os.path.join(get_runs_dir(), agent_name) if agent_name else get_runs_dir()
+    paths = []
+    for root, _, files in os.walk(base):
+        for file in files:
+            if file.startswith('run_log_') and file.endswith('.txt'):
+                paths.append(os.path.join(root, file))
+    paths.sort()
+    return paths
+
+def collect_run_metrics(run_log_paths: List[str], workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Return the metrics of each run log, keyed by path, parsing logs that are not cached in a process pool.
+
+    The pool uses the spawn start method, since this can be called from a process that runs agent
+    and log writer threads, which forking would copy in an arbitrary state.
+    """
+    results = {}
+    to_parse = []
+    for path in run_log_paths:
+        cached = _load_cached_metrics(path)
+        if cached is None:
+            to_parse.append(path)
+        else:
+            results[path] = cached
+
+    if len(to_parse) == 1 or workers == 1:
+        for path in to_parse:
+            results[path] = _analyze_and_cache(path)
+    elif to_parse:
+        workers = workers or min(len(to_parse), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            for path, agents in zip(to_parse, executor.map(_analyze_and_cache, to_parse, chunksize=4)):
+                results[path] = agents
+
+    return results
+
+def get_agent_class(agent_id: str) -> str:
+    """Return the agent name part of an agent ID, e.g. ResearchAgent for ResearchAgent_101112-1a2b3c4d-."""
+    return agent_id.split('_')[0]
+
+def percentile(values: List[float], p: float) -> float:
+    """Return the p-th percentile of values (nearest-rank method)."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def aggregate_run_metrics(run_metrics: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-log metrics into totals for all LLM calls, per tool and per agent."""
+    llm_times: List[float] = []
+    tools: Dict[str, Dict[str, Any]] = {}
+    agents: Dict[str, Dict[str, Any]] = {}
+    for log_agents in run_metrics.values():
+        for agent_id, metrics in log_agents.items():
+            llm_times.extend(metrics['llm_times'])
+            for tool, times in metrics['tool_times'].items():
+                tools.setdefault(tool, {'times': [], 'errors': 0})['times'].extend(times)
+            for tool, count in metrics['tool_errors'].items():
+                tools.setdefault(tool, {'times': [], 'errors': 0})['errors'] += count
+
+            agent = agents.setdefault(get_agent_class(agent_id), {'instances': 0, 'iterations': [], 'llm_times': [], 'memory_curves': []})
+            agent['instances'] += 1
+            agent['iterations'].append(metrics['iterations'])
+            agent['llm_times'].extend(metrics['llm_times'])
+            if metrics['memory_usage']:
+                agent['memory_curves'].append(metrics['memory_usage'])
+
+    return {'run_logs': len(run_metrics), 'llm_times': llm_times, 'tools': tools, 'agents': agents}
+
+def format_histogram(values: List[float], width: int = 40) -> str:
+    """Render a text histogram of latencies over HISTOGRAM_BUCKETS."""
+    counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+    for value in values:
+        counts[next((i for i, bound in enumerate(HISTOGRAM_BUCKETS) if value < bound), len(HISTOGRAM_BUCKETS))] += 1
+    largest = max(counts) or 1
+    lines = []
+    lower = 0
+    for bound, count in zip(HISTOGRAM_BUCKETS + [None], counts):
+        label = f"{lower:g}-{bound:g}s" if bound is not None else f">={lower:g}s"
+        lines.append(f"  {label:>10} | {'#' * math.ceil(count / largest * width):<{width}} {count}")
+        lower = bound
+    return "\n".join(lines)
+
+def format_analytics(totals: Dict[str, Any], histogram_tool: Optional[str] = None) -> str:
+    """Render aggregated metrics as tables and a latency histogram."""
+    output = [f"=== RUN LOG ANALYTICS: {totals['run_logs']} run logs ===\n"]
+
+    llm_times = totals['llm_times']
+    output.append("\n--- LLM CALLS ---\n")
+    if llm_times:
+        output.append(f"Calls: {len(llm_times)} | Mean: {statistics.mean(llm_times):.2f}s | "
+                      f"p50: {percentile(llm_times, 50):.2f}s | p95: {percentile(llm_times, 95):.2f}s | Max: {max(llm_times):.2f}s\n")
+    else:
+        output.append("No LLM calls found.\n")
+
+    output.append("\n--- TOOLS ---\n")
+    output.append(f"{'Tool':<40} {'Calls':>7} {'Errors':>7} {'Error %':>8} {'p50':>8} {'p95':>8} {'Max':>8}\n")
+    for tool, data in sorted(totals['tools'].items(), key=lambda item: -(len(item[1]['times']) + item[1]['errors'])):
+        times = data['times']
+        calls = len(times) + data['errors']
+        latency = f"{percentile(times, 50):>7.2f}s {percentile(times, 95):>7.2f}s {max(times):>7.2f}s" if times else f"{'-':>8} {'-':>8} {'-':>8}"
+        output.append(f"{tool:<40} {calls:>7} {data['errors']:>7} {data['errors'] / calls * 100:>7.1f}% {latency}\n")
+
+    output.append("\n--- AGENTS ---\n")
+    output.append(f"{'Agent':<40} {'Instances':>9} {'Mean iters':>10} {'Max iters':>9} {'LLM p50':>8} {'LLM p95':>8}\n")
+    for agent, data in sorted(totals['agents'].items(), key=lambda item: -statistics.mean(item[1]['iterations'])):
+        times = data['llm_times']
+        latency = f"{percentile(times, 50):>7.2f}s {percentile(times, 95):>7.2f}s" if times else f"{'-':>8} {'-':>8}"
+        output.append(f"{agent:<40} {data['instances']:>9} {statistics.mean(data['iterations']):>10.1f} {max(data['iterations']):>9} {latency}\n")
+
+    output.append("\n--- MEMORY USAGE BY ITERATION (logged 'Memory Usage %', mean over agent instances that reached it) ---\n")
+    output.append(f"{'Agent':<40}" + "".join(f"{'it ' + str(i):>8}" for i in MEMORY_CURVE_ITERATIONS) + "\n")
+    for agent, data in sorted(totals['agents'].items()):
+        if not data['memory_curves']:
+            continue
+        cells = []
+        for i in MEMORY_CURVE_ITERATIONS:
+            samples = [curve[i - 1] for curve in data['memory_curves'] if len(curve) >= i]
+            cells.append(f"{statistics.mean(samples):>8.2f}" if samples else f"{'-':>8}")
+        output.append(f"{agent:<40}" + "".join(cells) + "\n")
+
+    if histogram_tool:
+        times = totals['tools'].get(histogram_tool, {}).get('times', [])
+        output.append(f"\n--- {histogram_tool} LATENCY HISTOGRAM ({len(times)} calls) ---\n")
+    else:
+        times = llm_times
+        output.append(f"\n--- LLM LATENCY HISTOGRAM ({len(times)} calls) ---\n")
+    output.append(format_histogram(times) + "\n")
+
+    return "".join(output)
+
+def run_analytics(agent_name: Optional[str] = None, histogram_tool: Optional[str] = None, workers: Optional[int] = None) -> Tuple[Dict[str, Any], str]:
+    """Analyze all run logs (or those of one agent) and return the aggregated totals and their text report."""
+    run_metrics = collect_run_metrics(list_run_logs(agent_name), workers)
+    totals = aggregate_run_metrics(run_metrics)
+    return totals, format_analytics(totals, histogram_tool)
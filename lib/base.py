@@ -1,5 +1,6 @@
 from typing import Dict, Optional, Tuple, Callable
 import logging
+import os
 from lib.tools.read_readme import read_readme
 import litellm
 import re
@@ -30,13 +31,31 @@ class Agent():
       tools: Dict[str, Callable],
       model: str = "openai/gpt-4o",
       max_tokens: int = 128000,
+      log_mode: Optional[str] = None,
+      max_iterations: Optional[int] = None,
+      api_base: Optional[str] = None,
   ):
     """Initialize the agent with a manifesto and optional tools and functions.
+
+    log_mode is "full" (default) or "dedup". In "dedup" mode every memory block is logged once,
+    numbered as [Memory #N], and the LLM response and tool debug records point to it instead of
+    repeating it. Defaults to the AGENT_RUN_LOG_MODE environment variable.
+
+    max_iterations, if set, stops the run after that many LLM calls even if END_RUN was not called.
+
+    api_base sends the LLM calls to another OpenAI-compatible endpoint, e.g. the local mock server in
+    mocks/llm_server.py. Defaults to the AGENT_LLM_API_BASE environment variable.
     """
     self.id = name + "_" + time.strftime("%H%M%S") + "-" + secrets.token_hex(4) + "-"
     self.llm_call_count = 0
+    # Tokens used by all LLM calls of this agent, as reported by the provider
+    self.token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
     self.model = model
     self.max_tokens = max_tokens
+    self.max_iterations = max_iterations
+    self.api_base = api_base or os.environ.get("AGENT_LLM_API_BASE")
+    self.log_mode = log_mode or os.environ.get("AGENT_RUN_LOG_MODE", "full")
+    self.memory_block_count = 0
     encoded_str = "=$=$Q$I$h$E$S$I$X$9$E$T$M$9$k$R$g$Q$1$U$V$1$E$I$P$R$1$U$F$Z$U$S$O$F$U$T$g$Q$l$T$F$d$U$Q$g$4$0$T$J$R$1$Q$V$J$F$V$T$5$U$S$g$0$U$R$U$N$V$W$T$B$C$V$O$F$E$V$S$9$E$U$N$l$U$I$h$E$S$I"
     parts = encoded_str.split('$')
     parts.reverse()
@@ -64,9 +83,17 @@ class Agent():
     self.memory = text
 
   def update_memory(self, text: str) -> None:
-    self.logger.debug("\n".join(f"[{self.id}][Memory]{line}" for line in text.split("\n")))
+    self.memory_block_count += 1
+    # Building the prefixed lines is the expensive part, skip it when nobody records DEBUG
+    if self.logger.isEnabledFor(logging.DEBUG):
+      tag = f"[Memory #{self.memory_block_count}]" if self.log_mode == "dedup" else "[Memory]"
+      self.logger.debug("\n".join(f"[{self.id}]{tag}{line}" for line in text.split("\n")))
     self.memory += text
 
+  def event(self, event_type: str, **fields) -> dict:
+    """Build a structured run-log event for the current iteration, passed to the logger via extra={"events": [...]}."""
+    return {"type": event_type, "iteration": self.llm_call_count, **fields}
+
   def tool_detection(self, text: str) -> Optional[Tuple[str, str]]:
     """Detect first tool call in the text and return a (tool_name, tool_input) tuple or None."""
     pattern = r'<TOOL: ([A-Z_]+)>([\s\S]*)</TOOL>'
@@ -75,24 +102,36 @@ class Agent():
 
   def llm_call(self, prompt: str, **kwargs) -> str:
     self.llm_call_count += 1
-    return litellm.completion(
+    if self.api_base:
+      kwargs.setdefault("api_base", self.api_base)
+    response = litellm.completion(
       model=self.model,
       messages=[{"role": "user", "content": prompt}],
       **kwargs
-    ).choices[0].message.content
+    )
+    usage = getattr(response, "usage", None)
+    if usage:
+      for key in self.token_usage:
+        self.token_usage[key] += getattr(usage, key, 0) or 0
+    return response.choices[0].message.content
 
   def run(self) -> None:
     # agent loop
     while True:
       self._last_tool_called = None
       llm_call_start_time = time.time()
+      tokens_before = self.token_usage["total_tokens"]
       raw_response = self.llm_call(self.manifesto + "\n" + self.memory)
       llm_call_time = time.time() - llm_call_start_time
       iteration_delimiter = f"\n[{self.id} - LLM Response - Agent Iterations {self.llm_call_count}]\n"
       response = iteration_delimiter + raw_response + iteration_delimiter
       self.update_memory(response)
-      self.logger.info(f"[LLM Response] Length: {len(response)} | Time: {llm_call_time:.4f}s")
-      self.logger.debug(f"[LLM Response] Result: {response}")
+      self.logger.info(f"[LLM Response] Length: {len(response)} | Time: {llm_call_time:.4f}s", extra={"events": [
+        self.event("llm_response", text=raw_response, time=llm_call_time, tokens=self.token_usage["total_tokens"] - tokens_before)]})
+      if self.log_mode == "dedup":
+        self.logger.debug(f"[LLM Response] Result: see [Memory #{self.memory_block_count}]")
+      else:
+        self.logger.debug(f"[LLM Response] Result: {response}")
 
       # tool_detection
       tool_call = self.tool_detection(raw_response)
@@ -104,25 +143,33 @@ class Agent():
             start_time = time.time()
             result = tool(self.id, tool_args)
             execution_time = time.time() - start_time
-            self.logger.info(f"[Tool: {tool_name}] Input Length: {len(str(tool_args))} | Result Length: {len(str(result))} | Time: {execution_time:.4f}s")
-            self.logger.debug(f"[Tool: {tool_name}] Input: {tool_args} | Result: {result}")
-            self.update_memory(f"\nTool Result [Tool: {tool_name}] Input: {tool_args} | Result: {result} | Time: {execution_time:.4f}s\n")
+            self.logger.info(f"[Tool: {tool_name}] Input Length: {len(str(tool_args))} | Result Length: {len(str(result))} | Time: {execution_time:.4f}s", extra={"events": [
+              self.event("tool_call", tool=tool_name, input=tool_args),
+              self.event("tool_result", tool=tool_name, result=str(result), time=execution_time)]})
+            if self.log_mode == "dedup":
+              self.update_memory(f"\nTool Result [Tool: {tool_name}] Input: {tool_args} | Result: {result} | Time: {execution_time:.4f}s\n")
+              self.logger.debug(f"[Tool: {tool_name}] Input and Result: see [Memory #{self.memory_block_count}]")
+            else:
+              self.logger.debug(f"[Tool: {tool_name}] Input: {tool_args} | Result: {result}")
+              self.update_memory(f"\nTool Result [Tool: {tool_name}] Input: {tool_args} | Result: {result} | Time: {execution_time:.4f}s\n")
           except Exception as e:
-            self.logger.info(f"Tool Error: {str(e)}")
+            self.logger.info(f"Tool Error: {str(e)}", extra={"events": [
+              self.event("tool_call", tool=tool_name, input=tool_args),
+              self.event("tool_result", tool=tool_name, error=str(e), time=time.time() - start_time)]})
             self.logger.error(traceback.format_exc())
             self.update_memory(f"\nTool Error: {str(e)}\n")
         else:
           error_message = f"Tool Not Found: {tool_call[0]}"
-          self.logger.info(error_message)
+          self.logger.info(error_message, extra={"events": [self.event("note", text=error_message)]})
           self.update_memory(f"\n{error_message}\n")
       else:
         no_tool_message = "No tool call detected in LLM response based on exact regex match."
-        self.logger.info(no_tool_message)
+        self.logger.info(no_tool_message, extra={"events": [self.event("note", text=no_tool_message)]})
         self.update_memory(f"\n{no_tool_message}\n")
 
       if self._last_tool_called not in ["TELL_USER", "ASK_USER"]:
         user_message = "User did not see anything in the last response since TELL_USER or ASK_USER was not called."
-        self.logger.info(user_message)
+        self.logger.info(user_message, extra={"events": [self.event("note", text=user_message)]})
         self.update_memory(f"\n Note: {user_message} \n")
 
       self.update_memory(f"\n Your Memory Usage %: {len(self.memory)/3/self.max_tokens:.2f} \n")
@@ -131,4 +178,9 @@ class Agent():
         self.logger.debug(f"[Agent {self.id}] Ended")
         break
 
+      if self.max_iterations and self.llm_call_count >= self.max_iterations:
+        limit_message = f"Stopped after reaching the maximum of {self.max_iterations} iterations without END_RUN."
+        self.logger.info(limit_message, extra={"events": [self.event("note", text=limit_message)]})
+        break
+
     return
@@ -0,0 +1,76 @@
+import fnmatch
+import os
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_MAX_DEPTH = 4
+DEFAULT_MAX_ENTRIES = 50
+DEFAULT_IGNORE = ('.git', 'runs', 'chats', 'cache', '__pycache__')
+
+# Rendered trees, by (root, options). A tree only changes when an entry is added to, removed from
+# or renamed in one of the directories it shows, which changes that directory's mtime, so a cached
+# tree is valid while the mtimes of all the directories it listed are unchanged.
+_tree_cache: Dict[tuple, Tuple[List[Tuple[str, int]], str]] = {}
+_tree_cache_lock = threading.Lock()
+
+def _is_ignored(name: str, ignore: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in ignore)
+
+def _tree_is_current(listed_dirs: List[Tuple[str, int]]) -> bool:
+    for path, mtime_ns in listed_dirs:
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+def render_directory_tree(
+    root: str,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    ignore: Sequence[str] = DEFAULT_IGNORE,
+    max_entries: int = DEFAULT_MAX_ENTRIES
+) -> str:
+    """Render root as a tree, like the `tree` command.
+
+    Entries matching an ignore glob are left out, directories deeper than max_depth are shown but
+    not expanded, and directories with more than max_entries entries show the first ones and a
+    "... N more" line.
+    """
+    root = os.path.abspath(root)
+    key = (root, max_depth, tuple(ignore), max_entries)
+    with _tree_cache_lock:
+        cached = _tree_cache.get(key)
+    if cached is not None and _tree_is_current(cached[0]):
+        return cached[1]
+
+    result = [os.path.basename(root)]
+    listed_dirs = []
+
+    def add_directory(directory: str, prefix: str, depth: int):
+        try:
+            listed_dirs.append((directory, os.stat(directory).st_mtime_ns))
+            with os.scandir(directory) as entries:
+                children = sorted(
+                    (entry.name, entry.is_dir(follow_symlinks=False))
+                    for entry in entries if not _is_ignored(entry.name, ignore)
+                )
+        except OSError as e:
+            result.append(f"{prefix}└── [unreadable: {e.strerror}]")
+            return
+
+        shown = children[:max_entries]
+        hidden = len(children) - len(shown)
+        for i, (name, is_dir) in enumerate(shown):
+            is_last = i == len(shown) - 1 and not hidden
+            result.append(f"{prefix}{'└── ' if is_last else '├── '}{name}{'/' if is_dir else ''}")
+            if is_dir and depth < max_depth:
+                add_directory(os.path.join(directory, name), prefix + ("    " if is_last else "│   "), depth + 1)
+        if hidden:
+            result.append(f"{prefix}└── ... {hidden} more")
+
+    add_directory(root, "", 1)
+    tree = "\n".join(result)
+    with _tree_cache_lock:
+        _tree_cache[key] = (listed_dirs, tree)
+    return tree
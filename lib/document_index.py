@@ -0,0 +1,111 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List
+
+from lib.http_cache import get_cached_text, get_http_cache_dir
+
+# Full-text index (SQLite FTS5, ranked with BM25) over the text OPEN_URL has extracted, stored in
+# cache/documents.db. It follows the HTTP cache: every search first indexes the URL entries written
+# since the previous one, reindexing URLs whose page changed, so the index grows with the pages
+# agents open without a separate indexing step.
+DOCUMENT_INDEX_VERSION = 1
+# A URL fetched this recently without extracted text may still be being extracted, so the next
+# update looks at it again; older ones are pages without extractable text
+PENDING_EXTRACTION_SECONDS = 600
+
+_index_lock = threading.Lock()
+
+def get_document_index_path() -> str:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, 'cache', 'documents.db')
+
+def connect_document_index() -> sqlite3.Connection:
+    """Open the document index database, creating its tables if needed."""
+    path = get_document_index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version != DOCUMENT_INDEX_VERSION:
+        connection.executescript("""
+            DROP TABLE IF EXISTS indexed_urls;
+            DROP TABLE IF EXISTS documents;
+            DROP TABLE IF EXISTS index_state;
+        """)
+        connection.executescript(f"""
+            CREATE TABLE indexed_urls (url TEXT PRIMARY KEY, hash TEXT);
+            CREATE TABLE index_state (key TEXT PRIMARY KEY, value REAL);
+            CREATE VIRTUAL TABLE documents USING fts5(url UNINDEXED, title, content);
+            PRAGMA user_version = {DOCUMENT_INDEX_VERSION};
+        """)
+    return connection
+
+def update_document_index(connection: sqlite3.Connection) -> None:
+    """Index the extracted text of every URL cached since the last update."""
+    entries_dir = os.path.join(get_http_cache_dir(), 'entries')
+    with _index_lock:
+        row = connection.execute("SELECT value FROM index_state WHERE key = 'synced_until'").fetchone()
+        synced_until = row[0] if row else 0.0
+        newest = synced_until
+        oldest_pending = None
+        now = time.time()
+
+        try:
+            entries = list(os.scandir(entries_dir))
+        except FileNotFoundError:
+            entries = []
+
+        for entry in entries:
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+                if mtime < synced_until:
+                    continue
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    cache_entry = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            newest = max(newest, mtime)
+
+            url, content_hash = cache_entry['url'], cache_entry['hash']
+            indexed = connection.execute("SELECT hash FROM indexed_urls WHERE url = ?", (url,)).fetchone()
+            if indexed and indexed[0] == content_hash:
+                continue
+            text = get_cached_text(content_hash)
+            if text is None:
+                if now - mtime < PENDING_EXTRACTION_SECONDS:
+                    oldest_pending = mtime if oldest_pending is None else min(oldest_pending, mtime)
+                continue
+
+            connection.execute("DELETE FROM documents WHERE url = ?", (url,))
+            title = next((line.strip() for line in text.split('\n') if line.strip()), url)
+            connection.execute("INSERT INTO documents (url, title, content) VALUES (?, ?, ?)", (url, title[:200], text))
+            connection.execute("INSERT OR REPLACE INTO indexed_urls VALUES (?, ?)", (url, content_hash))
+
+        if oldest_pending is not None:
+            newest = min(newest, oldest_pending)
+        connection.execute("INSERT OR REPLACE INTO index_state VALUES ('synced_until', ?)", (newest,))
+        connection.commit()
+
+def search_documents(query: str, num: int = 10) -> List[Dict[str, Any]]:
+    """Return the cached documents that best match any of the query words, best first, as search results."""
+    words = query.split()
+    if not words:
+        return []
+    # Any word may match, BM25 ranks documents matching more (and rarer) words higher
+    match_query = " OR ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+    connection = connect_document_index()
+    try:
+        update_document_index(connection)
+        rows = connection.execute(
+            "SELECT url, title, snippet(documents, 2, '', '', '...', 24) FROM documents "
+            "WHERE documents MATCH ? ORDER BY rank LIMIT ?",
+            (match_query, num)
+        ).fetchall()
+    finally:
+        connection.close()
+    return [{"title": title, "link": url, "snippet": " ".join(snippet.split())} for url, title, snippet in rows]
@@ -0,0 +1,127 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+from lib.http_cache import fetch_cached, get_cached_text, store_text
+from lib.web import extract_text
+
+# Documents longer than this are returned by OPEN_URL as an outline plus their first chunk,
+# the other chunks are read on demand with READ_URL_DOCUMENT
+CHUNK_SIZE = 4000
+MAX_SEARCH_HITS = 10
+OUTLINE_LINE_LENGTH = 100
+SNIPPET_LENGTH = 300
+# Documents whose extracted text is kept for READ_URL_DOCUMENT, least recently used evicted first
+MAX_PINNED_DOCUMENTS = 64
+
+# Text of each document as OPEN_URL returned it, so later chunk reads and searches see the same chunks
+# even if the page has changed or its HTTP cache entry has expired since
+_pinned_documents: 'OrderedDict[str, str]' = OrderedDict()
+_pinned_documents_lock = threading.Lock()
+
+class DocumentError(Exception):
+    """Raised when no text can be extracted from a page."""
+
+def open_document(url: str) -> str:
+    """Return the extracted text of a URL, from the HTTP cache when possible, and pin it for get_document.
+
+    Raises:
+        FetchError: If the URL cannot be downloaded
+        ExtractionTimeout: If text extraction takes too long
+        DocumentError: If the page has no extractable text
+    """
+    downloaded, content_hash = fetch_cached(url)
+    text = get_cached_text(content_hash)
+    if text is None:
+        text = extract_text(downloaded)
+        if text is None:
+            raise DocumentError(f"Could not extract text content from URL: {url}")
+        store_text(content_hash, text)
+    with _pinned_documents_lock:
+        _pinned_documents[url] = text
+        _pinned_documents.move_to_end(url)
+        while len(_pinned_documents) > MAX_PINNED_DOCUMENTS:
+            _pinned_documents.popitem(last=False)
+    return text
+
+def get_document(url: str) -> str:
+    """Return the text pinned by the last open_document of url, or open it if it is not pinned.
+
+    Raises:
+        Same as open_document, if the document is not pinned
+    """
+    with _pinned_documents_lock:
+        text = _pinned_documents.get(url)
+        if text is not None:
+            _pinned_documents.move_to_end(url)
+            return text
+    return open_document(url)
+
+def split_into_chunks(text: str, chunk_size: int = CHUNK_SIZE) -> List[str]:
+    """Split text into chunks of at most chunk_size characters, on line boundaries where possible."""
+    chunks = []
+    current = []
+    current_size = 0
+    for line in text.split('\n'):
+        # Lines longer than a chunk are cut into chunk-sized pieces
+        pieces = [line[i:i + chunk_size] for i in range(0, len(line), chunk_size)] or ['']
+        for piece in pieces:
+            if current and current_size + len(piece) + 1 > chunk_size:
+                chunks.append('\n'.join(current))
+                current, current_size = [], 0
+            current.append(piece)
+            current_size += len(piece) + 1
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+def format_outline(chunks: List[str]) -> str:
+    """Return one line per chunk with its number and its first non-empty line."""
+    lines = []
+    for i, chunk in enumerate(chunks, 1):
+        first_line = next((line.strip() for line in chunk.split('\n') if line.strip()), '')
+        if len(first_line) > OUTLINE_LINE_LENGTH:
+            first_line = first_line[:OUTLINE_LINE_LENGTH] + '...'
+        lines.append(f"  Chunk {i}: {first_line}")
+    return '\n'.join(lines)
+
+def format_chunk(url: str, chunks: List[str], chunk_number: int) -> str:
+    """Return a chunk of a document with a header giving its position."""
+    return f"[Document {url} | Chunk {chunk_number}/{len(chunks)}]\n{chunks[chunk_number - 1]}"
+
+def format_document_preview(url: str, text: str) -> str:
+    """Return a long document as a size header, its outline and its first chunk."""
+    chunks = split_into_chunks(text)
+    return (
+        f"[Document {url} | {len(text)} characters in {len(chunks)} chunks | Showing chunk 1/{len(chunks)}. "
+        f"Use READ_URL_DOCUMENT with url§chunk§N to read chunk N, or url§search§query to find the chunks that mention query]\n"
+        f"Outline:\n{format_outline(chunks)}\n\n"
+        f"--- Chunk 1/{len(chunks)} ---\n{chunks[0]}"
+    )
+
+def search_document(chunks: List[str], query: str, max_hits: int = MAX_SEARCH_HITS) -> List[Tuple[int, str]]:
+    """Return (chunk number, snippet) for the lines that match the most query words, in document order.
+
+    Words are matched case-insensitively; lines matching more distinct words rank higher.
+    """
+    words = [word.lower() for word in query.split() if word.strip()]
+    if not words:
+        return []
+    scored = []
+    for chunk_number, chunk in enumerate(chunks, 1):
+        for line in chunk.split('\n'):
+            lowered = line.lower()
+            score = sum(1 for word in words if word in lowered)
+            if score:
+                scored.append((score, chunk_number, line.strip(), lowered))
+
+    best = sorted(scored, key=lambda hit: -hit[0])[:max_hits]
+    best.sort(key=lambda hit: hit[1])
+    hits = []
+    for _, chunk_number, line, lowered in best:
+        first_match = min(lowered.find(word) for word in words if word in lowered)
+        start = max(0, first_match - SNIPPET_LENGTH // 3)
+        snippet = line[start:start + SNIPPET_LENGTH]
+        hits.append((chunk_number, ('...' if start else '') + snippet + ('...' if start + SNIPPET_LENGTH < len(line) else '')))
+    return hits
@@ -0,0 +1,239 @@
+import fnmatch
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Seconds a directory scan is reused for. Listings are usually asked for several times in a row
+# (a page, then the next one), and the tools that write files invalidate it, so a short TTL keeps
+# repeated listings cheap without showing stale results for long.
+LISTING_CACHE_TTL = 5.0
+SORT_KEYS = ('path', 'mtime', 'size')
+
+# Batch file tools take and return several files as blocks, each a marker line followed by the file's
+# content, so contents may contain § and newlines
+FILE_BLOCK_PATTERN = re.compile(r'^=== FILE: (.+?) ===$', re.MULTILINE)
+
+class FileInfo(NamedTuple):
+    path: str  # Relative to the listed directory, with / separators
+    size: int
+    mtime: float
+
+_listing_cache: Dict[str, Tuple[float, List[FileInfo]]] = {}
+_listing_cache_lock = threading.Lock()
+
+def scan_files(base_path: str) -> List[FileInfo]:
+    """Return every file under base_path, recursively, reusing a scan made in the last LISTING_CACHE_TTL seconds."""
+    base_path = os.path.abspath(base_path)
+    now = time.monotonic()
+    with _listing_cache_lock:
+        cached = _listing_cache.get(base_path)
+    if cached is not None and now - cached[0] < LISTING_CACHE_TTL:
+        return cached[1]
+
+    files = []
+    pending = [(base_path, '')]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, f"{prefix}{entry.name}/"))
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files.append(FileInfo(prefix + entry.name, stat.st_size, stat.st_mtime))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+    with _listing_cache_lock:
+        _listing_cache[base_path] = (now, files)
+    return files
+
+def invalidate_listing_cache(path: Optional[str] = None) -> None:
+    """Forget cached scans of the directories containing path, or all of them if no path is given."""
+    with _listing_cache_lock:
+        if path is None:
+            _listing_cache.clear()
+            return
+        path = os.path.abspath(path)
+        for base_path in list(_listing_cache):
+            if path == base_path or path.startswith(base_path + os.sep):
+                del _listing_cache[base_path]
+
+def list_files(
+    base_path: str,
+    pattern: Optional[str] = None,
+    sort: str = 'path',
+    descending: Optional[bool] = None,
+    cursor: int = 0,
+    limit: Optional[int] = None
+) -> Tuple[List[FileInfo], int, Optional[int]]:
+    """List the files under base_path, filtered, sorted and paginated.
+
+    Args:
+        base_path: Directory to list, recursively
+        pattern: Glob matched against the relative path and the file name
+        sort: One of SORT_KEYS
+        descending: Sort order, by default descending for mtime and size (newest / largest first)
+        cursor: Number of matching files to skip
+        limit: Maximum number of files to return
+
+    Returns:
+        (files, total number of matching files, cursor of the next page or None if this is the last)
+
+    Raises:
+        ValueError: If sort is unknown or cursor / limit are negative
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort '{sort}', must be one of: {', '.join(SORT_KEYS)}")
+    if cursor < 0 or (limit is not None and limit < 0):
+        raise ValueError("cursor and limit must not be negative")
+
+    files = scan_files(base_path)
+    if pattern:
+        files = [f for f in files if fnmatch.fnmatch(f.path, pattern) or fnmatch.fnmatch(os.path.basename(f.path), pattern)]
+    if descending is None:
+        descending = sort != 'path'
+    files = sorted(files, key=lambda f: (getattr(f, sort), f.path), reverse=descending)
+
+    end = len(files) if limit is None else min(cursor + limit, len(files))
+    next_cursor = end if end < len(files) else None
+    return files[cursor:end], len(files), next_cursor
+
+def format_file_listing(base_path: str, options: Dict[str, str]) -> str:
+    """Run list_files with the LIST_FILES_* tool options and format the result.
+
+    Options: glob=PATTERN, sort=path|mtime|size, order=asc|desc, cursor=N, limit=N, metadata=true.
+    Without limit, cursor or metadata, the result is the relative paths joined by § as before.
+    Otherwise a header with the total and the next cursor comes first.
+
+    Raises:
+        ValueError: If an option is unknown or has an invalid value
+    """
+    known = {'glob', 'sort', 'order', 'cursor', 'limit', 'metadata'}
+    unknown = set(options) - known
+    if unknown:
+        raise ValueError(f"Unknown option(s): {', '.join(sorted(unknown))}. Valid options: {', '.join(sorted(known))}")
+
+    order = options.get('order', '').lower()
+    if order not in ('', 'asc', 'desc'):
+        raise ValueError("order must be asc or desc")
+    try:
+        cursor = int(options.get('cursor', 0))
+        limit = int(options['limit']) if 'limit' in options else None
+    except ValueError:
+        raise ValueError("cursor and limit must be integers")
+    metadata = options.get('metadata', '').lower() in ('true', 'yes', '1')
+
+    files, total, next_cursor = list_files(
+        base_path,
+        pattern=options.get('glob'),
+        sort=options.get('sort', 'path').lower(),
+        descending=None if not order else order == 'desc',
+        cursor=cursor,
+        limit=limit
+    )
+
+    if metadata:
+        entries = [
+            f"{f.path} ({f.size} bytes, modified {datetime.fromtimestamp(f.mtime).strftime('%Y-%m-%d %H:%M:%S')})"
+            for f in files
+        ]
+    else:
+        entries = [f.path for f in files]
+    if limit is None and 'cursor' not in options and not metadata:
+        return '§'.join(entries)
+
+    shown = f"{cursor + 1}-{cursor + len(files)}" if files else "none"
+    header = f"[Files {shown} of {total} | Next cursor: {next_cursor if next_cursor is not None else 'none'}]"
+    return header + ('\n' + '§'.join(entries) if entries else '')
+
+def write_file_atomic(path: str, content: str) -> None:
+    """Write content to path through a temporary file and a rename, so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, 'w') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    invalidate_listing_cache(path)
+
+def resolve_in_directory(base_path: Path, file_path: str, directory_name: str) -> Path:
+    """Resolve file_path relative to base_path.
+
+    Raises:
+        ValueError: If the path is empty or escapes base_path
+    """
+    if not file_path.strip():
+        raise ValueError("File path is empty")
+    full_path = (base_path / file_path.strip()).resolve()
+    if not str(full_path).startswith(str(base_path)):
+        raise ValueError(f"Path {file_path} attempts to escape {directory_name} directory")
+    return full_path
+
+def parse_file_blocks(text: str) -> List[Tuple[str, str]]:
+    """Split '=== FILE: path ===' blocks into (path, content) pairs, in order.
+
+    The content of a block is everything between its marker line and the next one, without the
+    newline that ends it.
+
+    Raises:
+        ValueError: If there is no marker, or text other than whitespace comes before the first one
+    """
+    markers = list(FILE_BLOCK_PATTERN.finditer(text))
+    if not markers:
+        raise ValueError("Input must contain files in format '=== FILE: path ===\\ncontent', one block per file")
+    if text[:markers[0].start()].strip():
+        raise ValueError("Text before the first '=== FILE: path ===' line")
+
+    files = []
+    for i, marker in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+        content = text[marker.end():end]
+        if content.startswith('\n'):
+            content = content[1:]
+        if i + 1 < len(markers) and content.endswith('\n'):
+            content = content[:-1]
+        files.append((marker.group(1).strip(), content))
+    return files
+
+def read_files(base_path: Path, file_paths: List[str], directory_name: str) -> str:
+    """Read several files relative to base_path and return them as '=== FILE: path ===' blocks.
+
+    A file that cannot be read gets an 'Error: ...' line as its content, the others are still read.
+    """
+    blocks = []
+    for file_path in file_paths:
+        try:
+            with open(resolve_in_directory(base_path, file_path, directory_name), 'r') as f:
+                content = f.read()
+        except (ValueError, OSError) as e:
+            content = f"Error: {str(e)}"
+        blocks.append(f"=== FILE: {file_path} ===\n{content}")
+    return '\n'.join(blocks)
+
+def write_files(base_path: Path, files: List[Tuple[str, str]], directory_name: str) -> str:
+    """Atomically write each (path, content) pair relative to base_path and report the result per file.
+
+    A file that cannot be written is reported with its error, the others are still written.
+    """
+    results = []
+    for file_path, content in files:
+        try:
+            full_path = resolve_in_directory(base_path, file_path, directory_name)
+            write_file_atomic(str(full_path), content)
+            results.append(f"{file_path}: written ({len(content)} characters)")
+        except (ValueError, OSError) as e:
+            results.append(f"{file_path}: Error: {str(e)}")
+    failed = sum(1 for result in results if ': Error: ' in result)
+    summary = f"Wrote {len(files) - failed} of {len(files)} files" + (f", {failed} failed" if failed else "")
+    return summary + '\n' + '\n'.join(results)
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from lib.web import FetchError, request_url
+
+# Disk cache of fetched pages, shared by all agents and runs, under cache/http/:
+# - blobs/<sha256>.html: raw response bodies, named by the hash of their content, so identical
+#   pages fetched from different URLs are stored once
+# - blobs/<sha256>.txt: text extracted from the body with that hash
+# - entries/<sha256 of url>.json: url, blob hash, ETag, Last-Modified and fetch time of each URL
+# Entries younger than the freshness window are served without a request; older ones are revalidated
+# with If-None-Match / If-Modified-Since. Blob mtimes are bumped on every hit, and the least recently
+# used blobs are evicted once the blobs exceed the size cap.
+#
+# Configured through the environment:
+# - AGENT_HTTP_CACHE_TTL: freshness window in seconds (default 3600)
+# - AGENT_HTTP_CACHE_MAX_BYTES: size cap of the blobs (default 512 MiB)
+# - AGENT_HTTP_CACHE_OFFLINE=1: never touch the network, serve cached pages whatever their age
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_size_lock = threading.Lock()
+_blobs_size: Optional[int] = None
+
+def get_http_cache_dir() -> str:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, 'cache', 'http')
+
+def is_offline() -> bool:
+    return os.environ.get('AGENT_HTTP_CACHE_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+def _get_ttl() -> float:
+    return float(os.environ.get('AGENT_HTTP_CACHE_TTL', DEFAULT_TTL_SECONDS))
+
+def _get_max_bytes() -> int:
+    return int(os.environ.get('AGENT_HTTP_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+
+def _entry_path(url: str) -> str:
+    return os.path.join(get_http_cache_dir(), 'entries', hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+def _blob_path(content_hash: str, extension: str) -> str:
+    return os.path.join(get_http_cache_dir(), 'blobs', f"{content_hash}.{extension}")
+
+def _write_atomically(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def _load_entry(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_entry_path(url), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    # The blob may have been evicted since
+    return entry if entry.get('url') == url and os.path.exists(_blob_path(entry['hash'], 'html')) else None
+
+def _save_entry(entry: Dict[str, Any]) -> None:
+    _write_atomically(_entry_path(entry['url']), json.dumps(entry).encode('utf-8'))
+
+def _read_blob(content_hash: str, extension: str) -> Optional[bytes]:
+    path = _blob_path(content_hash, extension)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    # Mark as recently used for LRU eviction
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+    return data
+
+def _store_blob(content_hash: str, extension: str, data: bytes) -> None:
+    global _blobs_size
+    path = _blob_path(content_hash, extension)
+    if os.path.exists(path):
+        os.utime(path)
+        return
+    _write_atomically(path, data)
+    with _size_lock:
+        if _blobs_size is not None:
+            _blobs_size += len(data)
+            if _blobs_size <= _get_max_bytes():
+                return
+    evict_blobs()
+
+def evict_blobs() -> None:
+    """Delete the least recently used blobs until they fit in the size cap again."""
+    global _blobs_size
+    blobs_dir = os.path.join(get_http_cache_dir(), 'blobs')
+    with _size_lock:
+        blobs = []
+        try:
+            with os.scandir(blobs_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.tmp'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    blobs.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+
+        total = sum(size for _, size, _ in blobs)
+        max_bytes = _get_max_bytes()
+        # Evict down to 90% of the cap, so eviction does not run again on the next store
+        for _, size, path in sorted(blobs):
+            if total <= max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        _blobs_size = total
+
+def fetch_cached(url: str) -> Tuple[bytes, str]:
+    """Return the body of a URL and its content hash, from the cache when possible.
+
+    Raises:
+        FetchError: If the URL cannot be downloaded, or is not cached in offline mode
+    """
+    entry = _load_entry(url)
+    if entry is not None and (is_offline() or time.time() - entry['fetched_at'] < _get_ttl()):
+        body = _read_blob(entry['hash'], 'html')
+        if body is not None:
+            return body, entry['hash']
+
+    if is_offline():
+        raise FetchError("Not in the HTTP cache, and AGENT_HTTP_CACHE_OFFLINE is set")
+
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    status, response_headers, body = request_url(url, headers)
+    if status == 304 and entry is not None:
+        cached_body = _read_blob(entry['hash'], 'html')
+        if cached_body is not None:
+            entry['fetched_at'] = time.time()
+            _save_entry(entry)
+            return cached_body, entry['hash']
+        # Evicted in between, fetch it again unconditionally
+        status, response_headers, body = request_url(url)
+
+    content_hash = hashlib.sha256(body).hexdigest()
+    if 'no-store' not in response_headers.get('cache-control', ''):
+        _store_blob(content_hash, 'html', body)
+        _save_entry({
+            'url': url,
+            'hash': content_hash,
+            'etag': response_headers.get('etag'),
+            'last_modified': response_headers.get('last-modified'),
+            'fetched_at': time.time(),
+        })
+    return body, content_hash
+
+def get_cached_text(content_hash: str) -> Optional[str]:
+    """Return the text extracted earlier from the body with this content hash, if cached."""
+    data = _read_blob(content_hash, 'txt')
+    return data.decode('utf-8') if data is not None else None
+
+def store_text(content_hash: str, text: str) -> None:
+    """Cache the text extracted from the body with this content hash."""
+    _store_blob(content_hash, 'txt', text.encode('utf-8'))
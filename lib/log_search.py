@@ -0,0 +1,214 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from lib.run_log import AGENT_ID_PATTERN, BANNER_PATTERN, get_runs_dir
+
+# Full-text index over every text run log in runs/** and every chat file in chats/, one row per log line.
+# Each file is indexed up to its last complete line and only its new tail is indexed on the next update,
+# so the index follows growing logs. Files that shrink or are replaced are reindexed from scratch.
+SEARCH_INDEX_VERSION = 2
+
+# In the full log mode, memory updates repeat content that is already logged as LLM responses and tool
+# results, so these [Memory] lines are left out of the index. In the dedup mode that content is logged
+# only once, in [Memory #N] blocks the other records refer to, so those are indexed.
+MEMORY_DUMP_PATTERN = re.compile(rb'\]\[Memory\]')
+# Agent a line belongs to: the logger name at its start, or the first bracketed agent ID on a continuation line
+LINE_AGENT_PATTERN = re.compile(rb'(?:^agent\.|\[)(' + AGENT_ID_PATTERN + rb')')
+
+_index_lock = threading.Lock()
+
+def get_project_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def get_search_index_path() -> str:
+    """Return the path of the search index database: cache/log_search.db."""
+    return os.path.join(get_project_root(), 'cache', 'log_search.db')
+
+def connect_search_index() -> sqlite3.Connection:
+    """Open the search index database, creating its tables if needed."""
+    path = get_search_index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version != SEARCH_INDEX_VERSION:
+        connection.executescript("""
+            DROP TABLE IF EXISTS indexed_files;
+            DROP TABLE IF EXISTS log_lines;
+        """)
+        connection.executescript(f"""
+            CREATE TABLE indexed_files (
+                path TEXT PRIMARY KEY,
+                inode INTEGER,
+                size INTEGER,
+                mtime REAL,
+                indexed_bytes INTEGER,
+                line_count INTEGER,
+                current_prefix TEXT,
+                agent_iterations TEXT
+            );
+            CREATE VIRTUAL TABLE log_lines USING fts5(
+                content,
+                path UNINDEXED,
+                agent_id UNINDEXED,
+                iteration UNINDEXED,
+                line_num UNINDEXED,
+                byte_offset UNINDEXED
+            );
+            PRAGMA user_version = {SEARCH_INDEX_VERSION};
+        """)
+    return connection
+
+def list_searchable_files() -> List[str]:
+    """Return the paths, relative to the project root, of all text run logs and chat files."""
+    project_root = get_project_root()
+    paths = []
+    for base in (get_runs_dir(), os.path.join(project_root, 'chats')):
+        for root, _, files in os.walk(base):
+            for file in files:
+                if file.endswith('.txt'):
+                    paths.append(os.path.relpath(os.path.join(root, file), project_root))
+    paths.sort()
+    return paths
+
+def update_search_index(connection: sqlite3.Connection) -> None:
+    """Bring the search index up to date with the files on disk.
+
+    New files are indexed, grown files have their new lines indexed, shrunk or replaced files are
+    reindexed, and files that no longer exist are removed from the index.
+    """
+    project_root = get_project_root()
+    with _index_lock:
+        known = {row[0]: row for row in connection.execute("SELECT * FROM indexed_files")}
+        on_disk = list_searchable_files()
+
+        for path in set(known) - set(on_disk):
+            connection.execute("DELETE FROM log_lines WHERE path = ?", (path,))
+            connection.execute("DELETE FROM indexed_files WHERE path = ?", (path,))
+
+        for path in on_disk:
+            try:
+                stat = os.stat(os.path.join(project_root, path))
+            except FileNotFoundError:
+                continue
+            row = known.get(path)
+            if row is not None and (row[1], row[2], row[3]) == (stat.st_ino, stat.st_size, stat.st_mtime):
+                continue
+
+            if row is None or row[1] != stat.st_ino or stat.st_size < row[4]:
+                connection.execute("DELETE FROM log_lines WHERE path = ?", (path,))
+                state = {'indexed_bytes': 0, 'line_count': 0, 'current_prefix': None, 'agent_iterations': {}}
+            else:
+                state = {'indexed_bytes': row[4], 'line_count': row[5], 'current_prefix': row[6], 'agent_iterations': json.loads(row[7])}
+
+            _index_file(connection, path, state)
+            connection.execute(
+                "INSERT OR REPLACE INTO indexed_files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, stat.st_ino, stat.st_size, stat.st_mtime, state['indexed_bytes'], state['line_count'],
+                 state['current_prefix'], json.dumps(state['agent_iterations']))
+            )
+        connection.commit()
+
+def _index_file(connection: sqlite3.Connection, path: str, state: Dict[str, Any]) -> None:
+    """Index the complete lines of a file after state['indexed_bytes'] and advance state past them."""
+    offset = state['indexed_bytes']
+    line_num = state['line_count']
+    current_prefix = state['current_prefix']
+    agent_iterations = state['agent_iterations']
+
+    if path.startswith('chats' + os.sep):
+        # Chat files are named <sender>_to_<receiver>.txt
+        current_prefix = os.path.basename(path)[:-4].split('_to_')[0]
+
+    rows = []
+    with open(os.path.join(get_project_root(), path), 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                # Line still being written, index it on the next update
+                break
+            line_num += 1
+            line_offset = offset
+            offset += len(line)
+
+            if b'Agent_' in line:
+                prefix_match = LINE_AGENT_PATTERN.search(line)
+                if prefix_match:
+                    current_prefix = prefix_match.group(1).decode('utf-8')
+            if b' - LLM Response - Agent Iterations ' in line:
+                for match in BANNER_PATTERN.finditer(line):
+                    agent_iterations[match.group(1).decode('utf-8', errors='replace')] = int(match.group(2))
+
+            content = line.strip()
+            if not content or MEMORY_DUMP_PATTERN.search(line):
+                continue
+            rows.append((
+                content.decode('utf-8', errors='replace'),
+                path,
+                current_prefix,
+                agent_iterations.get(current_prefix),
+                line_num,
+                line_offset,
+            ))
+
+    connection.executemany(
+        "INSERT INTO log_lines (content, path, agent_id, iteration, line_num, byte_offset) VALUES (?, ?, ?, ?, ?, ?)",
+        rows
+    )
+    state.update({'indexed_bytes': offset, 'line_count': line_num, 'current_prefix': current_prefix})
+
+def build_match_query(query: str) -> str:
+    """Turn plain search words into an FTS5 query matching lines that contain all of them.
+
+    Every word is quoted, so punctuation such as ':' or '-' in log text is searched literally.
+    """
+    words = query.split()
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+def search_logs(query: str, limit: int = 20, path_prefix: Optional[str] = None, agent_id: Optional[str] = None, raw_query: bool = False) -> List[Dict[str, Any]]:
+    """Update the index and return the best matching log lines for a query, best first.
+
+    Args:
+        query: Words that must all appear in a line, or an FTS5 query if raw_query is set
+        limit: Maximum number of hits
+        path_prefix: Only search files whose path relative to the project root starts with this
+        agent_id: Only search lines of agents whose ID starts with this
+
+    Returns:
+        One dict per hit with path, agent_id, iteration, line_num, byte_offset and snippet
+    """
+    match_query = query if raw_query else build_match_query(query)
+    if not match_query:
+        return []
+
+    sql = ("SELECT path, agent_id, iteration, line_num, byte_offset, snippet(log_lines, 0, '>>', '<<', '...', 16) "
+           "FROM log_lines WHERE log_lines MATCH ?")
+    params: List[Any] = [match_query]
+    if path_prefix:
+        sql += " AND path LIKE ? ESCAPE '\\'"
+        params.append(path_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    if agent_id:
+        sql += " AND agent_id LIKE ? ESCAPE '\\'"
+        params.append(agent_id.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+
+    connection = connect_search_index()
+    try:
+        update_search_index(connection)
+        return [
+            {
+                'path': row[0],
+                'agent_id': row[1],
+                'iteration': row[2],
+                'line_num': row[3],
+                'byte_offset': row[4],
+                'snippet': row[5],
+            }
+            for row in connection.execute(sql, params)
+        ]
+    finally:
+        connection.close()
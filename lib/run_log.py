@@ -0,0 +1,446 @@
+import bisect
+import collections
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# A run log runs/<agent>/run_log_X.txt is accompanied by a structured event log
+# run_log_X.jsonl (one JSON record per line) and a sidecar index run_log_X.index.json
+# mapping agent ID -> iteration -> [start, end) byte range in the .jsonl file.
+STRUCTURED_LOG_SUFFIX = ".jsonl"
+STRUCTURED_INDEX_SUFFIX = ".index.json"
+
+def get_runs_dir() -> str:
+    """Return the path of the runs/ directory in the project root."""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'runs')
+
+def get_run_log_path(agent_name: str, run_log_name: str) -> str:
+    """Return the path of runs/<agent_name>/<run_log_name>.txt, adding the .txt extension if missing."""
+    path = os.path.join(get_runs_dir(), agent_name, run_log_name)
+    return path if path.endswith('.txt') else path + '.txt'
+
+def get_structured_log_paths(run_log_path: str) -> Tuple[str, str]:
+    """Return the (.jsonl event log, .index.json sidecar) paths that belong to a .txt run log."""
+    base = run_log_path[:-4] if run_log_path.endswith('.txt') else run_log_path
+    return base + STRUCTURED_LOG_SUFFIX, base + STRUCTURED_INDEX_SUFFIX
+
+def load_structured_index(run_log_path: str) -> Optional[Dict[str, Any]]:
+    """Load the sidecar index of a run log, or None if the run has no structured log."""
+    _, index_path = get_structured_log_paths(run_log_path)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def read_structured_events(jsonl_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the events stored in the [start, end) byte range of a structured log.
+
+    A trailing record that has not been completely written yet is skipped.
+    """
+    with open(jsonl_path, 'rb') as f:
+        f.seek(start)
+        remaining = None if end is None else max(0, end - start)
+        while remaining is None or remaining > 0:
+            line = f.readline() if remaining is None else f.readline(remaining)
+            if not line:
+                break
+            if remaining is not None:
+                remaining -= len(line)
+            if not line.endswith(b'\n'):
+                break
+            yield json.loads(line)
+
+def get_iteration_byte_range(index: Dict[str, Any], agent_id: str, first_iteration: int, last_iteration: int) -> Optional[Tuple[int, int]]:
+    """Return the byte range covering iterations first_iteration..last_iteration of an agent, or None."""
+    ranges = [index['iterations'].get(agent_id, {}).get(str(i)) for i in range(first_iteration, last_iteration + 1)]
+    ranges = [r for r in ranges if r]
+    if not ranges:
+        return None
+    return min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+def format_structured_events(events: List[Dict[str, Any]]) -> str:
+    """Render structured events as readable text, one block per event."""
+    blocks = []
+    for event in events:
+        timestamp = datetime.datetime.fromtimestamp(event['timestamp']).strftime('%H:%M:%S.%f')[:-3]
+        header = f"[{event['agent_id']} | Iteration {event['iteration']} | {timestamp}]"
+        if event['type'] == 'llm_response':
+            blocks.append(f"{header} LLM Response ({event['time']:.2f}s):\n{event['text']}")
+        elif event['type'] == 'tool_call':
+            blocks.append(f"{header} Tool Call [{event['tool']}]:\n{event['input']}")
+        elif event['type'] == 'tool_result':
+            if 'error' in event:
+                blocks.append(f"{header} Tool Error [{event['tool']}] ({event['time']:.2f}s):\n{event['error']}")
+            else:
+                blocks.append(f"{header} Tool Result [{event['tool']}] ({event['time']:.2f}s):\n{event['result']}")
+        else:
+            blocks.append(f"{header} Note: {event.get('text', '')}")
+    return "\n\n".join(blocks)
+
+def scan_log(path: str, pattern: 're.Pattern[bytes]', chunk_size: int = 1 << 20, max_match_len: int = 4096) -> Iterator[Tuple[int, Tuple[bytes, ...]]]:
+    """Yield (byte_offset, groups) for every match of a bytes pattern in a file, with flat memory use.
+
+    The file is memory-mapped, so the OS pages it in and out instead of it being loaded into a string.
+    If it cannot be mapped, it is streamed in chunk_size blocks instead; the last max_match_len bytes of
+    each block are carried over so matches crossing a block boundary are still found, as long as they
+    are no longer than max_match_len.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some file systems cannot be mapped
+            mapped = None
+
+        if mapped is not None:
+            with mapped:
+                for match in pattern.finditer(mapped):
+                    yield match.start(), match.groups()
+            return
+
+        buffer = b''
+        buffer_offset = 0  # File offset of buffer[0]
+        resume_at = 0  # Buffer position after the last reported match
+        while True:
+            chunk = f.read(chunk_size)
+            at_eof = not chunk
+            buffer += chunk
+            # Matches starting in the tail may continue in the next block, leave them for the next round
+            limit = len(buffer) if at_eof else max(0, len(buffer) - max_match_len)
+            for match in pattern.finditer(buffer, resume_at):
+                if match.start() >= limit:
+                    break
+                yield buffer_offset + match.start(), match.groups()
+                resume_at = match.end()
+            if at_eof:
+                return
+            buffer = buffer[limit:]
+            buffer_offset += limit
+            resume_at = max(0, resume_at - limit)
+
+# Text run log index, see get_text_log_index()
+TEXT_LOG_INDEX_VERSION = 3
+LINE_CHECKPOINT_INTERVAL = 1000
+# Bytes at the start of a log and before the end of its indexed part, hashed to recognize it, so a log
+# rewritten in place with more content is not mistaken for the same log having grown
+FINGERPRINT_BYTES = 4096
+AGENT_ID_PATTERN = rb'[A-Z][a-z0-9]*(?:[A-Z][a-z0-9]*)*Agent_\d{6}-[0-9a-f]{8}-'
+AGENT_PREFIX_PATTERN = re.compile(rb'\[(' + AGENT_ID_PATTERN + rb')')
+BANNER_PATTERN = re.compile(rb'\[([^\[\]\n]+?) - LLM Response - Agent Iterations (\d+)\]')
+
+_text_log_indexes: Dict[str, Dict[str, Any]] = {}
+_text_log_index_lock = threading.Lock()
+
+def get_text_log_index_path(run_log_path: str) -> str:
+    """Return where the index of a text run log is persisted: cache/run_log_index/<agent>/<log>.json."""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    relative = os.path.relpath(os.path.abspath(run_log_path), get_runs_dir())
+    return os.path.join(project_root, 'cache', 'run_log_index', relative + '.json')
+
+def get_text_log_index(run_log_path: str, persist: bool = True) -> Dict[str, Any]:
+    """Return the index of a text run log, building or extending it as needed.
+
+    The index is built in one streaming pass over the log and holds:
+    - banners: agent ID -> iteration -> list of [start, end] byte positions of its iteration banners
+    - prefix_changes: list of [byte_offset, agent_id] where the agent prefix of the lines changes.
+      A line's prefix is the first agent ID in it, or the prefix of the line before it.
+    - line_checkpoints: byte offset of every LINE_CHECKPOINT_INTERVAL-th line (lines 1, 1001, ...),
+      and line_count, the number of complete lines.
+
+    It is kept in memory and persisted under cache/, and is valid for the size and mtime of the log
+    it was built for. If the log has grown, only the new tail is scanned; if it has shrunk or been
+    rewritten (another inode, or other bytes at its start), the index is rebuilt. Callers that poll a growing log pass persist=False and call
+    save_text_log_index once they are done, rather than rewriting the persisted index on every poll.
+    """
+    stat = os.stat(run_log_path)
+    with _text_log_index_lock:
+        index = _text_log_indexes.get(run_log_path)
+        if index is None:
+            index = _load_text_log_index(run_log_path)
+        if index is not None and index.get('version') != TEXT_LOG_INDEX_VERSION:
+            index = None
+
+        if index is not None and (index['size'], index['mtime']) == (stat.st_size, stat.st_mtime):
+            _text_log_indexes[run_log_path] = index
+            return index
+
+        if (index is None or stat.st_size < index['size'] or index['inode'] != stat.st_ino
+                or _fingerprint_log(run_log_path, index['indexed_bytes']) != index['fingerprint']):
+            index = {
+                'version': TEXT_LOG_INDEX_VERSION,
+                'size': 0,
+                'mtime': 0,
+                'indexed_bytes': 0,
+                'current_prefix': 'NO_PREFIX',
+                'banners': {},
+                'prefix_changes': [],
+                'line_count': 0,
+                'line_checkpoints': [],
+            }
+
+        _extend_text_log_index(run_log_path, index)
+        index['size'], index['mtime'], index['inode'] = stat.st_size, stat.st_mtime, stat.st_ino
+        index['fingerprint'] = _fingerprint_log(run_log_path, index['indexed_bytes'])
+        _text_log_indexes[run_log_path] = index
+        if persist:
+            _save_text_log_index(run_log_path, index)
+        return index
+
+def save_text_log_index(run_log_path: str) -> None:
+    """Persist the in-memory index of a text run log, e.g. after polling it with persist=False."""
+    with _text_log_index_lock:
+        index = _text_log_indexes.get(run_log_path)
+        if index is not None:
+            _save_text_log_index(run_log_path, index)
+
+def _fingerprint_log(run_log_path: str, indexed_bytes: int) -> str:
+    """Hash the first and the last FINGERPRINT_BYTES of the first indexed_bytes bytes of a log."""
+    digest = hashlib.sha1()
+    with open(run_log_path, 'rb') as f:
+        digest.update(f.read(min(FINGERPRINT_BYTES, indexed_bytes)))
+        tail_start = max(FINGERPRINT_BYTES, indexed_bytes - FINGERPRINT_BYTES)
+        if tail_start < indexed_bytes:
+            f.seek(tail_start)
+            digest.update(f.read(indexed_bytes - tail_start))
+    return digest.hexdigest()
+
+def _extend_text_log_index(run_log_path: str, index: Dict[str, Any]) -> None:
+    """Scan the complete lines after index['indexed_bytes'] and add them to the index."""
+    offset = index['indexed_bytes']
+    current_prefix = index['current_prefix']
+    banners = index['banners']
+    prefix_changes = index['prefix_changes']
+    line_checkpoints = index['line_checkpoints']
+    line_count = index['line_count']
+    with open(run_log_path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                # Line still being written, index it on the next call
+                break
+            if line_count % LINE_CHECKPOINT_INTERVAL == 0:
+                line_checkpoints.append(offset)
+            line_count += 1
+            if b'Agent_' in line:
+                prefix_match = AGENT_PREFIX_PATTERN.search(line)
+                if prefix_match:
+                    prefix = prefix_match.group(1).decode('utf-8')
+                    if prefix != current_prefix:
+                        current_prefix = prefix
+                        prefix_changes.append([offset, prefix])
+            if b' - LLM Response - Agent Iterations ' in line:
+                for match in BANNER_PATTERN.finditer(line):
+                    agent_id = match.group(1).decode('utf-8', errors='replace')
+                    positions = banners.setdefault(agent_id, {}).setdefault(match.group(2).decode('ascii'), [])
+                    positions.append([offset + match.start(), offset + match.end()])
+            offset += len(line)
+    index['indexed_bytes'] = offset
+    index['line_count'] = line_count
+    index['current_prefix'] = current_prefix
+
+def _load_text_log_index(run_log_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(get_text_log_index_path(run_log_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _save_text_log_index(run_log_path: str, index: Dict[str, Any]) -> None:
+    index_path = get_text_log_index_path(run_log_path)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    temp_path = f"{index_path}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(temp_path, index_path)
+
+def read_agent_lines(run_log_path: str, index: Dict[str, Any], start: int, end: int, agent_id: str) -> str:
+    """Read the [start, end) byte range of a run log, keeping only the lines whose prefix contains agent_id.
+
+    Lines before the first agent prefix in the log have the prefix 'NO_PREFIX'.
+    """
+    prefix_changes = index['prefix_changes']
+    offsets = [change[0] for change in prefix_changes]
+    # Segment that contains start, i.e. the last prefix change at or before it
+    i = bisect.bisect_right(offsets, start) - 1
+
+    pieces = []
+    with open(run_log_path, 'rb') as f:
+        position = start
+        while position < end:
+            prefix = prefix_changes[i][1] if i >= 0 else 'NO_PREFIX'
+            segment_end = min(end, offsets[i + 1]) if i + 1 < len(offsets) else end
+            if agent_id in prefix:
+                f.seek(position)
+                pieces.append(f.read(segment_end - position))
+            position = segment_end
+            i += 1
+
+    content = b''.join(pieces)
+    # Kept lines are joined by newlines, without a trailing one
+    if content.endswith(b'\n'):
+        content = content[:-1]
+    return content.decode('utf-8', errors='replace')
+
+def read_byte_range(path: str, start: int, length: int) -> str:
+    """Read length bytes of a file from byte offset start."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read(length).decode('utf-8', errors='replace')
+
+def read_line_range(run_log_path: str, first_line: int, last_line: int, max_bytes: int) -> Tuple[str, int]:
+    """Read lines first_line..last_line (1-based, inclusive) of a run log, seeking via the line checkpoints of its index.
+
+    Returns:
+        The lines, stopped early once max_bytes would be exceeded, and the number of the last line returned.
+        A first line longer than max_bytes is cut to its first max_bytes bytes.
+    """
+    index = get_text_log_index(run_log_path)
+    checkpoint = min((first_line - 1) // LINE_CHECKPOINT_INTERVAL, len(index['line_checkpoints']) - 1)
+    pieces = []
+    size = 0
+    line_num = 0
+    with open(run_log_path, 'rb') as f:
+        if checkpoint >= 0:
+            f.seek(index['line_checkpoints'][checkpoint])
+            line_num = checkpoint * LINE_CHECKPOINT_INTERVAL
+        for line in f:
+            line_num += 1
+            if line_num < first_line:
+                continue
+            if line_num > last_line or (pieces and size + len(line) > max_bytes):
+                line_num -= 1
+                break
+            if len(line) > max_bytes:
+                pieces.append(line[:max_bytes])
+                break
+            pieces.append(line)
+            size += len(line)
+    return b''.join(pieces).decode('utf-8', errors='replace'), line_num
+
+def read_tail_lines(path: str, num_lines: int, max_bytes: int, block_size: int = 64 * 1024) -> Tuple[str, int]:
+    """Read the last num_lines lines of a file, at most max_bytes, by reading blocks backwards from its end.
+
+    Returns:
+        The lines and how many were returned, fewer than num_lines if they would exceed max_bytes.
+        A last line longer than max_bytes is cut to its last max_bytes bytes.
+    """
+    if num_lines <= 0:
+        return '', 0
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        blocks = []
+        newlines = 0
+        read_bytes = 0
+        # One more newline than lines wanted, plus the one that may end the file; reading stops once
+        # more than max_bytes (and the newline before them) are read, as no more can be returned
+        while position > 0 and newlines <= num_lines and read_bytes <= max_bytes + 1:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+            read_bytes += len(block)
+    data = b''.join(reversed(blocks))
+    lines = data.splitlines(keepends=True)
+    # The first line is partial if reading stopped before the start of the file
+    if position > 0 and lines:
+        lines = lines[1:]
+    lines = lines[-num_lines:]
+
+    kept = []
+    size = 0
+    for line in reversed(lines):
+        if size + len(line) > max_bytes:
+            break
+        kept.append(line)
+        size += len(line)
+    if not kept and lines:
+        return lines[-1][-max_bytes:].decode('utf-8', errors='replace'), 1
+    return b''.join(reversed(kept)).decode('utf-8', errors='replace'), len(kept)
+
+def grep_log(path: str, pattern: str, context: int = 0, max_matches: int = 50) -> Tuple[List[str], int]:
+    """Stream a file line by line and return matching lines of a regex, with context lines.
+
+    Output lines are prefixed with their line number, followed by ':' for matches and '-' for context,
+    with '--' between non-adjacent groups, like grep -n.
+
+    Returns:
+        The output lines and the number of matches returned, which stops at max_matches
+    """
+    regex = re.compile(pattern)
+    output = []
+    before = collections.deque(maxlen=context)
+    matches = 0
+    after_remaining = 0
+    last_printed = 0
+    with open(path, 'rb') as f:
+        for line_num, raw_line in enumerate(f, 1):
+            line = raw_line.decode('utf-8', errors='replace').rstrip('\n')
+            if matches < max_matches and regex.search(line):
+                group_start = before[0][0] if before else line_num
+                if last_printed and group_start > last_printed + 1:
+                    output.append('--')
+                for before_num, before_line in before:
+                    output.append(f"{before_num}-{before_line}")
+                before.clear()
+                output.append(f"{line_num}:{line}")
+                last_printed = line_num
+                matches += 1
+                after_remaining = context
+            elif after_remaining > 0:
+                output.append(f"{line_num}-{line}")
+                last_printed = line_num
+                after_remaining -= 1
+            elif matches >= max_matches:
+                break
+            else:
+                before.append((line_num, line))
+    return output, matches
+
+# Notified whenever a run log writer of this process flushes, see wait_for_log_growth()
+_log_flushed = threading.Condition()
+
+def notify_log_flushed() -> None:
+    """Wake up every thread waiting in wait_for_log_growth(). Called by run log writers after each flush."""
+    with _log_flushed:
+        _log_flushed.notify_all()
+
+def wait_for_log_growth(path: str, size: int, timeout: float, poll_interval: float = 0.5) -> bool:
+    """Block until the file at path is larger than size bytes, or until timeout seconds have passed.
+
+    Writers in this process wake the waiter up as soon as they flush. Logs written by other
+    processes are noticed by checking the file size every poll_interval seconds.
+
+    Returns:
+        True if the file has grown, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if os.path.getsize(path) > size:
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        with _log_flushed:
+            _log_flushed.wait(min(remaining, poll_interval))
+
+def find_line_end(path: str, start: int, end: int) -> int:
+    """Return the end offset of the last complete line within [start, end), or of the first line after start if none ends there."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+        last_newline = data.rfind(b'\n')
+        if last_newline >= 0:
+            return start + last_newline + 1
+        # Line longer than the window, return it whole
+        f.seek(start)
+        return start + len(f.readline())
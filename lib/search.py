@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from serpapi import GoogleSearch
+
+from lib.document_index import search_documents
+from lib.http_cache import is_offline
+
+# SEARCH results are cached on disk under cache/search/, one file per normalized query and num,
+# for AGENT_SEARCH_CACHE_TTL seconds (default one day), so near-identical queries issued across
+# runs and subagents only hit SerpAPI once.
+# SERPAPI_BACKEND points SEARCH at another SerpAPI-compatible server, e.g. mocks/serpapi_server.py.
+DEFAULT_SEARCH_CACHE_TTL_SECONDS = 24 * 3600
+
+# Where SEARCH looks for results, set per agent with "search_backend" in config.json or for all
+# agents with AGENT_SEARCH_BACKEND:
+# - serpapi (default): Google through SerpAPI
+# - local: only the pages agents have already opened with OPEN_URL, see lib/document_index.py
+# - local_first: local, and SerpAPI only when there are no local results
+# - fallback: SerpAPI, and local when SerpAPI fails (e.g. offline or without an API key)
+# - hybrid: local results followed by SerpAPI results
+SEARCH_BACKENDS = ("serpapi", "local", "local_first", "fallback", "hybrid")
+DEFAULT_LOCAL_RESULTS = 10
+
+class SearchError(Exception):
+    """Raised when a search backend cannot answer a query."""
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def normalize_url(url: str) -> str:
+    """Return the form of a URL used to detect duplicates: no fragment, no trailing slash, lowercase host."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, ''))
+
+def _get_search_cache_path(query: str, num: Optional[int]) -> str:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    key = hashlib.sha256(f"{normalize_query(query)}\n{num}".encode('utf-8')).hexdigest()
+    return os.path.join(project_root, 'cache', 'search', key + '.json')
+
+def _load_cached_results(query: str, num: Optional[int]) -> Optional[List[Dict[str, Any]]]:
+    ttl = float(os.environ.get('AGENT_SEARCH_CACHE_TTL', DEFAULT_SEARCH_CACHE_TTL_SECONDS))
+    try:
+        with open(_get_search_cache_path(query, num), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if time.time() - cached['fetched_at'] >= ttl:
+        return None
+    return cached['results']
+
+def _store_results(query: str, num: Optional[int], results: List[Dict[str, Any]]) -> None:
+    path = _get_search_cache_path(query, num)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'query': query, 'num': num, 'fetched_at': time.time(), 'results': results}, f)
+    os.replace(temp_path, path)
+
+def serpapi_search(query: str, num: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Return the organic results (title, link, snippet) of a Google search through SerpAPI, cached on disk.
+
+    Raises:
+        SearchError: If the API key is missing, or the query is not cached in offline mode
+    """
+    cached = _load_cached_results(query, num)
+    if cached is not None:
+        return cached
+
+    if is_offline():
+        raise SearchError("Search not in the cache, and AGENT_HTTP_CACHE_OFFLINE is set")
+
+    serpapi_key = os.environ.get("SERPAPI_API_KEY")
+    if not serpapi_key:
+        raise SearchError("SerpAPI key not found in environment variables")
+
+    params = {
+        "q": query,
+        "api_key": serpapi_key
+    }
+    if num is not None:
+        params["num"] = num
+
+    search = GoogleSearch(params)
+    backend = os.environ.get("SERPAPI_BACKEND")
+    if backend:
+        search.BACKEND = backend.rstrip('/')
+    response = search.get_dict()
+
+    results = [
+        {
+            "title": result.get("title", "No title"),
+            "link": result.get("link", "No link"),
+            "snippet": result.get("snippet", "No description"),
+        }
+        for result in response.get("organic_results", [])
+    ]
+    # Errors (bad key, rate limits, ...) are not cached
+    if "error" not in response:
+        _store_results(query, num, results)
+    return results
+
+def run_search(query: str, num: Optional[int] = None, backend: str = "serpapi") -> List[Dict[str, Any]]:
+    """Return the results of a query from the given search backend (see SEARCH_BACKENDS).
+
+    Raises:
+        SearchError: If SerpAPI fails and the backend has no results to fall back on
+        ValueError: If the backend is not one of SEARCH_BACKENDS
+    """
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend '{backend}', expected one of: {', '.join(SEARCH_BACKENDS)}")
+
+    if backend == "serpapi":
+        return serpapi_search(query, num)
+
+    local_results = search_documents(query, num or DEFAULT_LOCAL_RESULTS)
+    if backend == "local" or (backend == "local_first" and local_results):
+        return local_results
+    if backend == "local_first":
+        return serpapi_search(query, num)
+
+    if backend == "fallback":
+        try:
+            return serpapi_search(query, num)
+        except Exception:
+            # Besides SearchError, network errors surface as exceptions of the HTTP client
+            return local_results
+
+    # hybrid: whatever SerpAPI adds after the local results
+    try:
+        remote_results = serpapi_search(query, num)
+    except Exception:
+        if not local_results:
+            raise
+        remote_results = []
+    local_urls = {normalize_url(result['link']) for result in local_results}
+    return local_results + [result for result in remote_results if normalize_url(result['link']) not in local_urls]
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """Format search results as title, URL and description blocks separated by blank lines."""
+    return "\n".join(
+        f"Title: {result['title']}\nURL: {result['link']}\nDescription: {result['snippet']}\n"
+        for result in results
+    )
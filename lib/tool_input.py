@@ -0,0 +1,19 @@
+from typing import Dict, List
+
+def parse_options(parts: List[str]) -> Dict[str, str]:
+    """Parse optional 'key=value' tool input parts (e.g. the parts after the positional ones) into a dict.
+
+    Keys are lowercased, values are stripped.
+
+    Raises:
+        ValueError: If a part is not in the format key=value
+    """
+    options = {}
+    for part in parts:
+        if not part.strip():
+            continue
+        if '=' not in part:
+            raise ValueError(f"Option '{part}' must be in format key=value")
+        key, value = part.split('=', 1)
+        options[key.strip().lower()] = value.strip()
+    return options
@@ -0,0 +1,119 @@
+import ast
+import json
+import os
+import threading
+from typing import Any, Dict
+
+# Metadata (name, signature, docstring) of the functions defined in each lib/tools/*.py file, read by
+# parsing the source with ast, so listing tools never imports them or runs their top-level code.
+# Each file's entry is valid for its mtime and size; the manifest is kept in memory and persisted
+# to cache/tools_manifest.json, so only new or changed tool files are parsed again.
+TOOL_MANIFEST_VERSION = 1
+
+_manifest: Dict[str, Any] = {}
+_manifest_lock = threading.Lock()
+
+def get_tools_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools')
+
+def get_tool_manifest_path() -> str:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, 'cache', 'tools_manifest.json')
+
+def format_arguments(args: ast.arguments) -> str:
+    """Format function parameters the way inspect.signature does, e.g. "caller_id: str, _: str = ''"."""
+    def format_param(arg: ast.arg, default: ast.expr = None, prefix: str = '') -> str:
+        text = prefix + arg.arg
+        if arg.annotation is not None:
+            text += f": {ast.unparse(arg.annotation)}"
+        if default is not None:
+            text += f" = {ast.unparse(default)}" if arg.annotation is not None else f"={ast.unparse(default)}"
+        return text
+
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + args.defaults
+    params = [format_param(arg, default) for arg, default in zip(positional, defaults)]
+    if args.posonlyargs:
+        params.insert(len(args.posonlyargs), '/')
+    if args.vararg is not None:
+        params.append(format_param(args.vararg, prefix='*'))
+    elif args.kwonlyargs:
+        params.append('*')
+    params.extend(format_param(arg, default) for arg, default in zip(args.kwonlyargs, args.kw_defaults))
+    if args.kwarg is not None:
+        params.append(format_param(args.kwarg, prefix='**'))
+    return ', '.join(params)
+
+def parse_tool_file(file_path: str) -> Dict[str, Any]:
+    """Return the public top-level functions of a tool file with their signatures and docstrings.
+
+    Returns:
+        {"functions": [{"name", "signature", "doc"}, ...]}, or {"error": message} if the file cannot be parsed
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=file_path)
+    except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+        return {"error": f"Could not parse {os.path.basename(file_path)}: {str(e)}"}
+
+    functions = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith('_'):
+            signature = f"({format_arguments(node.args)})"
+            if node.returns is not None:
+                signature += f" -> {ast.unparse(node.returns)}"
+            functions.append({
+                "name": node.name,
+                "signature": signature,
+                "doc": ast.get_docstring(node) or 'No documentation available',
+            })
+    return {"functions": functions}
+
+def get_tool_manifest() -> Dict[str, Dict[str, Any]]:
+    """Return the manifest entry of every .py file in lib/tools, by file name, parsing only changed files."""
+    global _manifest
+    tools_dir = get_tools_dir()
+    with _manifest_lock:
+        if not _manifest:
+            _manifest = _load_manifest()
+        files = _manifest.setdefault("files", {})
+
+        changed = False
+        seen = set()
+        with os.scandir(tools_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.py') or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                cached = files.get(entry.name)
+                if cached is not None and (cached["mtime"], cached["size"]) == (stat.st_mtime, stat.st_size):
+                    continue
+                files[entry.name] = {"mtime": stat.st_mtime, "size": stat.st_size, **parse_tool_file(entry.path)}
+                changed = True
+
+        for file_name in set(files) - seen:
+            del files[file_name]
+            changed = True
+
+        if changed:
+            _save_manifest(_manifest)
+        return dict(files)
+
+def _load_manifest() -> Dict[str, Any]:
+    try:
+        with open(get_tool_manifest_path(), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": TOOL_MANIFEST_VERSION, "files": {}}
+    if manifest.get("version") != TOOL_MANIFEST_VERSION:
+        return {"version": TOOL_MANIFEST_VERSION, "files": {}}
+    return manifest
+
+def _save_manifest(manifest: Dict[str, Any]) -> None:
+    path = get_tool_manifest_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, path)
@@ -1,19 +1,39 @@
-import os
 from pathlib import Path
+from lib.directory_tree import DEFAULT_IGNORE, DEFAULT_MAX_DEPTH, DEFAULT_MAX_ENTRIES, render_directory_tree
+from lib.tool_input import parse_options
 
-def display_directory_tree(caller_id: str, _: str) -> str:
-    """Display the directory tree of the project."""
-    project_root = Path(__file__).parent.parent.parent
-    result = []
+def display_directory_tree(caller_id: str, input_str: str) -> str:
+    """Display the directory tree of the project.
+
+    By default .git, runs, chats, cache and __pycache__ are left out, directories are expanded 4
+    levels deep and at most 50 entries are shown per directory, followed by a "... N more" line.
+    The tree is cached until a directory in it changes.
+
+    Args:
+        caller_id: ID of the calling agent
+        input_str: Optional 'option=value§...' string, with options:
+                   - depth=N: number of directory levels to expand
+                   - ignore=GLOB,GLOB: names to leave out, replacing the defaults (ignore= shows everything)
+                   - max_entries=N: entries shown per directory
 
-    def add_directory(directory: Path, prefix: str = ""):
-        files = sorted(directory.iterdir())
-        for i, path in enumerate(files):
-            is_last = i == len(files) - 1
-            result.append(f"{prefix}{'└── ' if is_last else '├── '}{path.name}")
-            if path.is_dir() and path.name != "__pycache__":
-                add_directory(path, prefix + ("    " if is_last else "│   "))
+    Returns:
+        The directory tree as text
+    """
+    try:
+        options = parse_options(input_str.split('§'))
+    except ValueError as e:
+        return f"Error: {str(e)}"
+    try:
+        max_depth = int(options.get('depth', DEFAULT_MAX_DEPTH))
+        max_entries = int(options.get('max_entries', DEFAULT_MAX_ENTRIES))
+    except ValueError:
+        return "Error: depth and max_entries must be integers"
+    if max_depth < 1 or max_entries < 1:
+        return "Error: depth and max_entries must be at least 1"
 
-    result.append(project_root.name)
-    add_directory(project_root)
-    return "\n".join(result)
+    ignore = DEFAULT_IGNORE
+    if 'ignore' in options:
+        ignore = tuple(pattern.strip() for pattern in options['ignore'].split(',') if pattern.strip())
+
+    project_root = Path(__file__).parent.parent.parent
+    return render_directory_tree(str(project_root), max_depth, ignore, max_entries)
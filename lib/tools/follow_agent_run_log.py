@@ -0,0 +1,87 @@
+import os
+import time
+from lib.run_log import get_run_log_path, get_text_log_index, save_text_log_index, read_agent_lines, find_line_end, wait_for_log_growth
+
+# Largest chunk of the log returned in one call; the cursor lets the caller fetch the rest
+MAX_CHUNK_BYTES = 64 * 1024
+DEFAULT_TIMEOUT_SECONDS = 30.0
+MAX_TIMEOUT_SECONDS = 600.0
+
+def follow_agent_run_log(caller_id: str, input_str: str) -> str:
+    """Return the run log lines of an agent written since a cursor, waiting for new ones if there are none yet.
+
+    Meant for watching a run that is still in progress: pass the returned "Next cursor" to the next
+    call to only get what was logged in between, instead of re-reading the log from the start.
+
+    Args:
+        caller_id: ID of the calling agent
+        input_str: String in format 'agent_name§log_file_name§agent_id§cursor§timeout_seconds'
+                   agent_name must match an existing agent
+                   log_file_name is the name of the log file to follow
+                   agent_id is the ID of the agent whose lines to return, or empty for all lines
+                   cursor is the byte offset returned as "Next cursor" by the previous call,
+                   empty or 0 to start at the beginning of the log, or 'end' to only get lines logged from now on
+                   timeout_seconds is how long to wait for new lines (default 30, at most 600)
+
+    Returns:
+        The new lines with a header giving the next cursor, or a note that nothing new was logged before the timeout
+    """
+    try:
+        parts = input_str.split('§')
+        if not 2 <= len(parts) <= 5:
+            return "Error: Input must be in format 'agent_name§log_file_name§agent_id§cursor§timeout_seconds'"
+        parts += [''] * (5 - len(parts))
+        agent_name, log_file_name, agent_id, cursor_str, timeout_str = [part.strip() for part in parts]
+
+        log_file_path = get_run_log_path(agent_name, log_file_name)
+        if not os.path.isfile(log_file_path):
+            return f"Error: Run log not found at {log_file_path}"
+
+        if cursor_str.lower() == 'end':
+            cursor = get_text_log_index(log_file_path)['indexed_bytes']
+        else:
+            cursor = int(cursor_str) if cursor_str else 0
+            if cursor < 0:
+                return f"Error: Cursor {cursor} must not be negative"
+        timeout = min(float(timeout_str), MAX_TIMEOUT_SECONDS) if timeout_str else DEFAULT_TIMEOUT_SECONDS
+    except ValueError as e:
+        return f"Error: Invalid cursor or timeout: {str(e)}"
+
+    deadline = time.monotonic() + timeout
+    agent_label = agent_id or "all agents"
+    # The index is extended in memory on every poll and persisted once, when the call returns
+    try:
+        while True:
+            index = get_text_log_index(log_file_path, persist=False)
+            if cursor > index['size']:
+                return f"Error: Cursor {cursor} is past the end of the run log ({index['size']} bytes), the log may have been rewritten"
+
+            if index['indexed_bytes'] > cursor:
+                end = find_line_end(log_file_path, cursor, min(index['indexed_bytes'], cursor + MAX_CHUNK_BYTES))
+                content = read_agent_lines(log_file_path, index, cursor, end, agent_id) if agent_id else _read_lines(log_file_path, cursor, end)
+                start, cursor = cursor, end
+                if content:
+                    more = " | More available, call again now" if cursor < index['indexed_bytes'] else ""
+                    return (f"[Run log {log_file_name} | {agent_label}{_latest_iteration_info(index, agent_id)} | "
+                            f"Bytes {start}-{cursor} | Next cursor: {cursor}{more}]\n{content}")
+                # Only lines of other agents, keep waiting from after them
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not wait_for_log_growth(log_file_path, index['size'], remaining):
+                return f"[No new lines for {agent_label} in the last {timeout:g}s | Next cursor: {cursor}]"
+    finally:
+        save_text_log_index(log_file_path)
+
+def _read_lines(log_file_path: str, start: int, end: int) -> str:
+    with open(log_file_path, 'rb') as f:
+        f.seek(start)
+        content = f.read(end - start)
+    if content.endswith(b'\n'):
+        content = content[:-1]
+    return content.decode('utf-8', errors='replace')
+
+def _latest_iteration_info(index: dict, agent_id: str) -> str:
+    """Return ' | Latest iteration: N' for the highest iteration banner logged for the agent so far."""
+    iterations = [int(iteration) for banner_id, banners in index['banners'].items() if agent_id and agent_id in banner_id for iteration in banners]
+    return f" | Latest iteration: {max(iterations)}" if iterations else ""
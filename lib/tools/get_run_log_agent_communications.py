@@ -1,6 +1,28 @@
 import os
 import re
-from typing import List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from lib.tool_input import parse_options
+
+# Regular expressions for extracting information
+TOOL_PATTERN = re.compile(r'agent\.(\w+).*\[Tool: (ASK_USER|TELL_USER|LISTEN_TO_SUBAGENT|RESPOND_TO_SUBAGENT)\]')
+ITERATION_PATTERN = re.compile(r'\[(\w+).*? - LLM Response - Agent Iterations (\d+)\]')
+# In the dedup log mode the tool records only point to a [Memory #N] block, whose lines (each prefixed
+# with the agent ID and the block number) hold "Tool Result [Tool: X] Input: ... | Result: ... | Time: ...s"
+MEMORY_TOOL_PATTERN = re.compile(r'^(\[(\w+)[^\]]*\]\[Memory #\d+\])Tool Result \[Tool: (ASK_USER|TELL_USER|LISTEN_TO_SUBAGENT|RESPOND_TO_SUBAGENT)\] Input: ')
+MEMORY_TOOL_RESULT_PATTERN = re.compile(r'^(.*?) \| Result: (.*) \| Time: [\d.]+s$', re.DOTALL)
+MEMORY_BLOCK_END_PATTERN = re.compile(r' \| Time: [\d.]+s$')
+
+# Parsed events and parser state per run log, so re-querying a growing log only parses its new tail.
+# The least recently queried logs are evicted beyond MAX_PARSED_LOGS.
+MAX_PARSED_LOGS = 32
+# A log not modified for this long is taken to be finished (or its run to have crashed), so a tool call
+# whose result was never logged is reported without one instead of waiting for it
+LOG_SETTLED_SECONDS = 60.0
+_parsed_logs: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+_parsed_logs_lock = threading.Lock()
 
 def get_run_log_agent_communications(caller_id: str, input_str: str) -> str:
     """Extract agent communication events from a run log file.
@@ -13,19 +35,26 @@ def get_run_log_agent_communications(caller_id: str, input_str: str) -> str:
 
     Args:
         caller_id: ID of the calling agent
-        input_str: String in format 'agent_name§log_file_name'
+        input_str: String in format 'agent_name§log_file_name§option=value§...'
                    agent_name must match an existing agent
                    log_file_name is the name of the log file to analyze
+                   Options (all optional):
+                   - agent=AGENT_ID: only events of this agent
+                   - tool=TOOL_1,TOOL_2: only events of these tools
+                   - iterations=FIRST-LAST (or a single iteration): only events in this iteration range
+                   - first=N / last=N: only the first / last N matching events
+                   - from_offset=N: only parse the log from byte offset N, as returned in "Next offset"
 
     Returns:
         Formatted string with chronological list of all agent interactions
     """
     try:
         parts = input_str.split('§')
-        if len(parts) != 2:
-            return "Error: Input must be in format 'agent_name§log_file_name'"
+        if len(parts) < 2:
+            return "Error: Input must be in format 'agent_name§log_file_name§option=value§...'"
 
-        agent_name, log_file_name = parts
+        agent_name, log_file_name = parts[:2]
+        options = parse_options(parts[2:])
 
         # Get project root directory
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -42,19 +71,45 @@ def get_run_log_agent_communications(caller_id: str, input_str: str) -> str:
         if not os.path.isfile(log_file_path):
             return f"Error: Run log not found at {log_file_path}"
 
-        # Extract events from the log file
-        events = extract_agent_events(log_file_path)
+        if 'from_offset' in options:
+            state = {'offset': int(options['from_offset']), 'line_num': None, 'agent_iterations': {}}
+            events = list(iter_agent_events(log_file_path, state, final=is_log_settled(log_file_path)))
+        else:
+            events, state = get_cached_agent_events(log_file_path)
 
-        # Format the events as a string
-        return format_agent_events(events)
+        events = filter_agent_events(events, options)
+        output = format_agent_events(events)
+        return f"{output}\nNext offset: {state['offset']}\n"
 
     except Exception as e:
         import traceback
         stack_trace = traceback.format_exc()
         return f"Error analyzing run log: {str(e)}\n\nStack trace:\n{stack_trace}"
 
-def extract_agent_events(log_file_path: str) -> List[Dict[str, Any]]:
-    """Extract specific agent tool calls from logs.
+def get_cached_agent_events(log_file_path: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Return all events of a run log and the parser state, parsing only what was appended since the last call."""
+    stat = os.stat(log_file_path)
+    with _parsed_logs_lock:
+        cached = _parsed_logs.get(log_file_path)
+        if cached is None or stat.st_size < cached['state']['offset'] or stat.st_ino != cached['inode']:
+            cached = {
+                'inode': stat.st_ino,
+                'events': [],
+                'state': {'offset': 0, 'line_num': 0, 'agent_iterations': {}},
+            }
+            _parsed_logs[log_file_path] = cached
+        _parsed_logs.move_to_end(log_file_path)
+        while len(_parsed_logs) > MAX_PARSED_LOGS:
+            _parsed_logs.popitem(last=False)
+        cached['events'].extend(iter_agent_events(log_file_path, cached['state'], final=is_log_settled(log_file_path)))
+        return list(cached['events']), dict(cached['state'])
+
+def is_log_settled(log_file_path: str) -> bool:
+    """Return whether a log has not been modified for LOG_SETTLED_SECONDS, i.e. is no longer being written."""
+    return time.time() - os.path.getmtime(log_file_path) >= LOG_SETTLED_SECONDS
+
+def iter_agent_events(log_file_path: str, state: Optional[Dict[str, Any]] = None, final: bool = False) -> Iterator[Dict[str, Any]]:
+    """Lazily yield specific agent tool calls from a log, in chronological order.
 
     This function extracts:
     - ASK_USER tool calls
@@ -62,57 +117,74 @@ def extract_agent_events(log_file_path: str) -> List[Dict[str, Any]]:
     - LISTEN_TO_SUBAGENT tool calls
     - RESPOND_TO_SUBAGENT tool calls
 
+    Parsing starts at state['offset'] and state is updated as lines are consumed, so passing the
+    same state again resumes where the previous pass stopped. A last line that is still being written,
+    or a multiline tool call whose result has not been logged yet, is left for the next pass, unless
+    final is set (the log is no longer written to), in which case the tool call is yielded without a result.
+
     Args:
         log_file_path: Path to the log file
+        state: Dict with 'offset' (byte offset to start from), 'line_num' (number of lines before
+               offset, None if unknown) and 'agent_iterations' (last iteration seen per agent)
+        final: Whether the log is complete, e.g. its run has ended or crashed
 
-    Returns:
-        list: Chronological list of all tool calls
+    Yields:
+        dict: One event per tool call
     """
-    # Event list to store all tool calls
-    events = []
-
-    # Track current agent iterations
-    agent_iterations = {}
+    if state is None:
+        state = {'offset': 0, 'line_num': 0, 'agent_iterations': {}}
+    agent_iterations = state['agent_iterations']
 
-    # Regular expressions for extracting information
-    tool_pattern = re.compile(r'agent\.(\w+).*\[Tool: (ASK_USER|TELL_USER|LISTEN_TO_SUBAGENT|RESPOND_TO_SUBAGENT)\]')
-    iteration_pattern = re.compile(r'\[(\w+).*? - LLM Response - Agent Iterations (\d+)\]')
-
-    with open(log_file_path, 'r', encoding='utf-8') as file:
-        lines = file.readlines()
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+    with open(log_file_path, 'rb') as file:
+        file.seek(state['offset'])
+        lines = _PushbackIterator(_iter_complete_lines(file, state['offset']))
+        for next_offset, raw_line in lines:
+            line = raw_line.strip()
+            line_num = state['line_num'] + 1 if state['line_num'] is not None else None
 
             # Check for iteration markers
-            iteration_match = iteration_pattern.search(line)
+            iteration_match = ITERATION_PATTERN.search(line)
             if iteration_match:
-                agent_id = iteration_match.group(1)
-                iteration_num = iteration_match.group(2)
-                agent_iterations[agent_id] = iteration_num
-
-            # Skip summary lines that only have length information
-            if "Input Length:" in line and "Result Length:" in line:
-                i += 1
-                continue
-
-            # Check if line contains a tool call with content
-            tool_match = tool_pattern.search(line)
-            if tool_match and "Input:" in line:
+                agent_iterations[iteration_match.group(1)] = iteration_match.group(2)
+
+            # Check if line contains a tool call with content, skipping summary lines that only have length information
+            tool_match = None
+            if not ("Input Length:" in line and "Result Length:" in line):
+                tool_match = TOOL_PATTERN.search(line)
+
+            memory_match = MEMORY_TOOL_PATTERN.match(line)
+            if memory_match:
+                prefix, agent_id, tool_name = memory_match.groups()
+                body = line[len(prefix):]
+                lines_consumed = 1
+                # The block's last line ends with the tool's time
+                while not MEMORY_BLOCK_END_PATTERN.search(body):
+                    continuation = next(lines, None)
+                    if continuation is None:
+                        if final:
+                            break
+                        # Block not completely logged yet, parse it again on the next pass
+                        return
+                    if not continuation[1].startswith(prefix):
+                        # Malformed block, the line belongs to the next record
+                        lines.push_back(continuation)
+                        break
+                    next_offset = continuation[0]
+                    lines_consumed += 1
+                    body += "\n" + continuation[1][len(prefix):].rstrip('\n')
+
+                body = body[len("Tool Result [Tool: ") + len(tool_name) + len("] Input: "):]
+                result_match = MEMORY_TOOL_RESULT_PATTERN.match(body)
+                input_text, result = (result_match.group(1), result_match.group(2).strip()) if result_match else (body, None)
+                event = _build_event(line_num, line, agent_id, tool_name, input_text.strip(), result, agent_iterations.get(agent_id))
+            elif tool_match and "Input:" in line:
                 agent_id = tool_match.group(1)
                 tool_name = tool_match.group(2)
 
-                # Get the line number
-                line_num = i + 1
-
-                # Get current iteration for this agent if available
-                current_iteration = agent_iterations.get(agent_id)
-
                 # Extract input and result parts
                 parts = line.split("Input:", 1)[1]
+                lines_consumed = 1
 
-                # Handle multiline inputs
-                input_text = ""
                 if " | Result:" in parts:
                     input_parts = parts.split(" | Result:", 1)
                     input_text = input_parts[0].strip()
@@ -120,72 +192,110 @@ def extract_agent_events(log_file_path: str) -> List[Dict[str, Any]]:
                 else:
                     # This is a multiline input, collect until we find " | Result:"
                     input_text = parts.strip()
-                    j = i + 1
-                    while j < len(lines) and " | Result:" not in lines[j]:
-                        input_text += "\n" + lines[j].strip()
-                        j += 1
-
-                    # Now get the result if we found it
-                    if j < len(lines) and " | Result:" in lines[j]:
-                        result = lines[j].split(" | Result:", 1)[1].strip()
-                        i = j  # Update our position
+                    result = None
+                    for next_offset, continuation in lines:
+                        lines_consumed += 1
+                        if " | Result:" in continuation:
+                            result = continuation.split(" | Result:", 1)[1].strip()
+                            break
+                        input_text += "\n" + continuation.strip()
                     else:
-                        result = None
-
-                # Create event based on tool type
-                if tool_name == "ASK_USER":
-                    events.append({
-                        'line_num': line_num,
-                        'line': line,
-                        'agent_id': agent_id,
-                        'tool': 'ASK_USER',
-                        'input': input_text,
-                        'result': result,
-                        'iteration': current_iteration
-                    })
-                elif tool_name == "TELL_USER":
-                    events.append({
-                        'line_num': line_num,
-                        'line': line,
-                        'agent_id': agent_id,
-                        'tool': 'TELL_USER',
-                        'input': input_text,
-                        'iteration': current_iteration
-                    })
-                elif tool_name == "RESPOND_TO_SUBAGENT":
-                    # Extract receiver and content
-                    receiver_id = None
-                    content = None
-
-                    if "§" in input_text:
-                        parts = input_text.split("§", 1)
-                        receiver_id = parts[0].strip()
-                        content = parts[1] if len(parts) > 1 else None
-
-                    events.append({
-                        'line_num': line_num,
-                        'line': line,
-                        'agent_id': agent_id,
-                        'tool': 'RESPOND_TO_SUBAGENT',
-                        'receiver_id': receiver_id,
-                        'content': content,
-                        'iteration': current_iteration
-                    })
-                elif tool_name == "LISTEN_TO_SUBAGENT":
-                    events.append({
-                        'line_num': line_num,
-                        'line': line,
-                        'agent_id': agent_id,
-                        'tool': 'LISTEN_TO_SUBAGENT',
-                        'target_id': input_text,
-                        'result': result,
-                        'iteration': current_iteration
-                    })
-
-            i += 1
-
-    # Sort events by line number
-    events.sort(key=lambda x: x['line_num'])
+                        if not final:
+                            # Result not logged yet, parse this tool call again on the next pass
+                            return
+
+                event = _build_event(line_num, line, agent_id, tool_name, input_text, result, agent_iterations.get(agent_id))
+            else:
+                event = None
+                lines_consumed = 1
+
+            # Advance the state before yielding, so an abandoned pass never yields the same event twice
+            state['offset'] = next_offset
+            if state['line_num'] is not None:
+                state['line_num'] += lines_consumed
+            if event:
+                yield event
+
+def extract_agent_events(log_file_path: str) -> List[Dict[str, Any]]:
+    """Extract specific agent tool calls from logs.
+
+    Args:
+        log_file_path: Path to the log file
+
+    Returns:
+        list: Chronological list of all tool calls
+    """
+    return list(iter_agent_events(log_file_path, final=is_log_settled(log_file_path)))
+
+class _PushbackIterator:
+    """Iterator that can be given back the last item it yielded, so it is yielded again."""
+    def __init__(self, iterator: Iterator[Any]):
+        self.iterator = iterator
+        self.pushed_back: List[Any] = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.pushed_back.pop() if self.pushed_back else next(self.iterator)
+
+    def push_back(self, item: Any) -> None:
+        self.pushed_back.append(item)
+
+def _iter_complete_lines(file, offset: int) -> Iterator[Tuple[int, str]]:
+    """Yield (byte offset after the line, line) for every newline-terminated line from the current file position."""
+    for raw_line in file:
+        if not raw_line.endswith(b'\n'):
+            return
+        offset += len(raw_line)
+        yield offset, raw_line.decode('utf-8', errors='replace')
+
+def _build_event(line_num: Optional[int], line: str, agent_id: str, tool_name: str, input_text: str, result: Optional[str], iteration: Optional[str]) -> Dict[str, Any]:
+    """Create event based on tool type."""
+    event = {
+        'line_num': line_num,
+        'line': line,
+        'agent_id': agent_id,
+        'tool': tool_name,
+        'iteration': iteration,
+    }
+    if tool_name == "ASK_USER":
+        event.update({'input': input_text, 'result': result})
+    elif tool_name == "TELL_USER":
+        event.update({'input': input_text})
+    elif tool_name == "RESPOND_TO_SUBAGENT":
+        # Extract receiver and content
+        receiver_id = None
+        content = None
+        if "§" in input_text:
+            parts = input_text.split("§", 1)
+            receiver_id = parts[0].strip()
+            content = parts[1] if len(parts) > 1 else None
+        event.update({'receiver_id': receiver_id, 'content': content})
+    elif tool_name == "LISTEN_TO_SUBAGENT":
+        event.update({'target_id': input_text, 'result': result})
+    return event
+
+def filter_agent_events(events: List[Dict[str, Any]], options: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Apply the agent, tool, iterations, first and last options of the tool input to a list of events."""
+    if 'agent' in options:
+        # Log lines only carry the agent ID up to the first '-', so match on prefixes
+        agent = options['agent']
+        events = [e for e in events if agent.startswith(e['agent_id']) or e['agent_id'].startswith(agent)]
+
+    if 'tool' in options:
+        tools = {tool.strip().upper() for tool in options['tool'].split(',')}
+        events = [e for e in events if e['tool'] in tools]
+
+    if 'iterations' in options:
+        first, _, last = options['iterations'].partition('-')
+        first, last = int(first), int(last or first)
+        events = [e for e in events if e.get('iteration') and first <= int(e['iteration']) <= last]
+
+    if 'first' in options:
+        events = events[:int(options['first'])]
+    if 'last' in options:
+        events = events[-int(options['last']):] if int(options['last']) > 0 else []
 
     return events
 
@@ -193,7 +303,7 @@ def format_agent_events(events: List[Dict[str, Any]]) -> str:
     """Format agent events into a chronological text report.
 
     Args:
-        events: Events extracted with extract_agent_events
+        events: Events extracted with iter_agent_events
 
     Returns:
         str: Formatted chronological list of all agent interactions
@@ -201,7 +311,7 @@ def format_agent_events(events: List[Dict[str, Any]]) -> str:
     if not events:
         return "No agent interactions found in the log."
 
-    output = "=== AGENT COMMUNICATION (CHRONOLOGICAL) ===\n\n"
+    output = ["=== AGENT COMMUNICATION (CHRONOLOGICAL) ===\n\n"]
 
     for i, event in enumerate(events, 1):
         agent_id = event['agent_id']
@@ -210,35 +320,36 @@ def format_agent_events(events: List[Dict[str, Any]]) -> str:
         # Format agent with iteration if available
         iteration_info = f" [Agent Iterations {event['iteration']}]" if event.get('iteration') else ""
         agent_display = f"{agent_short_id}{iteration_info}"
+        line_info = f"[Line {event['line_num']}] " if event.get('line_num') is not None else ""
 
         if event['tool'] == 'ASK_USER':
-            output += f"{i}. [Line {event['line_num']}] {agent_display} → User (ASK_USER)\n"
-            output += f"   Question: {event['input']}\n"
+            output.append(f"{i}. {line_info}{agent_display} → User (ASK_USER)\n")
+            output.append(f"   Question: {event['input']}\n")
             if event.get('result'):
-                output += f"   Response: {event['result']}\n"
+                output.append(f"   Response: {event['result']}\n")
 
         elif event['tool'] == 'TELL_USER':
-            output += f"{i}. [Line {event['line_num']}] {agent_display} → User (TELL_USER)\n"
-            output += f"   Message: {event['input']}\n"
+            output.append(f"{i}. {line_info}{agent_display} → User (TELL_USER)\n")
+            output.append(f"   Message: {event['input']}\n")
 
         elif event['tool'] == 'RESPOND_TO_SUBAGENT':
             receiver_id = event.get('receiver_id') or 'unknown'
             receiver_short_id = receiver_id.split('-')[0] if '-' in receiver_id else receiver_id
-            output += f"{i}. [Line {event['line_num']}] {agent_display} → {receiver_short_id} (RESPOND_TO_SUBAGENT)\n"
+            output.append(f"{i}. {line_info}{agent_display} → {receiver_short_id} (RESPOND_TO_SUBAGENT)\n")
             if event.get('content'):
-                output += f"   Content: {event['content']}\n"
+                output.append(f"   Content: {event['content']}\n")
             else:
-                output += f"   Content: [Empty or Multiline Content]\n"
+                output.append(f"   Content: [Empty or Multiline Content]\n")
 
         elif event['tool'] == 'LISTEN_TO_SUBAGENT':
             target_id = event.get('target_id') or 'unknown'
             target_short_id = target_id.split('-')[0] if '-' in target_id else target_id
-            output += f"{i}. [Line {event['line_num']}] {agent_display} ← {target_short_id} (LISTEN_TO_SUBAGENT)\n"
+            output.append(f"{i}. {line_info}{agent_display} ← {target_short_id} (LISTEN_TO_SUBAGENT)\n")
             if event.get('result') and event['result'].strip():
-                output += f"   Result: {event['result']}\n"
+                output.append(f"   Result: {event['result']}\n")
             else:
-                output += f"   Result: No message received\n"
+                output.append(f"   Result: No message received\n")
 
-        output += "\n"
+        output.append("\n")
 
-    return output
+    return "".join(output)
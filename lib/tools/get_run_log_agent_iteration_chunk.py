@@ -1,7 +1,6 @@
 import os
-import re
 from typing import Dict, List, Tuple
-from pathlib import Path
+from lib.run_log import get_text_log_index, read_agent_lines
 
 def get_run_log_agent_iteration_chunk(caller_id: str, input_str: str, banner_index: int = -1) -> str:
     """Extract a specific agent iteration chunk from a run log file.
@@ -18,41 +17,6 @@ def get_run_log_agent_iteration_chunk(caller_id: str, input_str: str, banner_ind
     Returns:
         Content of the specified agent iteration chunk, or an error message
     """
-    def filter_content_by_agent_id(content: str, agent_id: str) -> str:
-        """Filter content to only include lines related to the specified agent ID.
-
-        If a line doesn't have a prefix, look at previous lines until a prefix is found.
-        If no prefix is found in previous lines, assign 'NO_PREFIX'.
-        """
-        lines = content.split('\n')
-        # Debug prints removed
-
-        filtered_lines = []
-
-        # Dictionary to keep track of line prefixes
-        line_prefixes = {}
-        current_prefix = "NO_PREFIX"
-
-        # First pass: assign prefixes to each line
-        for i, line in enumerate(lines):
-            # Check if line has a prefix using the agent ID pattern
-            prefix_match = re.search(r'\[([A-Z][a-z0-9]*(?:[A-Z][a-z0-9]*)*Agent_\d{6}-[0-9a-f]{8}-)', line)
-
-            if prefix_match:
-                # Line has a prefix, use it
-                current_prefix = prefix_match.group(1)
-
-            # Store the prefix for this line
-            line_prefixes[i] = current_prefix
-
-        # Second pass: filter lines by the specified agent ID
-        for i, line in enumerate(lines):
-            # Keep the line only if its prefix matches the agent ID
-            if agent_id in line_prefixes[i]:
-                filtered_lines.append(line)
-
-        return '\n'.join(filtered_lines)
-
     # Parse the input string format agent_name§run_log_name§agent_Id§iteration_number
     parts = input_str.split('§')
     if len(parts) != 4:
@@ -80,27 +44,14 @@ def get_run_log_agent_iteration_chunk(caller_id: str, input_str: str, banner_ind
         return f"Error: Run log not found at {run_log_path}"
 
     try:
-        # Read run log content
-        with open(run_log_path, 'r', encoding='utf-8') as f:
-            run_log_content = f.read()
+        # Banner positions come from the persistent index of the run log, built in one streaming pass
+        index = get_text_log_index(run_log_path)
 
-        # Pattern to match iteration banners for the specific agent
+        # Group banner positions by iteration number
         # The format is [AgentID - LLM Response - Agent Iterations X]
-        pattern = rf'\[{agent_id} - LLM Response - Agent Iterations (\d+)\]'
-
-        # Find all matches
-        matches = list(re.finditer(pattern, run_log_content))
-
-        # Group matches by iteration number
         iteration_matches: Dict[int, List[Tuple[int, int]]] = {}
-        for match in matches:
-            match_iteration = int(match.group(1))
-            match_position = match.start()
-
-            if match_iteration not in iteration_matches:
-                iteration_matches[match_iteration] = []
-
-            iteration_matches[match_iteration].append((match_position, len(match.group(0))))
+        for match_iteration, positions in index['banners'].get(agent_id, {}).items():
+            iteration_matches[int(match_iteration)] = [(start, end - start) for start, end in positions]
 
         current_iteration = iteration
         previous_iteration = current_iteration - 1
@@ -157,20 +108,9 @@ def get_run_log_agent_iteration_chunk(caller_id: str, input_str: str, banner_ind
             start_pos = prev_banner_pos  # Start from the previous banner
             end_pos = curr_banner_pos + curr_banner_len
 
-        # print("WHAT IS THE START POS AND END POS LINE NUMBERS")
-        # # Calculate line numbers for start and end positions
-        # start_line = run_log_content[:start_pos].count('\n') + 1
-        # end_line = run_log_content[:end_pos].count('\n') + 1
-        # print(f"Start position line number: {start_line}")
-        # print(f"End position line number: {end_line}")
-
-        content = run_log_content[start_pos:end_pos]
-        return filter_content_by_agent_id(content, agent_id)
+        return read_agent_lines(run_log_path, index, start_pos, end_pos, agent_id)
 
     except Exception as e:
         import traceback
         stack_trace = traceback.format_exc()
         return f"Error processing run log: {str(e)}\n\nStack trace:\n{stack_trace}"
-
-
-
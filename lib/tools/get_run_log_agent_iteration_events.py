@@ -0,0 +1,51 @@
+import os
+from lib.run_log import get_run_log_path, get_structured_log_paths, load_structured_index, read_structured_events, get_iteration_byte_range, format_structured_events
+
+def get_run_log_agent_iteration_events(caller_id: str, input_str: str) -> str:
+    """Return the structured events (LLM responses, tool calls, tool results and notes) of an agent's iterations.
+
+    Uses the structured .jsonl log and its sidecar index written next to the run log,
+    so only the byte range of the requested iterations is read.
+
+    Args:
+        caller_id: ID of the calling agent
+        input_str: String in format 'agent_name§run_log_name§agent_Id§first_iteration§last_iteration'
+                   agent_name: Name of the agent folder where the run log is stored
+                   run_log_name: Name of the run log file, without extension
+                   agent_Id: ID of the agent within the run log
+                   first_iteration: First iteration number to return
+                   last_iteration: Optional last iteration number, defaults to first_iteration
+
+    Returns:
+        The events of the requested iterations in chronological order, or an error message
+    """
+    parts = input_str.split('§')
+    if len(parts) not in (4, 5):
+        return "Error: Input should be in format 'agent_name§run_log_name§agent_Id§first_iteration§last_iteration'"
+
+    agent_name, run_log_name, agent_id = parts[:3]
+    try:
+        first_iteration = int(parts[3])
+        last_iteration = int(parts[4]) if len(parts) == 5 and parts[4].strip() else first_iteration
+    except ValueError:
+        return "Error: Iteration numbers must be integers"
+
+    run_log_path = get_run_log_path(agent_name, run_log_name)
+    jsonl_path, _ = get_structured_log_paths(run_log_path)
+    index = load_structured_index(run_log_path)
+    if index is None or not os.path.isfile(jsonl_path):
+        return f"Error: No structured log found for {run_log_path}, use GET_RUN_LOG_AGENT_ITERATION_CHUNK instead"
+
+    byte_range = get_iteration_byte_range(index, agent_id, first_iteration, last_iteration)
+    if byte_range is None:
+        return f"Error: Could not find iterations {first_iteration}-{last_iteration} for agent {agent_id}"
+
+    # Iterations of concurrent agents interleave, so the byte range can hold other agents' events too
+    events = [
+        event for event in read_structured_events(jsonl_path, *byte_range)
+        if event['agent_id'] == agent_id and first_iteration <= event['iteration'] <= last_iteration
+    ]
+    if not events:
+        return f"Error: Could not find iterations {first_iteration}-{last_iteration} for agent {agent_id}"
+
+    return format_structured_events(events)
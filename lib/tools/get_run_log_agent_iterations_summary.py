@@ -1,7 +1,7 @@
-
 import os
 import re
 from typing import Dict
+from lib.run_log import load_structured_index, scan_log, AGENT_ID_PATTERN
 
 def get_run_log_agent_iterations_summary(caller_id: str, input_str: str) -> str:
     """Return a summary of the all agent and subagents iterations found in a run log."""
@@ -26,34 +26,40 @@ def get_run_log_agent_iterations_summary(caller_id: str, input_str: str) -> str:
         return f"Error: Run log not found at {run_log_path}. (Note: remember not to include .txt extension for the manifesto name)"
 
     try:
-        # Read run log content
-        with open(run_log_path, 'r', encoding='utf-8') as f:
-            run_log_content = f.read()
-
         # Find all agent IDs and their max iterations
         iterations = {}
 
+        # Runs with a structured log have an index of iterations per agent, no need to scan the text log
+        index = load_structured_index(run_log_path)
+        if index is not None:
+            for agent_id, agent_iterations in index['iterations'].items():
+                iterations[agent_id] = max(int(i) for i in agent_iterations)
+            return format_iterations_summary(iterations)
+
         # Pattern to match agent IDs in the format: PascalCaseNameAgent_HHMMSS-hextoken-
         # Example: AgentCreatorAgent_145648-560d4e50-
         # Look for "Agent Iterations N" pattern which is the standard format in logs
-        pattern = r'\[([A-Z][a-z0-9]*(?:[A-Z][a-z0-9]*)*Agent_\d{6}-[0-9a-f]{8}-) - LLM Response - Agent Iterations (\d+)\]'
+        pattern = re.compile(rb'\[(' + AGENT_ID_PATTERN + rb') - LLM Response - Agent Iterations (\d+)\]')
 
-        # Find all matches and keep track of the maximum iteration for each agent
-        for match in re.finditer(pattern, run_log_content):
-            agent_id, iteration = match.groups()
+        # Scan the memory-mapped log and keep track of the maximum iteration for each agent
+        for _, (agent_id, iteration) in scan_log(run_log_path, pattern):
+            agent_id = agent_id.decode('utf-8')
             iterations[agent_id] = max(int(iteration), iterations.get(agent_id, 0))
 
-        # Format the results
-        if not iterations:
-            return "No agent iterations found in the run log."
-
-        result = "Agent Iterations:\n"
-        for agent_id, max_iteration in sorted(iterations.items()):
-            result += f"{agent_id}: Max Iteration: {max_iteration}\n"
-
-        return result
+        return format_iterations_summary(iterations)
 
     except Exception as e:
         import traceback
         stack_trace = traceback.format_exc()
         return f"Error reading run log: {str(e)}\n\nStack trace:\n{stack_trace}"
+
+def format_iterations_summary(iterations: Dict[str, int]) -> str:
+    """Format the max iteration of every agent ID found in a run log."""
+    if not iterations:
+        return "No agent iterations found in the run log."
+
+    result = "Agent Iterations:\n"
+    for agent_id, max_iteration in sorted(iterations.items()):
+        result += f"{agent_id}: Max Iteration: {max_iteration}\n"
+
+    return result
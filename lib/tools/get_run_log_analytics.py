@@ -0,0 +1,27 @@
+from lib.analytics import run_analytics
+from lib.tool_input import parse_options
+
+def get_run_log_analytics(caller_id: str, input_str: str) -> str:
+    """Aggregate performance metrics across all run logs in runs/.
+
+    Reports LLM call latency, per-tool call counts, error rates and latency percentiles, per-agent
+    iteration counts, memory usage by iteration, and a latency histogram. Run logs are parsed in
+    parallel and their metrics cached, so repeated calls only parse new or grown logs.
+
+    Args:
+        caller_id: ID of the calling agent
+        input_str: Optional 'option=value§...' string, with options:
+                   - agent=AGENT_NAME: only analyze the run logs of this agent
+                   - tool=TOOL_NAME: show the latency histogram of this tool instead of the LLM calls
+
+    Returns:
+        Aggregate tables and a histogram as text
+    """
+    try:
+        options = parse_options(input_str.split('§'))
+    except ValueError as e:
+        return f"Error: {str(e)}"
+
+    tool = options.get('tool')
+    _, report = run_analytics(options.get('agent'), tool.upper() if tool else None)
+    return report
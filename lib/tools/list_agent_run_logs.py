@@ -1,26 +1,27 @@
 from pathlib import Path
-from typing import List, Optional
-import os
+from lib.files import format_file_listing
+from lib.tool_input import parse_options
 
-def list_agent_run_logs(caller_id: str, agent_name: str) -> str:
+def list_agent_run_logs(caller_id: str, input_str: str) -> str:
     """List all run log files for a specific agent.
 
     Args:
-        agent_name: Name of the agent whose run logs to list
+        input_str: String in format 'agent_name' or 'agent_name§option=value§...', with the options of
+                   LIST_FILES_IN_AGENTS_SUPERFOLDER (glob=, sort=path|mtime|size, order=asc|desc, limit=,
+                   cursor=, metadata=true). E.g. 'agent_name§sort=mtime§limit=5' lists the 5 latest logs.
 
     Returns:
         String containing list of log file names, joined by §
+        With limit, cursor or metadata, a header line with the total and the next cursor comes first
     """
+    agent_name, *option_parts = input_str.split('§')
+    agent_name = agent_name.strip()
     base_path = Path(__file__).parent.parent.parent / "runs" / agent_name
-    
-    if not base_path.exists():
-        return ""
-    
-    result = []
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            full_path = Path(root) / file
-            result.append(str(full_path.relative_to(base_path)))
-    
-    result.sort()
-    return '§'.join(result)
+
+    try:
+        options = parse_options(option_parts)
+        if not base_path.exists():
+            return ""
+        return format_file_listing(str(base_path), options)
+    except ValueError as e:
+        return f"Error: {str(e)}"
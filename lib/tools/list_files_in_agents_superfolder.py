@@ -1,20 +1,29 @@
 from pathlib import Path
-from typing import List, Optional
-import os
+from lib.files import format_file_listing
+from lib.tool_input import parse_options
 
-def list_files_in_agents_superfolder(caller_id: str, _: str) -> str:
+def list_files_in_agents_superfolder(caller_id: str, input_str: str) -> str:
     """List all files in the agents superfolder.
 
     Args:
-        _: Unused, but required for tool format compliance
+        input_str: Optional 'option=value§...' string, with options:
+                   - glob=PATTERN: only files whose relative path or name matches, e.g. glob=*.json
+                   - sort=path|mtime|size: sort order, mtime and size sort newest / largest first
+                   - order=asc|desc: override the sort direction
+                   - limit=N and cursor=N: return a page of N files starting after the first cursor ones
+                   - metadata=true: add each file's size and modification time
 
     Returns:
         String containing list of relative paths to files, joined by §
+        With limit, cursor or metadata, a header line with the total and the next cursor comes first
     """
-    base_path = Path(__file__).parent.parent.parent / "agents"
-    result = []
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            full_path = Path(root) / file
-            result.append(str(full_path.relative_to(base_path)))
-    return '§'.join(result)
+    parts = input_str.split('§')
+    # Anything before the options was never used, skip it as before
+    if parts and '=' not in parts[0]:
+        parts = parts[1:]
+    try:
+        options = parse_options(parts)
+        base_path = Path(__file__).parent.parent.parent / "agents"
+        return format_file_listing(str(base_path), options)
+    except ValueError as e:
+        return f"Error: {str(e)}"
@@ -1,21 +1,30 @@
 from pathlib import Path
 import os
+from lib.files import format_file_listing
+from lib.tool_input import parse_options
 
-def list_files_in_scenarios_folder(caller_id: str, agent_name: str) -> str:
+def list_files_in_scenarios_folder(caller_id: str, input_str: str) -> str:
     """List all files in the scenarios directory for a specific agent.
 
     Args:
-        agent_name: Name of the agent subfolder to list files from
+        input_str: String in format 'agent_name' or 'agent_name§option=value§...'
+                   agent_name: Name of the agent subfolder to list files from
                    Must match an existing agent subfolder in agents/
                    If empty, lists all agent subfolders in scenarios/
+                   Options are those of LIST_FILES_IN_AGENTS_SUPERFOLDER (glob=, sort=path|mtime|size,
+                   order=asc|desc, limit=, cursor=, metadata=true)
 
     Returns:
         String containing list of relative paths to files, joined by §
+        With limit, cursor or metadata, a header line with the total and the next cursor comes first
         If agent_name is empty, returns list of agent subfolder names
 
     Raises:
-        ValueError: If agent_name doesn't match an existing agent subfolder
+        ValueError: If agent_name doesn't match an existing agent subfolder, or an option is invalid
     """
+    agent_name, *option_parts = input_str.split('§')
+    agent_name = agent_name.strip()
+    options = parse_options(option_parts)
     scenarios_path = Path(__file__).parent.parent.parent / "scenarios"
     
     # If no agent name provided, list all agent subfolders in scenarios
@@ -41,11 +50,4 @@ def list_files_in_scenarios_folder(caller_id: str, agent_name: str) -> str:
     # Create the directory if it doesn't exist
     os.makedirs(base_path, exist_ok=True)
     
-    result = []
-    if base_path.exists():
-        for root, _, files in os.walk(base_path):
-            for file in files:
-                full_path = Path(root) / file
-                result.append(str(full_path.relative_to(base_path)))
-    
-    return '§'.join(result)
+    return format_file_listing(str(base_path), options)
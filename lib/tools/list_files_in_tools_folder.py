@@ -1,17 +1,23 @@
 from pathlib import Path
-from typing import List, Optional
-import os
+from lib.files import format_file_listing
+from lib.tool_input import parse_options
 
-def list_files_in_tools_folder(caller_id: str, _: str) -> str:
+def list_files_in_tools_folder(caller_id: str, input_str: str) -> str:
     """List all files in the tools directory.
 
+    Args:
+        input_str: Optional 'option=value§...' string, with the options of LIST_FILES_IN_AGENTS_SUPERFOLDER
+                   (glob=, sort=path|mtime|size, order=asc|desc, limit=, cursor=, metadata=true)
+
     Returns:
         String containing list of relative paths to files, joined by §
+        With limit, cursor or metadata, a header line with the total and the next cursor comes first
     """
-    base_path = Path(__file__).parent
-    result = []
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            full_path = Path(root) / file
-            result.append(str(full_path.relative_to(base_path)))
-    return '§'.join(result)
+    parts = input_str.split('§')
+    if parts and '=' not in parts[0]:
+        parts = parts[1:]
+    try:
+        options = parse_options(parts)
+        return format_file_listing(str(Path(__file__).parent), options)
+    except ValueError as e:
+        return f"Error: {str(e)}"
@@ -1,42 +1,26 @@
-import os
-import inspect
-import importlib.util
+from lib.tool_manifest import get_tool_manifest
 
 def list_tools(caller_id: str, _: str = '') -> str:
-    """List all tools in the tools directory and return their information."""
-    try:
-        # Get the current directory (tools directory)
-        tools_dir = os.path.dirname(os.path.abspath(__file__))
-
-        # Get all Python files in the directory
-        tool_files = [f for f in os.listdir(tools_dir) if f.endswith('.py')]
+    """List all tools in the tools directory and return their information.
 
+    Tool files are parsed, not imported, and their metadata is cached until they change.
+    """
+    try:
         tool_info = []
-        for file_name in tool_files:
-            module_name = file_name[:-3]  # Remove .py extension
-            file_path = os.path.join(tools_dir, file_name)
-
-            # Import the module
-            spec = importlib.util.spec_from_file_location(module_name, file_path)
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-
-                # Get all functions in the module
-                functions = inspect.getmembers(module, inspect.isfunction)
-                for func_name, func in functions:
-                    # Get the docstring and signature
-                    doc = inspect.getdoc(func) or 'No documentation available'
-                    sig = str(inspect.signature(func))
-
-                    # Convert function name to uppercase for tool name format
-                    tool_name = func_name.upper()
-                    tool_info.append(
-                        f"File: {file_name}\n"
-                        f"Tool: {tool_name}\n"
-                        f"Function: {func_name}{sig}\n"
-                        f"Documentation: {doc}"
-                    )
+        for file_name, entry in get_tool_manifest().items():
+            if 'error' in entry:
+                tool_info.append(f"File: {file_name}\nError: {entry['error']}")
+                continue
+
+            for function in entry['functions']:
+                # Convert function name to uppercase for tool name format
+                tool_name = function['name'].upper()
+                tool_info.append(
+                    f"File: {file_name}\n"
+                    f"Tool: {tool_name}\n"
+                    f"Function: {function['name']}{function['signature']}\n"
+                    f"Documentation: {function['doc']}"
+                )
 
         # Sort the tool_info list alphabetically
         tool_info.sort()
@@ -1,30 +1,49 @@
-import trafilatura
+from lib.documents import CHUNK_SIZE, DocumentError, format_document_preview, open_document
+from lib.web import ExtractionTimeout, FetchError, map_concurrently
 
-def open_url(caller_id: str, url: str) -> str:
-    """Open a URL and return its content as clean text using trafilatura.
+def open_url(caller_id: str, input_str: str) -> str:
+    """Open one or more URLs and return their content as clean text using trafilatura.
+
+    Several URLs are fetched concurrently through a shared connection pool. Pages and their
+    extracted text are cached on disk, see lib/http_cache.py. Text is extracted in worker processes,
+    with a time limit per page.
+
+    Documents longer than one chunk are not returned whole: the result is a size header, an
+    outline with the first line of every chunk, and the first chunk. The other chunks can be
+    read, or searched, with READ_URL_DOCUMENT.
 
     Args:
-        url: The URL to fetch and extract content from
+        input_str: A URL, or several URLs separated by § (url_1§url_2§...)
 
     Returns:
-        Clean text content from the URL, or error message if extraction fails
+        Clean text content from the URL (or its preview), or error message if extraction fails.
+        For several URLs, one section per URL in input order, each with its content or its error message.
 
     Raises:
         No exceptions are raised, errors are returned as strings
     """
-    try:
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded is None:
-            return f"Error: Could not download content from URL: {url}"
+    urls = [url.strip() for url in input_str.split('§') if url.strip()]
+    if len(urls) <= 1:
+        return _open_single_url(urls[0] if urls else input_str)
 
-        text = trafilatura.extract(downloaded)
-        if text is None:
-            return f"Error: Could not extract text content from URL: {url}"
+    results = map_concurrently(_open_single_url, urls)
+    return "\n\n".join(
+        f"=== URL {i}/{len(urls)}: {url} ===\n{result}"
+        for i, (url, result) in enumerate(zip(urls, results), 1)
+    )
 
-        return text
-    except trafilatura.exceptions.FetchError:
-        return f"Error: Could not fetch URL: {url}"
-    except trafilatura.exceptions.ProcessingError:
-        return f"Error: Could not process content from URL: {url}"
+def _open_single_url(url: str) -> str:
+    try:
+        text = open_document(url)
+    except FetchError as e:
+        return f"Error: Could not download content from URL: {url} ({str(e)})"
+    except ExtractionTimeout as e:
+        return f"Error: Could not process content from URL: {url} ({str(e)})"
+    except DocumentError as e:
+        return f"Error: {str(e)}"
     except Exception as e:
         return f"Unexpected error opening URL: {str(e)}"
+
+    if len(text) <= CHUNK_SIZE:
+        return text
+    return format_document_preview(url, text)
@@ -1,26 +1,41 @@
 from pathlib import Path
+import os
+from lib.run_log import read_byte_range, read_line_range, read_tail_lines, grep_log
+
+# Largest window returned in one call, so a single read cannot blow the caller's context budget
+MAX_WINDOW_BYTES = 64 * 1024
 
 def read_agent_run_log(caller_id: str, input_str: str) -> str:
-    """Read content of a run log file for a specific agent.
+    """Read content of a run log file for a specific agent, whole or through a window.
 
     Args:
-        input_str: String in format 'agent_name§log_file_name'
+        input_str: String in format 'agent_name§log_file_name§mode§mode_args...'
                    agent_name must match an existing agent
                    log_file_name is the name of the log file to read
+                   mode is optional:
+                   - (no mode): the whole file if it is at most 64 KiB, otherwise its first 64 KiB
+                   - bytes§start§length: length bytes from byte offset start
+                   - lines§first§last: lines first to last (1-based, inclusive)
+                   - tail§n: the last n lines, as many as fit in 64 KiB
+                   - grep§regex§context_lines§max_matches: lines matching regex with context_lines
+                     lines around them (default 0), at most max_matches matches (default 50)
 
     Returns:
-        Content of the log file
+        Content of the log file. Windowed reads start with a header line giving the file size
+        and the returned range, so the caller can page through the file.
 
     Raises:
         ValueError: If path tries to escape runs directory or input format is invalid
         FileNotFoundError: If file doesn't exist
     """
     parts = input_str.split('§')
-    if len(parts) != 2:
-        raise ValueError("Input must be in format 'agent_name§log_file_name'")
+    if len(parts) < 2:
+        raise ValueError("Input must be in format 'agent_name§log_file_name§mode§mode_args...'")
+
+    agent_name, log_file_name = parts[:2]
+    mode = parts[2].strip().lower() if len(parts) > 2 else ''
+    args = parts[3:]
 
-    agent_name, log_file_name = parts
-    
     base_path = Path(__file__).parent.parent.parent / "runs" / agent_name
     full_path = (base_path / log_file_name).resolve()
 
@@ -30,5 +45,52 @@ def read_agent_run_log(caller_id: str, input_str: str) -> str:
     if not full_path.exists():
         raise FileNotFoundError(f"Log file {log_file_name} for agent {agent_name} not found")
 
-    with open(full_path, 'r') as f:
-        return f.read()
+    size = os.path.getsize(full_path)
+    header = f"[Run log {log_file_name} | Size: {size} bytes"
+
+    if not mode:
+        if size <= MAX_WINDOW_BYTES:
+            with open(full_path, 'r') as f:
+                return f.read()
+        content = read_byte_range(full_path, 0, MAX_WINDOW_BYTES)
+        return f"{header} | Showing bytes 0-{MAX_WINDOW_BYTES} | Use the bytes, lines, tail or grep mode to read more]\n{content}"
+
+    if mode == 'bytes':
+        if len(args) != 2:
+            raise ValueError("Input must be in format 'agent_name§log_file_name§bytes§start§length'")
+        start = max(0, int(args[0]))
+        length = int(args[1])
+        if length <= 0:
+            raise ValueError("length must be positive")
+        length = min(length, MAX_WINDOW_BYTES)
+        content = read_byte_range(full_path, start, length)
+        end = max(start, min(size, start + length))
+        return f"{header} | Showing bytes {start}-{end}]\n{content}"
+
+    if mode == 'lines':
+        if len(args) != 2:
+            raise ValueError("Input must be in format 'agent_name§log_file_name§lines§first§last'")
+        first_line = max(1, int(args[0]))
+        last_line = int(args[1])
+        content, last_returned = read_line_range(str(full_path), first_line, last_line, MAX_WINDOW_BYTES)
+        return f"{header} | Showing lines {first_line}-{last_returned}]\n{content}"
+
+    if mode == 'tail':
+        if len(args) != 1:
+            raise ValueError("Input must be in format 'agent_name§log_file_name§tail§n'")
+        num_lines = int(args[0])
+        content, shown = read_tail_lines(full_path, num_lines, MAX_WINDOW_BYTES)
+        return f"{header} | Showing the last {shown} lines]\n{content}"
+
+    if mode == 'grep':
+        if not 1 <= len(args) <= 3:
+            raise ValueError("Input must be in format 'agent_name§log_file_name§grep§regex§context_lines§max_matches'")
+        context = int(args[1]) if len(args) > 1 and args[1].strip() else 0
+        max_matches = int(args[2]) if len(args) > 2 and args[2].strip() else 50
+        lines, matches = grep_log(full_path, args[0], context, max_matches)
+        content = "\n".join(lines)
+        if len(content) > MAX_WINDOW_BYTES:
+            content = content[:MAX_WINDOW_BYTES] + "\n[Output truncated, narrow the regex or lower max_matches]"
+        return f"{header} | {matches} matches for {args[0]}]\n{content}"
+
+    raise ValueError(f"Unknown mode '{mode}', expected one of: bytes, lines, tail, grep")
@@ -0,0 +1,19 @@
+from pathlib import Path
+from lib.files import read_files
+
+def read_files_in_agents_superfolder(caller_id: str, input_str: str) -> str:
+    """Read several files within the agents superfolder in one call.
+
+    Args:
+        input_str: Paths relative to the agents directory, in format 'file_path§file_path§...'
+
+    Returns:
+        One '=== FILE: file_path ===' line per file, followed by its content.
+        A file that cannot be read (missing, or escaping the agents directory) has 'Error: ...' as content.
+    """
+    file_paths = [path.strip() for path in input_str.split('§') if path.strip()]
+    if not file_paths:
+        raise ValueError("Input must be in format 'file_path§file_path§...'")
+
+    base_path = Path(__file__).parent.parent.parent / "agents"
+    return read_files(base_path, file_paths, "agents")
@@ -0,0 +1,28 @@
+from pathlib import Path
+from lib.files import read_files
+
+def read_files_in_scenarios_folder(caller_id: str, input_str: str) -> str:
+    """Read several files within the scenarios directory of an agent in one call.
+
+    Args:
+        input_str: String in format 'agent_name§file_path§file_path§...'
+                   file_paths are relative to the scenarios/agent_name directory
+
+    Returns:
+        One '=== FILE: file_path ===' line per file, followed by its content.
+        A file that cannot be read (missing, or escaping the directory) has 'Error: ...' as content.
+
+    Raises:
+        ValueError: If input format is invalid or agent_name doesn't match an existing agent subfolder
+    """
+    agent_name, *file_paths = [part.strip() for part in input_str.split('§')]
+    file_paths = [path for path in file_paths if path]
+    if not agent_name or not file_paths:
+        raise ValueError("Input must be in format 'agent_name§file_path§file_path§...'")
+
+    agents_dir = Path(__file__).parent.parent.parent / "agents"
+    if not (agents_dir / agent_name).is_dir():
+        raise ValueError(f"Agent '{agent_name}' does not exist in agents directory")
+
+    base_path = Path(__file__).parent.parent.parent / "scenarios" / agent_name
+    return read_files(base_path, file_paths, f"scenarios/{agent_name}")
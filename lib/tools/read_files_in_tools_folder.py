@@ -0,0 +1,18 @@
+from pathlib import Path
+from lib.files import read_files
+
+def read_files_in_tools_folder(caller_id: str, input_str: str) -> str:
+    """Read several files within the tools directory in one call.
+
+    Args:
+        input_str: Paths relative to the tools directory, in format 'file_path§file_path§...'
+
+    Returns:
+        One '=== FILE: file_path ===' line per file, followed by its content.
+        A file that cannot be read (missing, or escaping the tools directory) has 'Error: ...' as content.
+    """
+    file_paths = [path.strip() for path in input_str.split('§') if path.strip()]
+    if not file_paths:
+        raise ValueError("Input must be in format 'file_path§file_path§...'")
+
+    return read_files(Path(__file__).parent, file_paths, "tools")
@@ -0,0 +1,50 @@
+from lib.documents import DocumentError, format_chunk, get_document, search_document, split_into_chunks
+from lib.web import ExtractionTimeout, FetchError
+
+def read_url_document(caller_id: str, input_str: str) -> str:
+    """Read one chunk of a document opened with OPEN_URL, or search inside it.
+
+    The document's text is kept from when OPEN_URL read it, so this does not download the page again
+    and the chunk numbers stay those OPEN_URL reported, even if the page has changed since.
+
+    Args:
+        input_str: String in format 'url§chunk§N' to read chunk N (1-based),
+                   or 'url§search§query' to list the lines (with their chunk numbers) that best match query
+
+    Returns:
+        The chunk with a header giving its position, or the matching lines, or an error message
+
+    Raises:
+        No exceptions are raised, errors are returned as strings
+    """
+    parts = input_str.split('§')
+    if len(parts) != 3 or parts[1].strip().lower() not in ('chunk', 'search'):
+        return "Error: Input must be in format 'url§chunk§N' or 'url§search§query'"
+    url, mode, argument = parts[0].strip(), parts[1].strip().lower(), parts[2].strip()
+
+    try:
+        text = get_document(url)
+    except FetchError as e:
+        return f"Error: Could not download content from URL: {url} ({str(e)})"
+    except ExtractionTimeout as e:
+        return f"Error: Could not process content from URL: {url} ({str(e)})"
+    except DocumentError as e:
+        return f"Error: {str(e)}"
+
+    chunks = split_into_chunks(text)
+
+    if mode == 'chunk':
+        try:
+            chunk_number = int(argument)
+        except ValueError:
+            return f"Error: Chunk number must be an integer, got '{argument}'"
+        if not 1 <= chunk_number <= len(chunks):
+            return f"Error: Chunk {chunk_number} does not exist, the document has {len(chunks)} chunks"
+        return format_chunk(url, chunks, chunk_number)
+
+    hits = search_document(chunks, argument)
+    if not hits:
+        return f"No lines matching '{argument}' in the document ({len(chunks)} chunks)."
+    lines = [f"[Document {url} | {len(hits)} best matching lines for '{argument}' | {len(chunks)} chunks]"]
+    lines.extend(f"  Chunk {chunk_number}: {snippet}" for chunk_number, snippet in hits)
+    return "\n".join(lines)
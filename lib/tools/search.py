@@ -1,52 +1,68 @@
-from serpapi import GoogleSearch
 import os
+from lib.agent import get_agent_config_by_id
+from lib.search import SearchError, format_results, normalize_url, run_search
+from lib.web import map_concurrently
 
 def search(caller_id: str, input_str: str) -> str:
-    """Execute a Google search using SerpAPI. Only returns URLs, no other text.
+    """Execute one or more Google searches using SerpAPI. Only returns URLs, no other text.
+
+    Several queries are run concurrently, and URLs already returned for an earlier query are
+    left out of the results of later ones. Results are cached on disk, see lib/search.py.
+    The calling agent's "search_backend" config (or AGENT_SEARCH_BACKEND) can make SEARCH use
+    the pages already opened with OPEN_URL instead of, or next to, SerpAPI.
 
     Args:
-        input_str: String in format 'query§max_results'. max_results is optional, defaults to all results.
+        input_str: String in format 'query§max_results' or 'query_1§query_2§...§max_results'.
+                   max_results is optional, defaults to all results. It applies to each query.
 
     Returns:
         Formatted string containing search results with title, URL, and description
-        Each result is separated by newlines
+        Each result is separated by newlines. For several queries, one section per query in input order.
 
     Raises:
         No exceptions are raised, errors are returned as strings
     """
-    try:
-        # Split on the first occurrence of § only
-        # This ensures we correctly handle cases where the query itself contains §
-        parts = input_str.split('§', 1)
-        query = parts[0]
-        max_results = int(parts[1]) if len(parts) > 1 else None
-
-        serpapi_key = os.environ.get("SERPAPI_API_KEY")
-        if not serpapi_key:
-            return "Error: SerpAPI key not found in environment variables"
-
-        params = {
-            "q": query,
-            "api_key": serpapi_key
-        }
-        if max_results is not None:
-            params["num"] = max_results
-
-        search = GoogleSearch(params)
-        results = search.get_dict()
-
-        # Format organic search results
-        if "organic_results" not in results:
-            return "No results found."
-
-        formatted_results = []
-        for result in results["organic_results"]:
-            title = result.get("title", "No title")
-            link = result.get("link", "No link")
-            snippet = result.get("snippet", "No description")
-            formatted_results.append(f"Title: {title}\nURL: {link}\nDescription: {snippet}\n")
-
-        return "\n".join(formatted_results)
-
-    except Exception as e:
-        return f"Search error: {str(e)}"
+    parts = [part.strip() for part in input_str.split('§')]
+    max_results = None
+    if len(parts) > 1 and parts[-1].isdigit():
+        max_results = int(parts.pop())
+    queries = [part for part in parts if part]
+    if not queries:
+        return "Search error: No query given"
+
+    config = get_agent_config_by_id(caller_id) or {}
+    backend = config.get('search_backend') or os.environ.get('AGENT_SEARCH_BACKEND', 'serpapi')
+
+    def run_query(query: str):
+        try:
+            return run_search(query, max_results, backend)
+        except (SearchError, ValueError) as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            return f"Search error: {str(e)}"
+
+    query_results = map_concurrently(run_query, queries)
+    if len(queries) == 1:
+        results = query_results[0]
+        if isinstance(results, str):
+            return results
+        return format_results(results) if results else "No results found."
+
+    seen_urls = set()
+    sections = []
+    for i, (query, results) in enumerate(zip(queries, query_results), 1):
+        if isinstance(results, str):
+            body = results
+        elif not results:
+            body = "No results found."
+        else:
+            new_results = []
+            for result in results:
+                url = normalize_url(result['link'])
+                if url not in seen_urls:
+                    seen_urls.add(url)
+                    new_results.append(result)
+            body = format_results(new_results) if new_results else "No new results, all URLs were returned for an earlier query."
+        sections.append(f"=== QUERY {i}/{len(queries)}: {query} ===\n{body}")
+
+    return "\n\n".join(sections)
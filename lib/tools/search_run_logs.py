@@ -0,0 +1,67 @@
+import os
+import sqlite3
+from lib.log_search import search_logs
+from lib.tool_input import parse_options
+
+def search_run_logs(caller_id: str, input_str: str) -> str:
+    """Full-text search across all run logs in runs/ and all chat files in chats/.
+
+    The search index is updated incrementally before every search, so runs that are still
+    being logged are searchable too.
+
+    Args:
+        caller_id: ID of the calling agent
+        input_str: String in format 'query§option=value§...'
+                   query is a list of words that must all appear in a log line
+                   Options (all optional):
+                   - run=AGENT_NAME or run=AGENT_NAME/RUN_LOG_NAME: only search the run logs of this agent / this run
+                   - source=runs or source=chats: only search run logs / chat files
+                   - agent=AGENT_ID: only search lines logged by this agent
+                   - limit=N: maximum number of hits (default 20)
+                   - syntax=fts: treat the query as an SQLite FTS5 query (OR, NOT, "phrases", prefix*)
+
+    Returns:
+        Ranked hits, best first, with run log, line number, agent ID, iteration and a snippet
+    """
+    try:
+        parts = input_str.split('§')
+        query = parts[0].strip()
+        if not query:
+            return "Error: Input must be in format 'query§option=value§...'"
+        options = parse_options(parts[1:])
+
+        path_prefix = None
+        if 'run' in options:
+            path_prefix = os.path.join('runs', options['run'])
+        elif options.get('source') in ('runs', 'chats'):
+            path_prefix = options['source'] + os.sep
+
+        hits = search_logs(
+            query,
+            limit=int(options.get('limit', 20)),
+            path_prefix=path_prefix,
+            agent_id=options.get('agent'),
+            raw_query=options.get('syntax') == 'fts',
+        )
+    except sqlite3.OperationalError as e:
+        return f"Error: Invalid search query: {str(e)}"
+    except ValueError as e:
+        return f"Error: {str(e)}"
+
+    if not hits:
+        return f"No matches found for '{query}'."
+
+    output = [f"=== {len(hits)} MATCHES FOR '{query}' (BEST FIRST) ===\n\n"]
+    for i, hit in enumerate(hits, 1):
+        path = hit['path']
+        if path.startswith('runs' + os.sep):
+            # Shown as agent_name§log_file_name, ready to pass to the other run log tools
+            location = path[len('runs' + os.sep):].replace(os.sep, '§', 1)
+        else:
+            location = path
+        agent_info = f" {hit['agent_id']}" if hit['agent_id'] else ""
+        iteration_info = f" [Agent Iterations {hit['iteration']}]" if hit['iteration'] is not None else ""
+        output.append(f"{i}. {location} [Line {hit['line_num']}]{agent_info}{iteration_info}\n")
+        output.append(f"   {hit['snippet']}\n\n")
+
+    return "".join(output)
@@ -4,6 +4,7 @@ import time
 import logging
 import threading
 import json
+from typing import Tuple
 from lib.agent import create_agent
 
 # Store last content per agent communication channel
@@ -31,22 +32,11 @@ def spawn_subagent(caller_id: str, input_str: str) -> str:
         raise ValueError(f"Invalid input format. Expected 'agent_name§manifesto_name', got '{input_str}'")
 
     agent_name, manifesto_name = parts
-
-    agents_dir = Path(__file__).parent.parent.parent / "agents"
-    agent_dir = agents_dir / agent_name
-    config_file = agent_dir / "config.json"
-
-    if not config_file.exists():
-        raise ValueError(f"Agent config for {agent_name} not found")
-
-    # Load the agent config
-    with open(config_file, 'r') as f:
-        config = json.load(f)
+    config, manifesto_file = load_subagent_spec(agent_name, manifesto_name)
 
     # Create the agent instance
     try:
         # Load manifesto
-        manifesto_file = agent_dir / "manifestos" / f"{manifesto_name}.txt"
         if not manifesto_file.exists():
             raise ValueError(f"Manifesto '{manifesto_name}' not found for agent {agent_name}. (Note: remember not to include .txt extension for the manifesto name)")
 
@@ -134,3 +124,27 @@ def spawn_subagent(caller_id: str, input_str: str) -> str:
         return agent.id  # Return unique ID for this agent instance
     except Exception as e:
         raise ValueError(f"Failed to create agent instance: {str(e)}")
+
+def load_subagent_spec(agent_name: str, manifesto_name: str) -> Tuple[dict, Path]:
+    """Load the config of an agent and locate one of its manifesto files.
+
+    Args:
+        agent_name (str): Name of the agent folder in agents/
+        manifesto_name (str): Name of the manifesto file, without the .txt extension
+
+    Returns:
+        Tuple[dict, Path]: The parsed config.json and the path to the manifesto file
+
+    Raises:
+        ValueError: If the agent config is not found
+    """
+    agent_dir = Path(__file__).parent.parent.parent / "agents" / agent_name
+    config_file = agent_dir / "config.json"
+
+    if not config_file.exists():
+        raise ValueError(f"Agent config for {agent_name} not found")
+
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+
+    return config, agent_dir / "manifestos" / f"{manifesto_name}.txt"
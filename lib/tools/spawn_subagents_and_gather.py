@@ -0,0 +1,144 @@
+from pathlib import Path
+import time
+import logging
+import threading
+from lib.agent import create_agent
+from lib.tools.spawn_subagent import load_subagent_spec
+
+# Answer given to any ASK_USER after the initial input has been handed out
+NO_FURTHER_INPUT_MESSAGE = "No further input will be provided. Complete the task on your own, TELL_USER the final output, then END_RUN."
+
+def spawn_subagents_and_gather(caller_id: str, input_str: str) -> str:
+    """Spawn one subagent per input, run them concurrently and gather their final TELL_USER outputs.
+
+    Every subagent is created from the same agent/manifesto spec. The first ASK_USER of each
+    subagent is answered with its initial input; later ASK_USER calls are told that no further
+    input will be provided. Subagents still running when the timeout is reached are asked to stop
+    after their current iteration, and whatever they have told so far is returned as a partial result.
+
+    Args:
+        caller_id (str): The ID of the caller
+        input_str (str): String in format 'agent_name§manifesto_name§timeout_seconds§input_1§input_2§...'
+                         The manifesto file must exist at agents/{agent_name}/manifestos/{manifesto_name}.txt
+                         timeout_seconds may be empty to use the default of 600 seconds.
+                         Inputs cannot contain §.
+
+    Returns:
+        str: One section per subagent, in input order, with its agent ID, status, input and final output
+
+    Raises:
+        ValueError: If input format is invalid, agent not found, or manifesto not found
+    """
+    parts = input_str.split("§")
+    if len(parts) < 4:
+        raise ValueError("Input must be in format 'agent_name§manifesto_name§timeout_seconds§input_1§input_2§...'")
+
+    agent_name, manifesto_name, timeout_str = parts[:3]
+    inputs = parts[3:]
+
+    try:
+        timeout = float(timeout_str) if timeout_str.strip() else 600.0
+    except ValueError:
+        raise ValueError(f"timeout_seconds must be a number, got '{timeout_str}'")
+
+    config, manifesto_file = load_subagent_spec(agent_name, manifesto_name)
+    if not manifesto_file.exists():
+        raise ValueError(f"Manifesto '{manifesto_name}' not found for agent {agent_name}. (Note: remember not to include .txt extension for the manifesto name)")
+    manifesto = manifesto_file.read_text()
+
+    chats_dir = Path(__file__).parent.parent.parent / 'chats'
+    chats_dir.mkdir(exist_ok=True)
+
+    runs = []
+    for initial_input in inputs:
+        run = {
+            'input': initial_input,
+            'outputs': [],
+            'error': None,
+            'start_time': time.time(),
+            'end_time': None,
+        }
+        run['agent'] = _create_gathered_agent(caller_id, config, manifesto, chats_dir, run)
+        runs.append(run)
+
+    # Start all agents before waiting on any of them, so they run concurrently
+    threads = []
+    for run in runs:
+        thread = threading.Thread(target=_run_gathered_agent, args=(run,), daemon=True)
+        thread.start()
+        threads.append(thread)
+        logging.info(f"Subagent {run['agent'].id} started in background thread")
+
+    deadline = time.time() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.time()))
+
+    sections = []
+    for i, (run, thread) in enumerate(zip(runs, threads), 1):
+        agent = run['agent']
+        if thread.is_alive():
+            # Stop the straggler after its current iteration so it does not keep calling the LLM
+            agent.ended = True
+            status = f"timed out after {timeout:.0f}s (partial result)"
+        elif run['error']:
+            status = f"failed after {run['end_time'] - run['start_time']:.1f}s: {run['error']}"
+        else:
+            status = f"completed in {run['end_time'] - run['start_time']:.1f}s"
+
+        output = run['outputs'][-1] if run['outputs'] else "[No TELL_USER output]"
+        sections.append(
+            f"=== SUBAGENT {i}/{len(runs)}: {agent.id} ===\n"
+            f"Status: {status}\n"
+            f"Input: {run['input']}\n"
+            f"Output: {output}"
+        )
+
+    return "\n\n".join(sections)
+
+def _create_gathered_agent(caller_id: str, config: dict, manifesto: str, chats_dir: Path, run: dict):
+    """Create a subagent whose user is the initial input of the run, and record what it tells."""
+    agent = create_agent(
+        config=config,
+        manifesto=manifesto,
+        memory=""
+    )
+
+    # Keep the chat files so the exchange can be inspected like any other subagent
+    caller_to_agent = chats_dir / f"{caller_id}_to_{agent.id}.txt"
+    agent_to_caller = chats_dir / f"{agent.id}_to_{caller_id}.txt"
+    caller_to_agent.touch()
+    agent_to_caller.touch()
+
+    pending_input = [run['input']]
+
+    def tell_user(agent_id: str, message: str) -> str:
+        with open(agent_to_caller, 'a') as f:
+            f.write(f"{message}\n")
+        run['outputs'].append(message)
+        agent.logger.debug(f"[SUBAGENT_TELL_USER] {message}")
+        return ""
+
+    def ask_user(agent_id: str, message: str) -> str:
+        with open(agent_to_caller, 'a') as f:
+            f.write(f"{message}\n")
+        agent.logger.debug(f"[SUBAGENT_ASK_USER] {message}")
+
+        response = pending_input.pop() if pending_input else NO_FURTHER_INPUT_MESSAGE
+        with open(caller_to_agent, 'a') as f:
+            f.write(f"{response}\n")
+        agent.logger.info(f"[PARENT_RESPONSE] {response}")
+        return response
+
+    agent.tell_user = tell_user
+    agent.ask_user = ask_user
+    return agent
+
+def _run_gathered_agent(run: dict) -> None:
+    agent = run['agent']
+    try:
+        agent.run()
+    except Exception as e:
+        run['error'] = str(e)
+        agent.logger.error(f"Agent thread error: {str(e)}")
+    finally:
+        run['end_time'] = time.time()
@@ -1,5 +1,5 @@
 from pathlib import Path
-import os
+from lib.files import write_file_atomic
 
 def write_file_in_scenarios_folder(caller_id: str, input_str: str) -> str:
     """Write content in a file within the scenarios directory.
@@ -36,8 +36,7 @@ def write_file_in_scenarios_folder(caller_id: str, input_str: str) -> str:
     if not str(full_path).startswith(str(base_path)):
         raise ValueError(f"Path {file_path} attempts to escape scenarios/{agent_name} directory")
 
-    os.makedirs(os.path.dirname(full_path), exist_ok=True)
-    with open(full_path, 'w') as f:
-        f.write(content)
+    # Write through a temporary file so concurrent readers never see a partial file
+    write_file_atomic(str(full_path), content)
 
     return ''
@@ -0,0 +1,25 @@
+from pathlib import Path
+from lib.files import parse_file_blocks, write_files
+
+def write_files_in_agents_superfolder(caller_id: str, input_str: str) -> str:
+    """Write several files within the agents superfolder in one call.
+
+    Each file is written atomically (temporary file, then rename), so other agents never read a
+    partially written config or manifesto.
+
+    Args:
+        input_str: One block per file, each a '=== FILE: file_path ===' line followed by the content:
+                   === FILE: my_agent/config.json ===
+                   {...}
+                   === FILE: my_agent/manifestos/default_manifesto.txt ===
+                   ...
+
+    Returns:
+        A summary line, then one line per file saying it was written or why it failed
+
+    Raises:
+        ValueError: If input format is invalid
+    """
+    files = parse_file_blocks(input_str)
+    base_path = Path(__file__).parent.parent.parent / "agents"
+    return write_files(base_path, files, "agents")
@@ -0,0 +1,38 @@
+from pathlib import Path
+from lib.files import parse_file_blocks, write_files
+
+def write_files_in_scenarios_folder(caller_id: str, input_str: str) -> str:
+    """Write several scenario files for an agent in one call.
+
+    Each file is written atomically (temporary file, then rename), so an agent running scenarios
+    never reads a partially written one.
+
+    Args:
+        input_str: String in format 'agent_name§' followed by one block per file, each a
+                   '=== FILE: file_path ===' line followed by the content:
+                   my_agent§
+                   === FILE: scenario_1.txt ===
+                   ...
+                   === FILE: scenario_2.txt ===
+                   ...
+                   file_paths are relative to the scenarios/agent_name directory
+
+    Returns:
+        A summary line, then one line per file saying it was written or why it failed
+
+    Raises:
+        ValueError: If input format is invalid or agent_name doesn't match an existing agent subfolder
+    """
+    # Split on the first occurrence of § only, file contents may contain §
+    parts = input_str.split('§', 1)
+    if len(parts) != 2:
+        raise ValueError("Input must be in format 'agent_name§=== FILE: file_path ===\\ncontent...'")
+
+    agent_name, files_text = parts[0].strip(), parts[1]
+    agents_dir = Path(__file__).parent.parent.parent / "agents"
+    if not agent_name or not (agents_dir / agent_name).is_dir():
+        raise ValueError(f"Agent '{agent_name}' does not exist in agents directory")
+
+    files = parse_file_blocks(files_text)
+    base_path = Path(__file__).parent.parent.parent / "scenarios" / agent_name
+    return write_files(base_path, files, f"scenarios/{agent_name}")
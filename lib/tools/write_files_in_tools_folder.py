@@ -0,0 +1,20 @@
+from pathlib import Path
+from lib.files import parse_file_blocks, write_files
+
+def write_files_in_tools_folder(caller_id: str, input_str: str) -> str:
+    """Write several files within the tools directory in one call.
+
+    Each file is written atomically (temporary file, then rename), so an agent loading tools never
+    reads a partially written one.
+
+    Args:
+        input_str: One block per file, each a '=== FILE: file_path ===' line followed by the content
+
+    Returns:
+        A summary line, then one line per file saying it was written or why it failed
+
+    Raises:
+        ValueError: If input format is invalid
+    """
+    files = parse_file_blocks(input_str)
+    return write_files(Path(__file__).parent, files, "tools")
@@ -0,0 +1,234 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import urllib3
+
+# Shared by all agents of the process, so connections (and their TLS sessions) to a host are reused
+# across OPEN_URL calls. At most MAX_CONNECTIONS_PER_HOST requests run against one host at a time;
+# further requests to that host wait for a free connection instead of opening more.
+MAX_CONNECTIONS_PER_HOST = 4
+MAX_HOSTS = 32
+MAX_CONCURRENT_FETCHES = 8
+DEFAULT_TIMEOUT_SECONDS = 30.0
+MAX_DOWNLOAD_BYTES = 20 * 1024 * 1024
+# Failed attempts (connection errors and these statuses) are retried with exponential backoff, as long as
+# the URL's timeout leaves time for it: the timeout bounds the whole download, retries included
+MAX_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_HEADERS = urllib3.util.make_headers(accept_encoding=True, user_agent="Mozilla/5.0 (compatible; agent-framework OPEN_URL)")
+
+_pool_manager: Optional[urllib3.PoolManager] = None
+_pool_manager_lock = threading.Lock()
+
+# Text extraction is CPU-bound, so it runs in a small pool of worker processes instead of on the
+# agent threads, where it would hold the GIL. A slot is taken before a worker is, so the time limit
+# only counts the extraction itself, not the wait for a free worker. Input beyond the size cap is cut off.
+# A running extraction cannot be interrupted (it may be stuck in C code), so a worker that exceeds the
+# time limit is terminated and replaced by a fresh one on demand; there are never more than
+# EXTRACTION_WORKERS worker processes.
+EXTRACTION_WORKERS = min(4, os.cpu_count() or 1)
+EXTRACTION_TIMEOUT_SECONDS = 30.0
+MAX_EXTRACTION_INPUT_BYTES = 5 * 1024 * 1024
+
+_idle_extraction_workers: List['ExtractionWorker'] = []
+_idle_extraction_workers_lock = threading.Lock()
+_extraction_slots = threading.BoundedSemaphore(EXTRACTION_WORKERS)
+
+class FetchError(Exception):
+    """Raised when a URL cannot be downloaded."""
+
+class ExtractionTimeout(Exception):
+    """Raised when extracting the text of a document takes longer than its time limit."""
+
+def get_pool_manager() -> urllib3.PoolManager:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool_manager
+    with _pool_manager_lock:
+        if _pool_manager is None:
+            _pool_manager = urllib3.PoolManager(
+                num_pools=MAX_HOSTS,
+                maxsize=MAX_CONNECTIONS_PER_HOST,
+                block=True,
+                headers=DEFAULT_HEADERS,
+                # Only redirects are followed by urllib3, request_url retries within its deadline
+                retries=urllib3.Retry(total=None, connect=0, read=0, other=0, status=0, redirect=5),
+            )
+        return _pool_manager
+
+def request_url(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> Tuple[int, Dict[str, str], bytes]:
+    """GET a URL through the shared connection pool and return (status, response headers with lowercase names, body).
+
+    timeout bounds the whole download: waiting for a free connection to the host, connecting, retries and
+    reading the body. Bodies larger than MAX_DOWNLOAD_BYTES are rejected. Besides 2xx, a 304 Not Modified
+    answer to a conditional request is returned as is.
+
+    Raises:
+        FetchError: If the URL cannot be downloaded in time or the server answers with another status
+    """
+    deadline = time.monotonic() + timeout
+    for attempt in range(MAX_RETRIES + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise FetchError(f"No complete response within {timeout:g}s")
+        try:
+            response = get_pool_manager().request(
+                "GET", url,
+                headers={**DEFAULT_HEADERS, **(headers or {})},
+                timeout=urllib3.Timeout(total=remaining),
+                pool_timeout=remaining,
+                preload_content=False,
+            )
+        except urllib3.exceptions.EmptyPoolError as e:
+            raise FetchError(f"No free connection to the host within {timeout:g}s") from e
+        except urllib3.exceptions.MaxRetryError as e:
+            # Too many redirects, or a connection error (urllib3 does not retry those itself)
+            if isinstance(e.reason, urllib3.exceptions.ResponseError) or not _sleep_before_retry(attempt, deadline):
+                raise FetchError(str(e.reason or e)) from e
+            continue
+        except (urllib3.exceptions.HTTPError, ValueError) as e:
+            raise FetchError(str(e)) from e
+
+        complete = False
+        try:
+            if response.status in RETRY_STATUSES and _sleep_before_retry(attempt, deadline):
+                continue
+            if response.status != 304 and not 200 <= response.status < 300:
+                raise FetchError(f"HTTP {response.status}")
+            chunks = []
+            size = 0
+            # read1 returns what has arrived, so a server that trickles bytes cannot hold a read past the deadline
+            while chunk := response.read1(64 * 1024):
+                size += len(chunk)
+                if size > MAX_DOWNLOAD_BYTES:
+                    raise FetchError(f"Response larger than {MAX_DOWNLOAD_BYTES} bytes")
+                if time.monotonic() > deadline:
+                    raise FetchError(f"No complete response within {timeout:g}s")
+                chunks.append(chunk)
+            complete = True
+            return response.status, {name.lower(): value for name, value in response.headers.items()}, b"".join(chunks)
+        except urllib3.exceptions.HTTPError as e:
+            raise FetchError(str(e)) from e
+        finally:
+            if not complete:
+                # The rest of the response is still on the connection, it cannot be reused
+                response.close()
+            response.release_conn()
+
+def _sleep_before_retry(attempt: int, deadline: float) -> bool:
+    """Wait the backoff of a retry and return True, or return False if no retry is left or it would pass the deadline."""
+    backoff = RETRY_BACKOFF_SECONDS * 2 ** attempt
+    if attempt >= MAX_RETRIES or time.monotonic() + backoff >= deadline:
+        return False
+    time.sleep(backoff)
+    return True
+
+def fetch_url(url: str, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> bytes:
+    """Download a URL through the shared connection pool and return the response body.
+
+    Raises:
+        FetchError: If the URL cannot be downloaded or the server does not answer with a 2xx status
+    """
+    return request_url(url, timeout=timeout)[2]
+
+def map_concurrently(function: Callable[[str], str], items: List[str], max_workers: int = MAX_CONCURRENT_FETCHES) -> List[str]:
+    """Apply function to every item from a thread pool and return the results in input order."""
+    if len(items) == 1:
+        return [function(items[0])]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(function, items))
+
+class ExtractionWorker:
+    """A worker process that runs one task at a time, sent over a pipe, and can be terminated while it runs."""
+    def __init__(self):
+        # Spawned rather than forked, since the parent runs agent and log writer threads. Daemonic, so
+        # the worker is terminated when the parent exits.
+        context = multiprocessing.get_context('spawn')
+        self.connection, worker_connection = context.Pipe()
+        self.process = context.Process(target=_extraction_worker_loop, args=(worker_connection,), daemon=True)
+        self.process.start()
+        worker_connection.close()
+
+    def run(self, function: Callable[[Any], Any], argument: Any, timeout: float) -> Any:
+        """Run function(argument) in the worker and return its result, or raise the exception it raised.
+
+        Raises:
+            ExtractionTimeout: If it takes longer than timeout seconds; the worker is then terminated
+            RuntimeError: If the worker exits while running it
+        """
+        self.connection.send((function, argument))
+        if not self.connection.poll(timeout):
+            self.stop()
+            raise ExtractionTimeout(f"Text extraction took longer than {timeout:g}s")
+        try:
+            succeeded, value = self.connection.recv()
+        except (EOFError, OSError):
+            self.stop()
+            raise RuntimeError(f"Text extraction worker exited unexpectedly (exit code {self.process.exitcode})")
+        if not succeeded:
+            raise value
+        return value
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+def _extraction_worker_loop(connection) -> None:
+    while True:
+        try:
+            function, argument = connection.recv()
+        except EOFError:
+            return
+        try:
+            result = (True, function(argument))
+        except Exception as e:
+            result = (False, e)
+        try:
+            connection.send(result)
+        except Exception:
+            # The exception could not be pickled
+            connection.send((False, RuntimeError(f"{type(result[1]).__name__}: {str(result[1])}")))
+
+def run_in_extraction_worker(function: Callable[[Any], Any], argument: Any, timeout: float) -> Any:
+    """Run function(argument) on a free extraction worker, with a time limit, and return its result.
+
+    function must be a module-level function, so it can be sent to the worker process.
+
+    Raises:
+        ExtractionTimeout: If it takes longer than timeout seconds; its worker is then terminated
+    """
+    with _extraction_slots:
+        with _idle_extraction_workers_lock:
+            worker = _idle_extraction_workers.pop() if _idle_extraction_workers else None
+        if worker is None or not worker.process.is_alive():
+            worker = ExtractionWorker()
+        try:
+            return worker.run(function, argument, timeout)
+        finally:
+            # Workers terminated because of a timeout or crash are not reused
+            if worker.process.is_alive():
+                with _idle_extraction_workers_lock:
+                    _idle_extraction_workers.append(worker)
+
+def _extract_in_worker(html: bytes) -> Optional[str]:
+    import trafilatura
+    return trafilatura.extract(html)
+
+def extract_text(html: bytes, timeout: float = EXTRACTION_TIMEOUT_SECONDS) -> Optional[str]:
+    """Extract the main text of an HTML document with trafilatura in a worker process.
+
+    Returns:
+        The text, or None if trafilatura found no main text
+
+    Raises:
+        ExtractionTimeout: If extraction takes longer than timeout seconds. Its worker is then terminated.
+    """
+    return run_in_extraction_worker(_extract_in_worker, html[:MAX_EXTRACTION_INPUT_BYTES], timeout)
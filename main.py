@@ -4,20 +4,150 @@ import os
 import sys
 import importlib.util
 import secrets
-from typing import Type, List, Tuple, Optional, Dict, Any, TextIO
+from typing import Type, List, Tuple, Optional, Dict, Any, TextIO, BinaryIO, Callable
 import datetime
+import json
 import logging
+import queue
+import signal
+import threading
+import time
+import traceback
+from lib.run_log import get_structured_log_paths, notify_log_flushed
 
 _first_agent_id = None
 GREY_TEXT_COLOR = "\033[90m"
 WHITE_TEXT_COLOR = "\033[97m"
 
+class BufferedLogWriter:
+    """Writes to a file from a background thread, in batches.
+
+    write() only queues the data. The writer thread flushes the file every flush_interval seconds
+    or once flush_bytes have been written, whichever comes first, then calls on_flush if given.
+    close() drains the queue and fsyncs the file. Errors in the writer thread are reported on stderr
+    and do not stop it; once it has stopped, write() writes to the file directly.
+    """
+    def __init__(self, file, flush_interval: float = 1.0, flush_bytes: int = 64 * 1024, on_flush: Optional[Callable[[], None]] = None):
+        self.file = file
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.on_flush = on_flush
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._sync_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._write_loop, name="run-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, data) -> None:
+        self._queue.put(data)
+        if not self._thread.is_alive():
+            self._write_synchronously()
+
+    def _write_synchronously(self) -> None:
+        """Write whatever is still queued to the file from the calling thread."""
+        with self._sync_lock:
+            written = False
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is not None:
+                    self.file.write(item)
+                    written = True
+            if written:
+                self.file.flush()
+                if self.on_flush:
+                    self.on_flush()
+
+    def _write_loop(self):
+        """Write queued data to the file in batches until close() is called."""
+        unflushed_bytes = 0
+        last_flush_time = time.monotonic()
+        while True:
+            # Wait for the next item, but wake up in time for a pending time-based flush
+            wait = max(0.0, self.flush_interval - (time.monotonic() - last_flush_time)) if unflushed_bytes else None
+            try:
+                items = [self._queue.get(timeout=wait)]
+            except queue.Empty:
+                items = []
+            # Drain whatever else is already queued into the same batch
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = []
+            flush_requests = []
+            stop = False
+            for item in items:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    flush_requests.append(item)
+                else:
+                    batch.append(item)
+
+            # A failing write or on_flush (disk full, closed file) loses this batch but must not end the thread
+            try:
+                if batch:
+                    data = batch[0][:0].join(batch)
+                    unflushed_bytes += len(data)
+                    self.file.write(data)
+
+                if stop or flush_requests or unflushed_bytes >= self.flush_bytes or (
+                        unflushed_bytes and time.monotonic() - last_flush_time >= self.flush_interval):
+                    unflushed_bytes = 0
+                    last_flush_time = time.monotonic()
+                    self.file.flush()
+                    if self.on_flush:
+                        self.on_flush()
+            except Exception:
+                print(f"Error writing {getattr(self.file, 'name', 'log file')}:\n{traceback.format_exc()}", file=sys.stderr)
+
+            for event in flush_requests:
+                event.set()
+            if stop:
+                return
+
+    def flush(self):
+        if self._thread.is_alive():
+            # Wait until everything queued so far has been written and flushed
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait(5)
+        elif not self.file.closed:
+            self._write_synchronously()
+            self.file.flush()
+
+    def close(self):
+        """Write out all queued data and fsync the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        if not self.file.closed:
+            # Anything written while the thread was stopping is still queued
+            self._write_synchronously()
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
 class StreamingLogger(logging.Handler):
-    """Logger that writes to both file and stdout in real-time."""
-    def __init__(self, log_file: TextIO):
+    """Logger that writes to stdout in real-time and to the run log file through a BufferedLogWriter.
+
+    Terminal output stays synchronous so it interleaves correctly with ASK_USER prompts,
+    only the run log file I/O is moved off the agent threads.
+    """
+    def __init__(self, log_file: TextIO, flush_interval: float = 1.0, flush_bytes: int = 64 * 1024):
         super().__init__()
         self.terminal = sys.stdout
         self.log_file = log_file
+        # Wake up tools following this run log in the same process as soon as new lines hit the file
+        self.writer = BufferedLogWriter(log_file, flush_interval, flush_bytes, on_flush=notify_log_flushed)
         self.setFormatter(logging.Formatter('%(name)s - %(message)s'))
         # Cache for agent colors
         self.agent_colors = {}
@@ -85,17 +215,65 @@ class StreamingLogger(logging.Handler):
             self.terminal.flush()
 
         # Always write to log file regardless of level
-        self.log_file.write(f"{record.name} - {original_msg}\n")
-        self.log_file.flush()
+        self.writer.write(f"{record.name} - {original_msg}\n")
 
     def flush(self):
         self.terminal.flush()
-        self.log_file.flush()
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+        super().close()
 
     def set_terminal_level(self, level):
         """Set the log level for terminal output only."""
         self.terminal_level = level
 
+class StructuredLogHandler(logging.Handler):
+    """Writes the structured events attached to agent log records (extra={"events": [...]}) to a JSONL file.
+
+    Each event becomes one line with its agent ID and timestamp added. The handler also keeps a
+    sidecar index mapping agent ID -> iteration -> [start, end) byte range in the JSONL file,
+    which is rewritten every time the writer flushes.
+    """
+    def __init__(self, jsonl_file: BinaryIO, index_path: str, flush_interval: float = 1.0, flush_bytes: int = 64 * 1024):
+        super().__init__()
+        self.index_path = index_path
+        self.index = {"version": 1, "log_file": os.path.basename(jsonl_file.name), "iterations": {}}
+        self.offset = 0
+        self.writer = BufferedLogWriter(jsonl_file, flush_interval, flush_bytes, on_flush=self.save_index)
+
+    def emit(self, record):
+        events = getattr(record, 'events', None)
+        if not events or not record.name.startswith('agent.'):
+            return
+        agent_id = record.name[6:]  # Remove 'agent.' prefix
+        iterations = self.index["iterations"].setdefault(agent_id, {})
+        data = []
+        for event in events:
+            line = json.dumps({"agent_id": agent_id, "timestamp": record.created, **event}, ensure_ascii=False).encode('utf-8') + b"\n"
+            byte_range = iterations.setdefault(str(event["iteration"]), [self.offset, self.offset])
+            self.offset += len(line)
+            byte_range[1] = self.offset
+            data.append(line)
+        self.writer.write(b"".join(data))
+
+    def save_index(self):
+        """Atomically replace the sidecar index with the current one."""
+        with self.lock:
+            snapshot = json.dumps(self.index)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(snapshot)
+        os.replace(temp_path, self.index_path)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+        super().close()
+
 def get_agent_config(agent_name: str, silent: bool = False) -> Optional[Dict[str, Any]]:
     """Load and return the agent configuration from config.json."""
     config_path = os.path.join(os.path.dirname(__file__), "agents", agent_name, "config.json")
@@ -119,6 +297,46 @@ def get_available_agents() -> List[Tuple[str, Optional[str]]]:
             agents.append((item, description))
     return sorted(agents, key=lambda x: x[0])
 
+def create_run_log_path(agent_name: str) -> str:
+    """Return the path of a new run log for agent_name, runs/<agent_name>/run_log_<timestamp>_<id>.txt."""
+    # Create runs directory if it doesn't exist
+    runs_dir = os.path.join(os.path.dirname(__file__), "runs", agent_name)
+    os.makedirs(runs_dir, exist_ok=True)
+
+    # Create run log with timestamp
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(runs_dir, f"run_log_{timestamp}_{secrets.token_hex(4)}.txt")
+
+def setup_run_logging(run_log: str, terminal_level: int = logging.INFO) -> List[logging.Handler]:
+    """Send the 'agent' logger to run_log, its structured event log and the terminal.
+
+    Records below terminal_level are only written to the files. Returns the handlers, pass them to
+    teardown_run_logging when the run is over.
+    """
+    jsonl_log, jsonl_index = get_structured_log_paths(run_log)
+    logger = StreamingLogger(open(run_log, "w"))
+    structured_logger = StructuredLogHandler(open(jsonl_log, "wb"), jsonl_index)
+    logger.set_terminal_level(terminal_level)
+
+    # Create a specific logger for agents instead of using root logger
+    agent_logger = logging.getLogger('agent')
+
+    # Always set the logger to DEBUG level to capture all logs
+    agent_logger.setLevel(logging.DEBUG)
+    agent_logger.addHandler(logger)
+    agent_logger.addHandler(structured_logger)
+    # Prevent propagation to root logger
+    agent_logger.propagate = False
+    return [logger, structured_logger]
+
+def teardown_run_logging(handlers: List[logging.Handler]) -> None:
+    """Detach the handlers set up by setup_run_logging, write out everything they queued and close their files."""
+    agent_logger = logging.getLogger('agent')
+    for handler in handlers:
+        agent_logger.removeHandler(handler)
+        handler.close()
+        handler.writer.file.close()
+
 def main():
     # Get available agents
     agents = get_available_agents()
@@ -203,52 +421,33 @@ def main():
         print(f"Could not find manifesto at {manifesto_path}")
         return
 
-    # Create runs directory if it doesn't exist
-    runs_dir = os.path.join(os.path.dirname(__file__), "runs", agent_name)
-    os.makedirs(runs_dir, exist_ok=True)
+    run_log = create_run_log_path(agent_name)
 
-    # Create run log with timestamp
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    run_log = os.path.join(runs_dir, f"run_log_{timestamp}_{secrets.token_hex(4)}.txt")
-
-    # Setup logging
-    with open(run_log, "w") as log_file:
-        # Set up logging
-        logger = StreamingLogger(log_file)
-
-        # Create a specific logger for agents instead of using root logger
-        agent_logger = logging.getLogger('agent')
-
-        # Always set the logger to DEBUG level to capture all logs
-        agent_logger.setLevel(logging.DEBUG)
-
-        # Set terminal log level based on selected mode
-        if mode == 2:  # Verbose/DEBUG mode
-            logger.set_terminal_level(logging.DEBUG)
-        else:  # Normal/INFO mode
-            logger.set_terminal_level(logging.INFO)
-
-        agent_logger.addHandler(logger)
-        # Prevent propagation to root logger
-        agent_logger.propagate = False
-
-        agent_logger.info(f"Running Agent: {display_name}")
-        try:
-            # Import the central create_agent function
-            from lib.agent import create_agent
-            
-            # Create agent using the config
-            agent = create_agent(
-                config=agent_config,
-                manifesto=manifesto,
-                memory=""
-            )
-            agent.run()
-        except Exception as e:
-            agent_logger.debug(f"Agent execution failed: {str(e)}", exc_info=True)
-            print(f"Error running agent: {str(e)}")
+    # Set terminal log level based on selected mode
+    handlers = setup_run_logging(run_log, logging.DEBUG if mode == 2 else logging.INFO)
+    agent_logger = logging.getLogger('agent')
+    agent_logger.info(f"Running Agent: {display_name}")
+    try:
+        # Import the central create_agent function
+        from lib.agent import create_agent
+
+        # Create agent using the config
+        agent = create_agent(
+            config=agent_config,
+            manifesto=manifesto,
+            memory=""
+        )
+        agent.run()
+    except Exception as e:
+        agent_logger.debug(f"Agent execution failed: {str(e)}", exc_info=True)
+        print(f"Error running agent: {str(e)}")
+    finally:
+        # Drain the background writers before the log files are closed, also on Ctrl+C
+        teardown_run_logging(handlers)
 
 if __name__ == "__main__":
+    # Turn SIGTERM into a normal exit so the run log is flushed on the way out
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
     try:
         main()
     except KeyboardInterrupt:
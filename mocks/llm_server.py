@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Local OpenAI-compatible stand-in for the LLM, to load test the framework without a provider.
+
+Start it, then point agents at it, with a model of the "openai/" provider and any API key:
+
+    python mocks/llm_server.py --port 8002 --latency uniform:0.2,1.0
+    AGENT_LLM_API_BASE=http://127.0.0.1:8002/v1 OPENAI_API_KEY=test python main.py
+
+or use agents/mock_agent, whose config.json already has "model": "openai/mock" and "api_base".
+
+Responses are scripted and deterministic. The server is stateless: it reads the script from a
+[MOCK_SCRIPT: name key=value ...] marker in the prompt (i.e. in the agent's manifesto) and works out
+the next tool call from the tool results already in the agent's memory. Scripts:
+
+    chat turns=N       ASK_USER N times (default 1), TELL_USER the last answer, then END_RUN (the default script)
+    loop iterations=N  TELL_USER for N - 1 iterations, then END_RUN, to grow an agent's memory
+    spawn agent=A manifesto=M n=N messages=K
+                       SPAWN_SUBAGENT A§M N times, then with every subagent K times LISTEN_TO_SUBAGENT and
+                       RESPOND_TO_SUBAGENT, the last reply being END_RUN, then END_RUN
+    worker             ASK_USER until the answer contains END_RUN, then END_RUN (the subagent side of spawn)
+    end                END_RUN right away
+
+Latency is drawn per request from --latency: fixed:S, uniform:LOW,HIGH, normal:MEAN,SD,
+lognormal:MU,SIGMA or exponential:MEAN (seconds). Requests with "stream": true get server-sent
+events, the response split into chunks --stream-interval seconds apart.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+SCRIPT_PATTERN = re.compile(r'\[MOCK_SCRIPT: (\w+)([^\]]*)\]')
+TOOL_RESULT_PATTERN = re.compile(r'\nTool Result \[Tool: ([A-Z_]+)\] Input: (.*?) \| Result: (.*?) \| Time: ', re.DOTALL)
+ITERATION_PATTERN = re.compile(r'LLM Response - Agent Iterations \d+\]')
+STREAM_CHUNK_SIZE = 16
+
+class LatencyDistribution:
+    """Draws per-request latencies, in seconds, from a distribution given as 'name:param,param'."""
+    def __init__(self, spec: str = "fixed:0", seed: int = 0):
+        name, _, params = spec.partition(':')
+        self.name = name
+        self.params = [float(param) for param in params.split(',') if param]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+        if name not in expected or len(self.params) != expected[name]:
+            raise ValueError(f"Invalid latency '{spec}', expected one of: fixed:S, uniform:LOW,HIGH, normal:MEAN,SD, lognormal:MU,SIGMA, exponential:MEAN")
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self.lock:
+            if self.name == "fixed":
+                value = self.params[0]
+            elif self.name == "uniform":
+                value = self.random.uniform(*self.params)
+            elif self.name == "normal":
+                value = self.random.gauss(*self.params)
+            elif self.name == "lognormal":
+                value = self.random.lognormvariate(*self.params)
+            else:
+                value = self.random.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        return max(0.0, value)
+
+def parse_script(prompt: str) -> Tuple[str, Dict[str, str]]:
+    match = SCRIPT_PATTERN.search(prompt)
+    if not match:
+        return "chat", {}
+    params = dict(param.split('=', 1) for param in match.group(2).split() if '=' in param)
+    return match.group(1), params
+
+def tool_call(name: str, args: str = "") -> str:
+    return f"<TOOL: {name}>{args}</TOOL>"
+
+def script_response(prompt: str) -> str:
+    """Return the next response of the script in the prompt, given the tool results in its memory."""
+    script, params = parse_script(prompt)
+    iteration = len(ITERATION_PATTERN.findall(prompt)) // 2 + 1
+    results: List[Tuple[str, str, str]] = TOOL_RESULT_PATTERN.findall(prompt)
+
+    if script == "end":
+        return tool_call("END_RUN")
+
+    if script == "loop":
+        if iteration >= int(params.get("iterations", 10)):
+            return tool_call("END_RUN")
+        return tool_call("TELL_USER", f"Iteration {iteration}")
+
+    if script == "worker":
+        answers = [result for tool, _, result in results if tool == "ASK_USER"]
+        if answers and "END_RUN" in answers[-1]:
+            return tool_call("END_RUN")
+        return tool_call("ASK_USER", f"Message {len(answers) + 1} from worker")
+
+    if script == "spawn":
+        n, messages = int(params.get("n", 1)), int(params.get("messages", 1))
+        children = [result.strip() for tool, _, result in results if tool == "SPAWN_SUBAGENT"]
+        if len(children) < n:
+            return tool_call("SPAWN_SUBAGENT", f"{params.get('agent', 'mock_agent')}§{params.get('manifesto', 'worker')}")
+
+        # A child is answered once its message has been received. A listen that returned nothing
+        # (the child has not asked yet) is repeated, it blocks until the child writes.
+        last_tool, last_input, last_result = results[-1]
+        if last_tool == "LISTEN_TO_SUBAGENT":
+            if not last_result.strip():
+                return tool_call("LISTEN_TO_SUBAGENT", last_input)
+            replies = sum(1 for tool, args, _ in results if tool == "RESPOND_TO_SUBAGENT" and args.startswith(last_input + "§"))
+            reply = "END_RUN" if replies + 1 >= messages else f"Reply {replies + 1}"
+            return tool_call("RESPOND_TO_SUBAGENT", f"{last_input}§{reply}")
+
+        replies = {child: 0 for child in children}
+        for tool, args, _ in results:
+            if tool == "RESPOND_TO_SUBAGENT" and args.split('§', 1)[0] in replies:
+                replies[args.split('§', 1)[0]] += 1
+        # Round robin: the first child with the fewest replies that still needs some
+        pending = [child for child in children if replies[child] < messages]
+        if not pending:
+            return tool_call("END_RUN")
+        return tool_call("LISTEN_TO_SUBAGENT", min(pending, key=lambda child: replies[child]))
+
+    # chat
+    turns = int(params.get("turns", 1))
+    answers = [result for tool, _, result in results if tool == "ASK_USER"]
+    if len(answers) < turns:
+        return tool_call("ASK_USER", f"Question {len(answers) + 1}?")
+    if results and results[-1][0] == "ASK_USER":
+        return tool_call("TELL_USER", f"You said: {answers[-1].strip()}")
+    return tool_call("END_RUN")
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    latency = LatencyDistribution()
+    stream_interval = 0.01
+    request_count = 0
+    request_count_lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path.rstrip('/') in ('/v1/models', '/models'):
+            self.send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]})
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        if self.path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            prompt = "\n".join(str(message.get("content", "")) for message in request["messages"])
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {"error": {"message": f"Invalid request: {str(e)}"}})
+            return
+        with MockLLMHandler.request_count_lock:
+            MockLLMHandler.request_count += 1
+
+        content = script_response(prompt)
+        time.sleep(self.latency.sample())
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        model = request.get("model", "mock")
+
+        if request.get("stream"):
+            self.send_stream(completion_id, model, content, usage)
+            return
+        self.send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        })
+
+    def send_stream(self, completion_id: str, model: str, content: str, usage: dict):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        def send_chunk(delta: dict, finish_reason=None, **extra):
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}], **extra}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        send_chunk({"role": "assistant", "content": ""})
+        for start in range(0, len(content), STREAM_CHUNK_SIZE):
+            time.sleep(self.stream_interval)
+            send_chunk({"content": content[start:start + STREAM_CHUNK_SIZE]})
+        send_chunk({}, "stop", usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(port: int = 8002, latency: str = "fixed:0", stream_interval: float = 0.01, seed: int = 0) -> ThreadingHTTPServer:
+    """Start the mock LLM server in a background thread and return it; call shutdown() to stop it."""
+    MockLLMHandler.latency = LatencyDistribution(latency, seed)
+    MockLLMHandler.stream_interval = stream_interval
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockLLMHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock LLM server with scripted responses.")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--latency", default="fixed:0", help="Latency distribution per request, e.g. fixed:0.5, uniform:0.1,1 or lognormal:-1,0.5 (seconds)")
+    parser.add_argument("--stream-interval", type=float, default=0.01, help="Seconds between streamed chunks")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the latency distribution")
+    args = parser.parse_args()
+
+    try:
+        MockLLMHandler.latency = LatencyDistribution(args.latency, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    MockLLMHandler.stream_interval = args.stream_interval
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), MockLLMHandler)
+    server.daemon_threads = True
+    print(f"Mock LLM server listening on http://127.0.0.1:{args.port}/v1 (latency {args.latency})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nExiting...")
+
+if __name__ == "__main__":
+    main()
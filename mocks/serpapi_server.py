@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Local stand-in for the SerpAPI Google search endpoint, to run and benchmark SEARCH offline.
+
+Start it, then point SEARCH at it:
+
+    python mocks/serpapi_server.py --port 8001 --latency 0.5
+    SERPAPI_BACKEND=http://127.0.0.1:8001 SERPAPI_API_KEY=test python main.py
+
+Every query gets num (default 10) deterministic results. Every third result links to a page
+shared by all queries, so removing duplicates across queries can be tested.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+def build_results(query: str, num: int) -> dict:
+    slug = re.sub(r'[^a-z0-9]+', '-', query.lower()).strip('-') or 'empty'
+    organic_results = []
+    for position in range(1, num + 1):
+        link = f"https://example.com/shared/{position}" if position % 3 == 0 else f"https://example.com/{slug}/{position}"
+        organic_results.append({
+            "position": position,
+            "title": f"Result {position} for {query}",
+            "link": link,
+            "snippet": f"Snippet {position} of the stand-in results for '{query}'.",
+        })
+    return {
+        "search_metadata": {"status": "Success"},
+        "search_parameters": {"engine": "google", "q": query, "num": num},
+        "organic_results": organic_results,
+    }
+
+class SerpApiHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    request_count = 0
+    request_count_lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with SerpApiHandler.request_count_lock:
+            SerpApiHandler.request_count += 1
+
+        if url.path != '/search':
+            self.send_json(404, {"error": f"Unknown path {url.path}"})
+        elif not params.get('api_key'):
+            self.send_json(401, {"error": "Invalid API key. Your API key should be here: https://serpapi.com/manage-api-key"})
+        elif not params.get('q'):
+            self.send_json(400, {"error": "Missing query `q` parameter."})
+        else:
+            time.sleep(self.latency)
+            self.send_json(200, build_results(params['q'], int(params.get('num', 10))))
+
+    def send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(port: int = 8001, latency: float = 0.0) -> ThreadingHTTPServer:
+    """Start the stand-in server in a background thread and return it; call shutdown() to stop it."""
+    SerpApiHandler.latency = latency
+    server = ThreadingHTTPServer(('127.0.0.1', port), SerpApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SerpAPI-compatible stand-in server.")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering each search")
+    args = parser.parse_args()
+
+    SerpApiHandler.latency = args.latency
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), SerpApiHandler)
+    print(f"SerpAPI stand-in listening on http://127.0.0.1:{args.port} (latency {args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nExiting...")
+
+if __name__ == "__main__":
+    main()
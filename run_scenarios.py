@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Run scenarios against an agent without a human in the loop.
+
+Every scenario in scenarios/<agent_name>/ (or those matching --scenarios) is run against the chosen
+manifesto in its own worker process, so runs proceed concurrently and each gets its own run log.
+The agent's ASK_USER is answered by a simulated user:
+
+- scripted: a scenario file with lines starting with "USER:" is answered with those lines, in order
+- llm: otherwise an LLM role plays the user described by the scenario text
+
+Results (status, iterations, wall time, run log path and the conversation) are written to a
+summary JSON file, runs/<agent_name>/scenario_summary_<timestamp>.json by default.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import re
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from lib.files import list_files
+from lib.run_log import get_structured_log_paths, read_structured_events
+from main import create_run_log_path, get_agent_config, setup_run_logging, teardown_run_logging
+
+DEFAULT_MAX_ITERATIONS = 50
+DEFAULT_USER_MODEL = "openai/gpt-4o"
+# Above CRITICAL, so a headless run writes its run log without printing anything
+SILENT_LOG_LEVEL = logging.CRITICAL + 1
+SCRIPTED_REPLY_PATTERN = re.compile(r'^USER:[ \t]?(.*)$', re.MULTILINE)
+NO_FURTHER_INPUT_MESSAGE = "[No further input from the user. If the task is complete, end the run.]"
+
+SIMULATED_USER_PROMPT = """You are role playing the user of an AI agent, as described in the scenario below.
+Stay in character and only use information from the scenario. Reply with the user's next message only,
+without quotes or explanations. If the agent has done what the scenario needs and asks whether it may end
+the run, say yes.
+
+=== SCENARIO ===
+{scenario}
+
+=== CONVERSATION SO FAR ===
+{transcript}
+
+=== THE AGENT NOW ASKS ===
+{question}
+"""
+
+class ScenarioUser:
+    """Answers an agent's ASK_USER calls, from the scenario's scripted replies or by asking an LLM."""
+    def __init__(self, scenario_text: str, mode: str = "auto", model: str = DEFAULT_USER_MODEL):
+        self.scenario_text = scenario_text
+        self.scripted_replies = [reply.strip() for reply in SCRIPTED_REPLY_PATTERN.findall(scenario_text)]
+        if mode == "auto":
+            mode = "scripted" if self.scripted_replies else "llm"
+        self.mode = mode
+        self.model = model
+        self.transcript: List[Dict[str, str]] = []
+
+    def tell(self, agent_id: str, message: str) -> str:
+        self.transcript.append({"role": "agent", "text": message})
+        return ""
+
+    def ask(self, agent_id: str, question: str) -> str:
+        self.transcript.append({"role": "agent", "text": question})
+        if self.mode == "scripted":
+            reply = self.scripted_replies.pop(0) if self.scripted_replies else NO_FURTHER_INPUT_MESSAGE
+        else:
+            reply = self.simulate_reply(question)
+        self.transcript.append({"role": "user", "text": reply})
+        return reply
+
+    def simulate_reply(self, question: str) -> str:
+        import litellm
+        transcript = "\n".join(f"{turn['role'].upper()}: {turn['text']}" for turn in self.transcript[:-1])
+        prompt = SIMULATED_USER_PROMPT.format(
+            scenario=self.scenario_text, transcript=transcript or "(nothing yet)", question=question)
+        return litellm.completion(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}]
+        ).choices[0].message.content.strip()
+
+def run_scenario(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one scenario against an agent and return its result. Runs in a worker process of its own."""
+    run_log = create_run_log_path(job['agent_name'])
+    handlers = setup_run_logging(run_log, logging.INFO if job.get('verbose') else SILENT_LOG_LEVEL)
+    agent_logger = logging.getLogger('agent')
+    agent_logger.info(f"Running Scenario: {job['scenario']} | Agent: {job['agent_name']} | Manifesto: {job['manifesto_name']}")
+
+    user = ScenarioUser(job['scenario_text'], job.get('user_mode', 'auto'), job.get('user_model') or DEFAULT_USER_MODEL)
+    result = {
+        "scenario": job['scenario'],
+        "agent": job['agent_name'],
+        "manifesto": job['manifesto_name'],
+        "user_mode": user.mode,
+        "run_log": os.path.relpath(run_log, os.path.dirname(os.path.abspath(__file__))),
+        "status": "error",
+        "iterations": 0,
+        "wall_time": 0.0,
+        "tokens": 0,
+        "tool_calls": 0,
+        "tool_errors": 0,
+        "error": None,
+    }
+    start_time = time.time()
+    agent = None
+    try:
+        from lib.agent import create_agent
+        agent = create_agent(config=job['config'], manifesto=job['manifesto'], memory="")
+        agent.max_iterations = job.get('max_iterations') or agent.max_iterations
+        agent.ask_user = user.ask
+        agent.tell_user = user.tell
+        agent.run()
+        result["status"] = "completed" if agent.ended else "max_iterations"
+    except Exception as e:
+        agent_logger.debug(f"Agent execution failed: {str(e)}", exc_info=True)
+        result["error"] = str(e)
+    finally:
+        result["wall_time"] = round(time.time() - start_time, 3)
+        if agent is not None:
+            result["iterations"] = agent.llm_call_count
+        # Drain the background writers so the run log is complete when the summary points to it
+        teardown_run_logging(handlers)
+
+    if agent is not None:
+        result["tokens"], result["tool_calls"], result["tool_errors"] = count_run_usage(run_log)
+
+    result["user_turns"] = sum(1 for turn in user.transcript if turn["role"] == "user")
+    result["transcript"] = user.transcript
+    return result
+
+def count_run_usage(run_log: str) -> Tuple[int, int, int]:
+    """Return (tokens, tool calls, failed tool calls) of a run, over every agent in its structured event log.
+
+    Subagents log to the same run, so agents that delegate are measured in full. A tool call failed if
+    it raised, the tool was not found, or it returned an 'Error...' string as most tools do.
+    """
+    tokens = calls = errors = 0
+    jsonl_log, _ = get_structured_log_paths(run_log)
+    for event in read_structured_events(jsonl_log):
+        if event["type"] == "llm_response":
+            tokens += event.get("tokens", 0)
+        elif event["type"] == "tool_result":
+            calls += 1
+            errors += "error" in event or event.get("result", "").lstrip().startswith("Error")
+        elif event["type"] == "note" and event.get("text", "").startswith("Tool Not Found"):
+            calls += 1
+            errors += 1
+    return tokens, calls, errors
+
+def load_scenarios(agent_name: str, pattern: Optional[str] = None) -> List[Dict[str, str]]:
+    """Return the scenarios of agent_name, [{"scenario": path relative to scenarios/<agent_name>, "text": ...}]."""
+    scenarios_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios", agent_name)
+    files, _, _ = list_files(scenarios_dir, pattern=pattern)
+    scenarios = []
+    for file in files:
+        with open(os.path.join(scenarios_dir, file.path), 'r') as f:
+            scenarios.append({"scenario": file.path, "text": f.read()})
+    return scenarios
+
+def run_scenarios(
+    jobs: List[Dict[str, Any]],
+    workers: int = 4,
+    on_result: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+    worker: Callable[[Dict[str, Any]], Dict[str, Any]] = run_scenario
+) -> List[Dict[str, Any]]:
+    """Run scenario jobs concurrently, each in a fresh worker process, and return their results in job order.
+
+    on_result, if given, is called with (job, result) as each scenario finishes. worker runs one job,
+    it must be a module-level function wrapping run_scenario so it can be sent to the worker processes.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    # A fresh process per scenario: the 'agent' logger and the tool modules are process-wide state
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             max_tasks_per_child=1) as executor:
+        futures = {executor.submit(worker, job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                # The worker process itself failed (e.g. it was killed)
+                results[i] = {"scenario": jobs[i]['scenario'], "agent": jobs[i]['agent_name'],
+                              "manifesto": jobs[i]['manifesto_name'], "status": "error", "error": str(e)}
+            if on_result:
+                on_result(jobs[i], results[i])
+    return results
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Count results by status and total their iterations and wall time."""
+    statuses: Dict[str, int] = {}
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    return {
+        "scenarios": len(results),
+        "statuses": statuses,
+        "total_iterations": sum(result.get("iterations", 0) for result in results),
+        "total_wall_time": round(sum(result.get("wall_time", 0.0) for result in results), 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scenarios against an agent headlessly, with a scripted or LLM-simulated user.")
+    parser.add_argument("agent", help="Agent to run (e.g. research_agent), its scenarios are read from scenarios/<agent>/")
+    parser.add_argument("--manifesto", default="default_manifesto.txt", help="Manifesto file in agents/<agent>/manifestos/ (default: default_manifesto.txt)")
+    parser.add_argument("--scenarios", help="Only run the scenario files matching this glob (e.g. 'tom_*.txt')")
+    parser.add_argument("--workers", type=int, default=4, help="Number of scenarios run at the same time (default: 4)")
+    parser.add_argument("--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS,
+                        help=f"Stop a scenario after this many agent iterations without END_RUN (default: {DEFAULT_MAX_ITERATIONS})")
+    parser.add_argument("--user", choices=["auto", "scripted", "llm"], default="auto",
+                        help="How ASK_USER is answered: scripted USER: lines, an LLM, or scripted if the scenario has USER: lines (default)")
+    parser.add_argument("--user-model", default=DEFAULT_USER_MODEL, help=f"Model simulating the user (default: {DEFAULT_USER_MODEL})")
+    parser.add_argument("--summary", help="Path of the summary JSON file (default: runs/<agent>/scenario_summary_<timestamp>.json)")
+    parser.add_argument("--verbose", action="store_true", help="Print the agents' INFO logs while they run")
+    args = parser.parse_args()
+
+    config = get_agent_config(args.agent)
+    if not config:
+        sys.exit(1)
+    manifesto_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "agents", args.agent, "manifestos", args.manifesto)
+    try:
+        with open(manifesto_path) as f:
+            manifesto = f.read()
+    except FileNotFoundError:
+        print(f"Could not find manifesto at {manifesto_path}")
+        sys.exit(1)
+
+    scenarios = load_scenarios(args.agent, args.scenarios)
+    if not scenarios:
+        print(f"No scenarios found in scenarios/{args.agent}/")
+        sys.exit(1)
+
+    jobs = [{
+        "agent_name": args.agent,
+        "config": config,
+        "manifesto_name": args.manifesto,
+        "manifesto": manifesto,
+        "scenario": scenario["scenario"],
+        "scenario_text": scenario["text"],
+        "user_mode": args.user,
+        "user_model": args.user_model,
+        "max_iterations": args.max_iterations,
+        "verbose": args.verbose,
+    } for scenario in scenarios]
+
+    print(f"Running {len(jobs)} scenario(s) against {args.agent} ({args.manifesto}) with {args.workers} worker(s)")
+    started_at = datetime.datetime.now()
+    results = run_scenarios(jobs, args.workers, on_result=lambda job, result: print(
+        f"  {result['status']:<15} {result['scenario']} | {result.get('iterations', 0)} iterations | "
+        f"{result.get('wall_time', 0.0):.1f}s | {result.get('run_log') or result.get('error')}"))
+
+    summary = {
+        "agent": args.agent,
+        "manifesto": args.manifesto,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "wall_time": round((datetime.datetime.now() - started_at).total_seconds(), 3),
+        **summarize(results),
+        "results": results,
+    }
+    summary_path = args.summary or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "runs", args.agent,
+        f"scenario_summary_{started_at.strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"{summary['statuses']} | {summary['total_iterations']} iterations | {summary['wall_time']:.1f}s wall time")
+    print(f"Summary written to {summary_path}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nExiting...")
+        sys.exit(0)
@@ -0,0 +1,60 @@
+import logging
+
+import pytest
+
+from lib.tools.get_run_log_agent_communications import extract_agent_events, iter_agent_events
+
+AGENT_ID = "MockAgent_104112-51fbd34e-"
+
+def run_chat_agent(tmp_path, log_mode):
+    """Run mock_agent's chat script (one ASK_USER, one TELL_USER) with the given log mode and return its run log."""
+    pytest.importorskip("litellm")
+    from lib.agent import create_agent
+    from main import get_agent_config, setup_run_logging, teardown_run_logging
+    from mocks.llm_server import script_response
+
+    agent = create_agent(config=dict(get_agent_config("mock_agent"), log_mode=log_mode), manifesto="[MOCK_SCRIPT: chat turns=1]", memory="")
+    agent.ask_user = lambda _, question: "line one\nline two"
+    agent.tell_user = lambda _, message: ""
+    def llm_call(prompt, **kwargs):
+        agent.llm_call_count += 1
+        return script_response(prompt)
+    agent.llm_call = llm_call
+
+    run_log = str(tmp_path / "run_log.txt")
+    handlers = setup_run_logging(run_log, logging.CRITICAL + 1)
+    try:
+        agent.run()
+    finally:
+        teardown_run_logging(handlers)
+    return run_log
+
+@pytest.mark.parametrize("log_mode", ["full", "dedup"])
+def test_communications_are_found_in_both_log_modes(tmp_path, log_mode):
+    events = extract_agent_events(run_chat_agent(tmp_path, log_mode))
+    assert [(event['tool'], event['iteration']) for event in events] == [("ASK_USER", "1"), ("TELL_USER", "2")]
+    assert events[0]['input'] == "Question 1?"
+    assert events[0]['result'].startswith("line one")
+    assert events[1]['input'].startswith("You said: line one")
+
+def test_dedup_memory_block_is_parsed_once_complete(tmp_path):
+    prefix = f"[{AGENT_ID}][Memory #2]"
+    head = (f"agent.{AGENT_ID} - [Tool: ASK_USER] Input Length: 11 | Result Length: 17 | Time: 0.0000s\n"
+            f"agent.{AGENT_ID} - {prefix}\n"
+            f"{prefix}Tool Result [Tool: ASK_USER] Input: Question 1? | Result: line one\n")
+    tail = (f"{prefix}line two | Time: 0.0012s\n"
+            f"{prefix}\n"
+            f"agent.{AGENT_ID} - [Tool: ASK_USER] Input and Result: see [Memory #2]\n")
+    run_log = tmp_path / "run_log.txt"
+    run_log.write_text(head)
+
+    state = {'offset': 0, 'line_num': 0, 'agent_iterations': {}}
+    assert list(iter_agent_events(str(run_log), state)) == []
+
+    with open(run_log, 'a') as f:
+        f.write(tail)
+    events = list(iter_agent_events(str(run_log), state))
+    assert len(events) == 1
+    assert events[0]['agent_id'] == "MockAgent_104112"
+    assert (events[0]['input'], events[0]['result']) == ("Question 1?", "line one\nline two")
+    assert state['offset'] == run_log.stat().st_size
@@ -0,0 +1,46 @@
+import io
+
+from main import BufferedLogWriter
+
+class FailingOnceFile(io.StringIO):
+    """A file whose first write fails like a full disk."""
+    failed = False
+    def write(self, data):
+        if not self.failed:
+            self.failed = True
+            raise OSError(28, "No space left on device")
+        return super().write(data)
+
+def test_write_error_does_not_stop_the_writer(capsys):
+    log_file = FailingOnceFile()
+    writer = BufferedLogWriter(log_file)
+    writer.write("lost\n")
+    writer.flush()
+    writer.write("kept\n")
+    writer.flush()
+    assert writer._thread.is_alive()
+    assert log_file.getvalue() == "kept\n"
+    assert "No space left on device" in capsys.readouterr().err
+
+def test_on_flush_error_does_not_stop_the_writer(tmp_path, capsys):
+    def on_flush():
+        raise RuntimeError("index not saved")
+
+    with open(tmp_path / "run_log.txt", "w") as log_file:
+        writer = BufferedLogWriter(log_file, on_flush=on_flush)
+        writer.write("first\n")
+        writer.flush()
+        writer.write("second\n")
+        writer.flush()
+        assert writer._thread.is_alive()
+        assert (tmp_path / "run_log.txt").read_text() == "first\nsecond\n"
+        assert "index not saved" in capsys.readouterr().err
+        writer.close()
+
+def test_write_after_close_goes_to_the_file(tmp_path):
+    with open(tmp_path / "run_log.txt", "w") as log_file:
+        writer = BufferedLogWriter(log_file)
+        writer.write("before\n")
+        writer.close()
+        writer.write("after\n")
+    assert (tmp_path / "run_log.txt").read_text() == "before\nafter\n"
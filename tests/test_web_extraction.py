@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from lib.web import ExtractionTimeout, run_in_extraction_worker
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _uninterruptible(n):
+    # A single C-level loop, so no Python signal handler runs until it is done
+    return sum(range(n))
+
+def _fail(message):
+    raise ValueError(message)
+
+def test_result_and_exception_are_returned():
+    assert run_in_extraction_worker(_uninterruptible, 10, timeout=30) == 45
+    with pytest.raises(ValueError, match="broken page"):
+        run_in_extraction_worker(_fail, "broken page", timeout=30)
+    # The worker is still usable after the task raised
+    assert run_in_extraction_worker(_uninterruptible, 5, timeout=30) == 10
+
+def test_uninterruptible_task_times_out_and_its_worker_is_terminated():
+    workers_before = {child.pid for child in multiprocessing.active_children()}
+    start = time.monotonic()
+    with pytest.raises(ExtractionTimeout):
+        run_in_extraction_worker(_uninterruptible, 10 ** 12, timeout=1)
+    assert time.monotonic() - start < 10
+    # The worker that ran the task is gone, none was left spinning
+    assert {child.pid for child in multiprocessing.active_children()} <= workers_before
+    # A fresh worker takes over
+    assert run_in_extraction_worker(_uninterruptible, 10, timeout=30) == 45
+
+def test_interpreter_exits_after_a_timeout(tmp_path):
+    script = tmp_path / "stuck_extraction.py"
+    script.write_text(textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {PROJECT_ROOT!r})
+        from lib.web import ExtractionTimeout, run_in_extraction_worker
+
+        def spin(n):
+            return sum(range(n))
+
+        if __name__ == "__main__":
+            try:
+                run_in_extraction_worker(spin, 10 ** 12, timeout=1)
+            except ExtractionTimeout:
+                print("timeout")
+    """))
+    start = time.monotonic()
+    completed = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=60)
+    assert completed.stdout.strip() == "timeout"
+    assert time.monotonic() - start < 15